@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 from rag import RAGSystem
 from tools.structured_tool import StructuredDataTool, is_structured_question
 from memory import ConversationMemory
-from config import config
+from config import config, SAMPLE_FAQS
 
 class ManuelitaAgent:
     """Agente inteligente con enrutamiento RAG/Structured."""
@@ -44,10 +44,16 @@ class ManuelitaAgent:
         try:
             logger.info("Inicializando Agente Manuelita...")
             
-            # RAG
+            # RAG: responde con BM25 de inmediato y carga los modelos en segundo plano;
+            # al terminar, las preguntas de ejemplo de la interfaz calientan modelos y cachés
             self.rag = RAGSystem(
                 data_dir="../data/raw/processed",
-                vectordb_dir="./vectordb"
+                vectordb_dir="./vectordb",
+                reranker_config=config.reranker,
+                chunking_config=config.chunking,
+                background_init=True,
+                warmup_queries=[faq['question'] for faq in SAMPLE_FAQS],
+                warmup_top_k=config.llm.top_k
             )
             
             # Structured Tool
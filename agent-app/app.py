@@ -397,6 +397,19 @@ def page_admin():
                 st.markdown("**Estadísticas de Documentos**")
                 st.metric("Total Documentos", rag_stats['total_documents'])
                 st.metric("Total Chunks", rag_stats['total_chunks'])
+                readiness = rag_stats.get('readiness') or {}
+                st.metric("Etapa de Recuperación",
+                          f"{readiness.get('stage', '-')}{' (cargando…)' if readiness.get('initializing') else ''}")
+                if readiness.get('load_times_s'):
+                    st.caption(" · ".join(f"{stage}: {seconds:.1f}s"
+                                          for stage, seconds in readiness['load_times_s'].items()))
+                chunk_tokens = rag_stats.get('chunk_tokens') or {}
+                if chunk_tokens.get('histogram'):
+                    st.caption(f"Tokens por chunk (p50 {chunk_tokens['p50']} · máx {chunk_tokens['max']})")
+                    st.bar_chart(chunk_tokens['histogram'])
+                result_cache = rag_stats.get('result_cache') or {}
+                st.metric("Caché de Resultados (aciertos/fallos)",
+                          f"{result_cache.get('hits', 0)}/{result_cache.get('misses', 0)}")
             
             with col2:
                 st.markdown("**Estrategia de Búsqueda**")
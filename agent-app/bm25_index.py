@@ -0,0 +1,241 @@
+"""
+Índice BM25 Persistido
+
+Construye una sola vez el índice BM25 del corpus y lo guarda como listas de
+postings en formato CSR (indptr, documentos, pesos) en un archivo .npz. Los
+pesos BM25 de cada (término, documento) se precalculan, así que puntuar una
+consulta es un producto disperso (np.bincount sobre los postings de sus
+términos) seguido de np.argpartition para el top-k. Un lote de consultas se
+puntúa con un único producto disperso consultas × documentos.
+
+Reproduce las puntuaciones de BM25Okapi (rank_bm25), el que usa BM25Retriever.
+"""
+
+import logging
+import math
+import zipfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from langchain_core.callbacks import CallbackManagerForRetrieverRun
+    from langchain_core.retrievers import BaseRetriever
+except ImportError:
+    BaseRetriever = None
+
+
+logger = logging.getLogger(__name__)
+
+BM25_INDEX_FILE = "bm25_index.npz"
+BM25_INDEX_VERSION = 1
+
+# Errores de un .npz truncado, corrupto o con otro esquema de arrays
+INDEX_LOAD_ERRORS = (zipfile.BadZipFile, KeyError, ValueError, EOFError, OSError)
+
+
+def default_preprocessing_func(text: str) -> List[str]:
+    """Tokenizador por defecto de BM25Retriever."""
+    return text.split()
+
+
+class BM25Index:
+    """Índice BM25 con postings CSR (término → documentos) y pesos precalculados."""
+
+    def __init__(self, vocabulary: Dict[str, int], indptr: np.ndarray, doc_ids: np.ndarray,
+                 weights: np.ndarray, keys: List[str],
+                 preprocess_func: Callable[[str], List[str]] = default_preprocessing_func):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.keys = keys
+        self.preprocess_func = preprocess_func
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, texts: List[str], keys: List[str], k1: float = 1.5, b: float = 0.75,
+              epsilon: float = 0.25,
+              preprocess_func: Callable[[str], List[str]] = default_preprocessing_func) -> "BM25Index":
+        """
+        Construye el índice.
+
+        Args:
+            texts: Contenido de cada documento
+            keys: Identificador estable de cada documento (p. ej. el id del chunk)
+            k1, b, epsilon: Parámetros de BM25Okapi
+        """
+        term_frequencies = [Counter(preprocess_func(text)) for text in texts]
+        doc_lengths = np.array([sum(tf.values()) for tf in term_frequencies], dtype=np.float64)
+        num_docs = len(texts)
+        avgdl = doc_lengths.mean() if num_docs else 0.0
+
+        # Postings por término: [(documento, frecuencia)]
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, tf in enumerate(term_frequencies):
+            for term, freq in tf.items():
+                postings.setdefault(term, []).append((doc_id, freq))
+
+        # IDF de BM25Okapi: los IDF negativos se sustituyen por epsilon * IDF medio
+        terms = list(postings)
+        idf = np.array([math.log(num_docs - len(postings[t]) + 0.5) - math.log(len(postings[t]) + 0.5)
+                        for t in terms])
+        if len(idf):
+            idf[idf < 0] = epsilon * idf.mean()
+
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[t]) for t in terms])
+        doc_ids = np.empty(indptr[-1], dtype=np.int32)
+        freqs = np.empty(indptr[-1], dtype=np.float64)
+        term_idf = np.empty(indptr[-1], dtype=np.float64)
+        for i, term in enumerate(terms):
+            start, end = indptr[i], indptr[i + 1]
+            doc_ids[start:end], freqs[start:end] = zip(*postings[term])
+            term_idf[start:end] = idf[i]
+
+        norm = k1 * (1 - b + b * doc_lengths[doc_ids] / avgdl) if num_docs else 0.0
+        weights = (term_idf * freqs * (k1 + 1) / (freqs + norm)).astype(np.float32)
+
+        vocabulary = {term: i for i, term in enumerate(terms)}
+        return cls(vocabulary, indptr, doc_ids, weights, list(keys), preprocess_func)
+
+    def save(self, path: Path) -> None:
+        """Guarda el índice en un .npz (escritura atómica)."""
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                version=np.array(BM25_INDEX_VERSION),
+                vocabulary=np.array(list(self.vocabulary), dtype=np.str_),
+                indptr=self.indptr,
+                doc_ids=self.doc_ids,
+                weights=self.weights,
+                keys=np.array(self.keys, dtype=np.str_),
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path,
+             preprocess_func: Callable[[str], List[str]] = default_preprocessing_func) -> Optional["BM25Index"]:
+        """
+        Carga un índice guardado, o None si no existe o es de otra versión.
+
+        Raises:
+            Uno de INDEX_LOAD_ERRORS si el archivo está truncado, corrupto o
+            sus arrays no forman un índice consistente
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != BM25_INDEX_VERSION:
+                    return None
+                vocabulary = {term: i for i, term in enumerate(data['vocabulary'].tolist())}
+                indptr, doc_ids, weights = data['indptr'], data['doc_ids'], data['weights']
+                keys = data['keys'].tolist()
+        except FileNotFoundError:
+            return None
+
+        if (len(indptr) != len(vocabulary) + 1 or len(doc_ids) != indptr[-1]
+                or len(weights) != len(doc_ids) or (len(doc_ids) and doc_ids.max() >= len(keys))):
+            raise ValueError(f"Índice BM25 inconsistente: {path}")
+        return cls(vocabulary, indptr, doc_ids, weights, keys, preprocess_func)
+
+    def get_scores(self, query: str) -> np.ndarray:
+        """Puntuación BM25 de la consulta para todos los documentos."""
+        term_ids = [self.vocabulary[token] for token in self.preprocess_func(query)
+                    if token in self.vocabulary]
+        if not term_ids:
+            return np.zeros(self.num_docs, dtype=np.float32)
+
+        # Producto disperso: suma de los postings de cada término de la consulta
+        spans = [slice(self.indptr[t], self.indptr[t + 1]) for t in term_ids]
+        doc_ids = np.concatenate([self.doc_ids[span] for span in spans])
+        weights = np.concatenate([self.weights[span] for span in spans])
+        return np.bincount(doc_ids, weights=weights, minlength=self.num_docs).astype(np.float32)
+
+    def get_scores_batch(self, queries: List[str]) -> np.ndarray:
+        """Puntuaciones BM25 de un lote de consultas, matriz (consultas × documentos)."""
+        rows, spans = [], []
+        for row, query in enumerate(queries):
+            for token in self.preprocess_func(query):
+                term_id = self.vocabulary.get(token)
+                if term_id is not None:
+                    rows.append(row)
+                    spans.append(slice(self.indptr[term_id], self.indptr[term_id + 1]))
+
+        num_cells = len(queries) * self.num_docs
+        if not spans:
+            return np.zeros((len(queries), self.num_docs), dtype=np.float32)
+
+        # Producto disperso: cada posting suma en la celda (consulta, documento)
+        lengths = [span.stop - span.start for span in spans]
+        cells = (np.repeat(np.asarray(rows, dtype=np.int64) * self.num_docs, lengths)
+                 + np.concatenate([self.doc_ids[span] for span in spans]))
+        weights = np.concatenate([self.weights[span] for span in spans])
+        scores = np.bincount(cells, weights=weights, minlength=num_cells)
+        return scores.reshape(len(queries), self.num_docs).astype(np.float32)
+
+    def top_k_batch(self, queries: List[str], k: int) -> List[List[Tuple[int, float]]]:
+        """top_k para un lote de consultas."""
+        k = min(k, self.num_docs)
+        if k <= 0:
+            return [[] for _ in queries]
+        scores = self.get_scores_batch(queries)
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+        ranked = np.take_along_axis(candidates, order, axis=1)
+        return [[(int(i), float(row_scores[i])) for i in row]
+                for row, row_scores in zip(ranked, scores)]
+
+    def top_k(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Los k documentos con mayor puntuación, como (posición, puntuación)."""
+        scores = self.get_scores(query)
+        k = min(k, self.num_docs)
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(i), float(scores[i])) for i in ranked]
+
+
+def load_or_build(path: Path, texts: List[str], keys: List[str]) -> Tuple[BM25Index, bool]:
+    """
+    Carga el índice persistido si corresponde a los mismos documentos; si no
+    (o si el archivo está dañado), lo construye y guarda.
+
+    Returns:
+        (índice, True si se cargó de disco)
+    """
+    try:
+        index = BM25Index.load(path)
+    except INDEX_LOAD_ERRORS as e:
+        logger.warning(f"Índice BM25 ilegible, se reconstruirá: {type(e).__name__}: {e}")
+        index = None
+    if index is not None and index.keys == list(keys):
+        return index, True
+
+    index = BM25Index.build(texts, keys)
+    index.save(path)
+    return index, False
+
+
+if BaseRetriever is not None:
+
+    class BM25IndexRetriever(BaseRetriever):
+        """Retriever de LangChain sobre un BM25Index (sustituye a BM25Retriever)."""
+
+        index: Any
+        docs: List[Any]
+        k: int = 4
+
+        def _get_relevant_documents(self, query: str, *,
+                                    run_manager: CallbackManagerForRetrieverRun) -> List[Any]:
+            return [self.docs[i] for i, _ in self.index.top_k(query, self.k)]
+else:
+    BM25IndexRetriever = None
@@ -0,0 +1,128 @@
+"""
+Troceado por Tamaño de Tokens
+
+Segunda etapa tras MarkdownHeaderTextSplitter: las secciones por encabezado
+tienen tamaños muy dispares (páginas sin encabezados en un solo chunk enorme,
+páginas con muchos encabezados en fragmentos diminutos). Aquí se fusionan las
+secciones hermanas pequeñas y se parten las grandes en ventanas con solape,
+de modo que cada chunk quede entre min_tokens y max_tokens.
+
+Los tokens se cuentan como palabras separadas por espacios (el mismo
+tokenizador que BM25); los cortes respetan el texto original, sin
+normalizar saltos de línea ni formato markdown.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+HEADER_KEYS = ("Titulo1", "Titulo2", "Titulo3")
+
+_WORD = re.compile(r'\S+')
+# Palabras tras las que conviene cortar una ventana (fin de frase o de línea)
+_SENTENCE_END = re.compile(r'[.!?:;]["»)\]]*$')
+
+
+def count_tokens(text: str) -> int:
+    """Número de tokens (palabras) de un texto."""
+    return len(text.split())
+
+
+def _header_path(metadata: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(metadata[key] for key in HEADER_KEYS if metadata.get(key))
+
+
+def _can_merge(previous: Any, chunk: Any) -> bool:
+    """Si dos secciones consecutivas son hermanas (mismo padre) o la primera es padre de la segunda."""
+    if previous.metadata.get('source') != chunk.metadata.get('source'):
+        return False
+    previous_path, path = _header_path(previous.metadata), _header_path(chunk.metadata)
+    return path[:-1] in (previous_path[:-1], previous_path)
+
+
+def merge_small_sections(chunks: List[Any], min_tokens: int) -> List[Any]:
+    """
+    Fusiona secciones consecutivas hermanas del mismo source (o un encabezado
+    con su primera subsección) mientras alguna quede por debajo de min_tokens.
+    El resultado puede superar max_tokens; split_long_section lo parte después.
+    """
+    merged: List[Any] = []
+    sizes: List[int] = []
+    for chunk in chunks:
+        size = count_tokens(chunk.page_content)
+        if merged:
+            previous = merged[-1]
+            if _can_merge(previous, chunk) and min(sizes[-1], size) < min_tokens:
+                # El chunk fusionado conserva solo los encabezados comunes
+                metadata = {key: value for key, value in previous.metadata.items()
+                            if chunk.metadata.get(key) == value}
+                merged[-1] = type(previous)(
+                    page_content=f"{previous.page_content}\n\n{chunk.page_content}",
+                    metadata=metadata,
+                )
+                sizes[-1] += size
+                continue
+        merged.append(chunk)
+        sizes.append(size)
+    return merged
+
+
+def split_long_section(chunk: Any, max_tokens: int, overlap_tokens: int) -> List[Any]:
+    """
+    Parte una sección de más de max_tokens en ventanas de hasta max_tokens
+    que se solapan overlap_tokens, cortando preferentemente en fin de frase.
+    """
+    text = chunk.page_content
+    words = list(_WORD.finditer(text))
+    if len(words) <= max_tokens:
+        return [chunk]
+
+    windows = []
+    start = 0
+    while True:
+        end = min(start + max_tokens, len(words))
+        if end < len(words):
+            # Retroceder hasta un fin de frase en la segunda mitad de la ventana
+            for candidate in range(end, start + max_tokens // 2, -1):
+                if _SENTENCE_END.search(words[candidate - 1].group()):
+                    end = candidate
+                    break
+        windows.append((start, end))
+        if end == len(words):
+            break
+        start = max(end - overlap_tokens, start + 1)
+
+    return [
+        type(chunk)(page_content=text[words[start].start():words[end - 1].end()],
+                    metadata=dict(chunk.metadata))
+        for start, end in windows
+    ]
+
+
+def enforce_token_bounds(chunks: List[Any], min_tokens: int, max_tokens: int,
+                         overlap_tokens: int) -> List[Any]:
+    """Fusiona las secciones hermanas pequeñas y parte las que superan max_tokens."""
+    bounded = []
+    for chunk in merge_small_sections(chunks, min_tokens):
+        bounded.extend(split_long_section(chunk, max_tokens, overlap_tokens))
+    return bounded
+
+
+def token_histogram(chunks: List[Any], bin_width: int = 50) -> Dict[str, Any]:
+    """Distribución del tamaño de los chunks en tokens: resumen e histograma por tramos."""
+    sizes = sorted(count_tokens(chunk.page_content) for chunk in chunks)
+    if not sizes:
+        return {'min': None, 'p50': None, 'p95': None, 'max': None, 'mean': None, 'histogram': {}}
+
+    histogram: Dict[str, int] = {}
+    for size in sizes:
+        low = size // bin_width * bin_width
+        label = f"{low}-{low + bin_width - 1}"
+        histogram[label] = histogram.get(label, 0) + 1
+    return {
+        'min': sizes[0],
+        'p50': sizes[len(sizes) // 2],
+        'p95': sizes[min(len(sizes) - 1, int(0.95 * len(sizes)))],
+        'max': sizes[-1],
+        'mean': sum(sizes) / len(sizes),
+        'histogram': histogram,
+    }
@@ -5,7 +5,7 @@ Parámetros de LLM, streaming, memoria, etc.
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
 
 try:
@@ -94,6 +94,32 @@ class UIConfig:
     chat_height: int = 600
 
 
+@dataclass
+class RerankerConfig:
+    """Configuración del re-ranker (Cross-Encoder)."""
+    enabled: bool = True
+    model: str = "BAAI/bge-reranker-base"
+    top_n: int = 4
+    max_length: int = 384  # tokens por par (consulta + chunk); el chunk se trunca
+    batch_size: int = 16  # pares por forward; cubre todos los candidatos en un batch
+    device: str = "cpu"
+    # Poda: salto relativo de la fusión RRF a partir del cual no se re-rankea
+    # (None = separation_margin de los pesos del RAG, 0 = re-rankear siempre)
+    prune_margin: Optional[float] = None
+    # Hilos de torch (0 = valor por defecto de torch)
+    torch_threads: int = int(os.getenv("RERANKER_TORCH_THREADS", "0"))
+    torch_interop_threads: int = int(os.getenv("RERANKER_TORCH_INTEROP_THREADS", "0"))
+
+
+@dataclass
+class ChunkingConfig:
+    """Tamaño de los chunks del RAG, en tokens (palabras)."""
+    min_tokens: int = 40  # secciones hermanas más pequeñas se fusionan
+    max_tokens: int = 220  # secciones más grandes se parten; cabe en max_length del re-ranker
+    overlap_tokens: int = 30  # solape entre las partes de una sección
+    dedup_threshold: float = 0.8  # Jaccard estimada para colapsar casi duplicados (0 = desactivado)
+
+
 @dataclass
 class LangSmithConfig:
     """Configuración de LangSmith (Observabilidad)."""
@@ -116,6 +142,8 @@ class AppConfig:
         self.streaming = StreamingConfig()
         self.memory = MemoryConfig()
         self.ui = UIConfig()
+        self.reranker = RerankerConfig()
+        self.chunking = ChunkingConfig()
         self.langsmith = LangSmithConfig()
         self.data_dir = "../data/raw/processed"
         self.vectordb_dir = "./vectordb"
@@ -187,6 +215,22 @@ class AppConfig:
                 'sidebar_width': self.ui.sidebar_width,
                 'chat_height': self.ui.chat_height
             },
+            'reranker': {
+                'enabled': self.reranker.enabled,
+                'model': self.reranker.model,
+                'top_n': self.reranker.top_n,
+                'max_length': self.reranker.max_length,
+                'batch_size': self.reranker.batch_size,
+                'device': self.reranker.device,
+                'torch_threads': self.reranker.torch_threads,
+                'torch_interop_threads': self.reranker.torch_interop_threads
+            },
+            'chunking': {
+                'min_tokens': self.chunking.min_tokens,
+                'max_tokens': self.chunking.max_tokens,
+                'overlap_tokens': self.chunking.overlap_tokens,
+                'dedup_threshold': self.chunking.dedup_threshold
+            },
             'langsmith': {
                 'enabled': self.langsmith.enabled,
                 'project_name': self.langsmith.project_name,
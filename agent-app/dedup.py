@@ -0,0 +1,150 @@
+"""
+Eliminación de Chunks Casi Duplicados
+
+Las páginas de noticias y corporativas repiten los mismos párrafos (pies de
+página, bloques de contacto, "Manuelita 160 años"). Antes de indexar se
+calcula una firma MinHash de cada chunk sobre sus shingles de palabras; LSH
+por bandas propone pares candidatos y se agrupan los que superan el umbral
+de similitud de Jaccard estimada. De cada grupo se indexa un solo chunk,
+que conserva en su metadata los archivos y URLs de todos los duplicados.
+"""
+
+import re
+import time
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+MINHASH_SEED = 1234
+_PRIME = (1 << 31) - 1
+
+_WORD = re.compile(r'\w+')
+_URL_LINE = re.compile(r'^#\s+(https?://\S+)')
+
+# Metadata de un chunk colapsado: archivos y URLs de todos sus duplicados,
+# separados por salto de línea (Chroma solo admite valores escalares)
+SOURCES_KEY = 'sources'
+URLS_KEY = 'urls'
+
+
+def document_url(text: str) -> str:
+    """URL de la página de un markdown del scraper (su primera línea '# https://...'), o ''."""
+    match = _URL_LINE.match(text)
+    return match.group(1) if match else ''
+
+
+def metadata_sources(metadata: Dict[str, Any]) -> List[str]:
+    """Archivos de origen de un chunk, incluidos los de sus duplicados colapsados."""
+    sources = metadata.get(SOURCES_KEY)
+    return sources.split('\n') if sources else [metadata.get('source', 'Unknown')]
+
+
+def _shingles(text: str) -> np.ndarray:
+    """Hashes (CRC32, estables entre procesos) de los shingles de palabras del texto."""
+    words = _WORD.findall(text.casefold())
+    if len(words) < SHINGLE_SIZE:
+        grams = [' '.join(words)]
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return np.unique(np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+
+def minhash_signatures(texts: List[str], num_permutations: int = NUM_PERMUTATIONS,
+                       seed: int = MINHASH_SEED) -> np.ndarray:
+    """Firma MinHash de cada texto, matriz (textos × permutaciones)."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=(num_permutations, 1), dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=(num_permutations, 1), dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_permutations), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = _shingles(text) % _PRIME
+        signatures[row] = ((a * hashes + b) % _PRIME).min(axis=1)
+    return signatures
+
+
+def near_duplicate_groups(texts: List[str], threshold: float = 0.8,
+                          bands: int = LSH_BANDS) -> List[List[int]]:
+    """
+    Agrupa los textos casi duplicados.
+
+    Args:
+        texts: Contenido de cada chunk
+        threshold: Similitud de Jaccard estimada mínima entre duplicados
+        bands: Bandas de LSH (las permutaciones se reparten entre ellas)
+
+    Returns:
+        Grupos de posiciones (cada uno ordenado), incluidos los de un solo texto
+    """
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = minhash_signatures(texts)
+    rows = signatures.shape[1] // bands
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(key.tobytes(), []).append(i)
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                if find(first) != find(other) and \
+                        np.mean(signatures[first] == signatures[other]) >= threshold:
+                    parent[find(other)] = find(first)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def collapse_near_duplicates(chunks: List[Any],
+                             threshold: float = 0.8) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Deja un chunk por grupo de casi duplicados.
+
+    Se conserva el primero del grupo según (source, posición), que no depende
+    del orden de carga de los archivos; si el grupo abarca más de un chunk,
+    su metadata recibe 'sources' y 'urls' con los de todo el grupo.
+
+    Returns:
+        (chunks sin duplicados en el orden original, estadísticas)
+    """
+    start_time = time.perf_counter()
+    if not chunks or threshold <= 0:
+        return list(chunks), {'chunks_in': len(chunks), 'chunks_out': len(chunks),
+                              'collapsed': 0, 'groups': 0, 'duration_ms': 0.0}
+
+    keep: Dict[int, Any] = {}
+    duplicate_groups = 0
+    for group in near_duplicate_groups([chunk.page_content for chunk in chunks], threshold):
+        representative = min(group, key=lambda i: (chunks[i].metadata.get('source', ''), i))
+        chunk = chunks[representative]
+        if len(group) > 1:
+            duplicate_groups += 1
+            sources = sorted({source for i in group for source in metadata_sources(chunks[i].metadata)})
+            urls = sorted({chunks[i].metadata.get('url') for i in group} - {None, ''})
+            chunk = type(chunk)(
+                page_content=chunk.page_content,
+                metadata={**chunk.metadata, SOURCES_KEY: '\n'.join(sources), URLS_KEY: '\n'.join(urls)},
+            )
+        keep[representative] = chunk
+
+    collapsed = [keep[i] for i in sorted(keep)]
+    return collapsed, {
+        'chunks_in': len(chunks),
+        'chunks_out': len(collapsed),
+        'collapsed': len(chunks) - len(collapsed),
+        'groups': duplicate_groups,
+        'duration_ms': (time.perf_counter() - start_time) * 1000,
+    }
@@ -0,0 +1,168 @@
+"""
+Evaluación de la Recuperación
+
+Conjunto de consultas de referencia (golden set) en español para evaluar la
+recuperación. Cada consulta lista los archivos del corpus que la responden;
+un chunk es relevante si proviene de uno de esos archivos.
+
+run_benchmark ejecuta el golden set sobre un RAGSystem y mide calidad
+(recall@k, MRR, nDCG@k) y latencia por etapa (embedding, vectorial, BM25, fusión y
+re-ranking) con p50/p95, para comparar cambios de pesos, k, re-ranker o
+troceado. Con el modelo STUB_EMBEDDING_MODEL corre sin red ni descargas.
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from dedup import metadata_sources
+from hybrid_retriever import fuse_documents
+
+GOLDEN_QUERIES_FILE = str(Path(__file__).resolve().parent / "tools" / "data" / "golden_queries.json")
+
+BENCH_STAGES = ('embed', 'vector', 'bm25', 'fuse', 'rerank', 'total')
+
+
+def load_golden_set(path: str = GOLDEN_QUERIES_FILE) -> Dict[str, Any]:
+    """Carga el golden set completo: {'version', 'description', 'queries'}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_golden_queries(path: str = GOLDEN_QUERIES_FILE) -> List[Dict[str, Any]]:
+    """Carga las consultas de referencia: [{'query', 'relevant_sources'}]."""
+    return load_golden_set(path)['queries']
+
+
+def is_relevant(source: str, relevant_sources: Iterable[str]) -> bool:
+    """Si el source de un chunk corresponde a alguno de los archivos relevantes."""
+    return Path(source).name in set(relevant_sources)
+
+
+def _percentiles(durations: List[float]) -> Dict[str, Any]:
+    """p50, p95 y media (ms) de una lista de duraciones en segundos."""
+    if not durations:
+        return {'p50_ms': None, 'p95_ms': None, 'mean_ms': None}
+    ordered = sorted(durations)
+    return {
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000,
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+    }
+
+
+def score_ranking(docs: List[Any], relevant_sources: Iterable[str], k: int) -> Dict[str, float]:
+    """
+    Métricas de una consulta sobre los documentos devueltos.
+
+    Returns:
+        recall (archivos relevantes presentes en el top-k / archivos relevantes),
+        reciprocal_rank (1 / posición del primer chunk relevante), ndcg (ganancia 1
+        por cada posición que aporta un archivo relevante aún no visto, con
+        descuento log2) y hit (0/1)
+    """
+    relevant = set(relevant_sources)
+    found = set()
+    reciprocal_rank = 0.0
+    dcg = 0.0
+    for rank, doc in enumerate(docs[:k], start=1):
+        names = {Path(source).name for source in metadata_sources(doc.metadata)} & relevant
+        if names and not reciprocal_rank:
+            reciprocal_rank = 1.0 / rank
+        if names - found:
+            dcg += 1.0 / math.log2(rank + 1)
+        found |= names
+    ideal_dcg = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+    return {
+        'recall': len(found) / len(relevant) if relevant else 0.0,
+        'reciprocal_rank': reciprocal_rank,
+        'ndcg': dcg / ideal_dcg if ideal_dcg else 0.0,
+        'hit': float(bool(found)),
+    }
+
+
+def run_benchmark(rag: Any, golden: List[Dict[str, Any]], k: int = 4,
+                  repeat: int = 1) -> Dict[str, Any]:
+    """
+    Ejecuta el golden set sobre la recuperación de un RAGSystem, etapa por etapa.
+
+    Reproduce retrieve() (mismos candidatos, pesos, fusión y re-ranker) pero
+    secuencialmente y sin las cachés de consultas, resultados ni puntuaciones,
+    para medir el coste real de cada etapa.
+
+    Args:
+        rag: RAGSystem inicializado
+        golden: Consultas de referencia (load_golden_queries)
+        k: Documentos evaluados por consulta
+        repeat: Pasadas completas por el golden set (más muestras de latencia)
+
+    Returns:
+        recall@k, MRR, nDCG@k, hit rate, latencia por etapa y configuración evaluada
+    """
+    from rag import CANDIDATES_PER_LEG, KEYWORD_WEIGHT, RRF_C, SEMANTIC_WEIGHT
+
+    if not rag.hybrid_retriever:
+        raise RuntimeError("RAGSystem sin retriever híbrido; revisar el log de inicialización")
+
+    # Modelo de embeddings sin la LRU de consultas de CachedEmbeddings
+    embedding_model = getattr(rag.embeddings, 'embeddings', rag.embeddings)
+    timings: Dict[str, List[float]] = {stage: [] for stage in BENCH_STAGES}
+    per_query = []
+
+    skipped_before = rag.reranker.skipped if rag.reranker else 0
+    calls_before = rag.reranker.calls if rag.reranker else 0
+    for iteration in range(repeat):
+        if rag.reranker:
+            rag.reranker.score_cache.clear()
+        for item in golden:
+            query = item['query']
+            start = time.perf_counter()
+            query_vector = embedding_model.embed_query(query)
+            embedded = time.perf_counter()
+            semantic_docs = rag.vectorstore.similarity_search_by_vector(query_vector, k=CANDIDATES_PER_LEG)
+            searched = time.perf_counter()
+            keyword_docs = [rag.splits[i] for i, _ in rag.bm25_index.top_k(query, CANDIDATES_PER_LEG)]
+            keyword_done = time.perf_counter()
+            candidates = fuse_documents([semantic_docs, keyword_docs],
+                                        [SEMANTIC_WEIGHT, KEYWORD_WEIGHT], RRF_C)
+            fused = time.perf_counter()
+            if rag.reranker:
+                docs = rag.reranker.rerank(query, candidates)
+            else:
+                docs = [doc for doc, _ in candidates[:rag.reranker_config.top_n]]
+            end = time.perf_counter()
+
+            for stage, duration in zip(BENCH_STAGES, (embedded - start, searched - embedded,
+                                                      keyword_done - searched, fused - keyword_done,
+                                                      end - fused, end - start)):
+                timings[stage].append(duration)
+            if iteration == 0:
+                per_query.append({'query': query, **score_ranking(docs, item['relevant_sources'], k)})
+
+    count = len(per_query) or 1
+    rerank_calls = rag.reranker.calls - calls_before if rag.reranker else 0
+    return {
+        'queries': len(per_query),
+        'k': k,
+        f'recall_at_{k}': sum(row['recall'] for row in per_query) / count,
+        'mrr': sum(row['reciprocal_rank'] for row in per_query) / count,
+        f'ndcg_at_{k}': sum(row['ndcg'] for row in per_query) / count,
+        f'hit_rate_at_{k}': sum(row['hit'] for row in per_query) / count,
+        'latency': {stage: _percentiles(timings[stage]) for stage in BENCH_STAGES},
+        # Consultas en las que la poda evitó el cross-encoder
+        'rerank_skipped_rate': ((rag.reranker.skipped - skipped_before) / rerank_calls
+                                if rerank_calls else None),
+        'config': {
+            'embedding_model': rag.embedding_model_name,
+            'vector_backend': rag.vector_backend,
+            'vector_dtype': rag.vector_dtype,
+            'reranker': rag.reranker_config.model if rag.reranker else None,
+            'prune_margin': rag.reranker.prune_margin if rag.reranker else None,
+            'candidates_per_leg': CANDIDATES_PER_LEG,
+            'weights': {'semantic': SEMANTIC_WEIGHT, 'bm25': KEYWORD_WEIGHT},
+            'chunks': len(rag.splits),
+        },
+        'per_query': per_query,
+    }
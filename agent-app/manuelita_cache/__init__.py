@@ -0,0 +1,27 @@
+"""
+Cachés Compartidas de Manuelita
+
+Paquete común a agent-app y rag/app.py: caché de embeddings en disco
+(compartida entre procesos) y LRU de consultas. agent-app lo importa
+directamente; rag/app.py lo carga por ruta, sin añadir agent-app a
+sys.path.
+"""
+
+from .embedding_cache import (
+    DEFAULT_CACHE_DIR,
+    STUB_EMBEDDING_MODEL,
+    CachedEmbeddings,
+    EmbeddingCache,
+    HashingEmbeddings,
+)
+from .query_cache import LRUCache, normalize_query
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "STUB_EMBEDDING_MODEL",
+    "CachedEmbeddings",
+    "EmbeddingCache",
+    "HashingEmbeddings",
+    "LRUCache",
+    "normalize_query",
+]
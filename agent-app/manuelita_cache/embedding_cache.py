@@ -0,0 +1,282 @@
+"""
+Caché de Embeddings en Disco
+
+Guarda los embeddings de los chunks indexados por hash de contenido en una
+matriz memory-mapped (float32 o float16) más un archivo índice, una carpeta
+por modelo. Lo comparten agent-app/rag.py y rag/app.py: un chunk idéntico
+se embebe una sola vez por modelo, entre procesos y reinicios.
+
+HashingEmbeddings es un modelo stub determinista para benchmarks offline.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .query_cache import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    Embeddings = object
+
+
+# Directorio compartido por ambas apps (independiente del cwd de cada una)
+DEFAULT_CACHE_DIR = os.getenv(
+    "MANUELITA_EMBEDDING_CACHE",
+    str(Path.home() / ".cache" / "manuelita" / "embeddings")
+)
+CACHE_DTYPES = ('float32', 'float16')
+
+VECTORS_FILE = "vectors.bin"
+KEYS_FILE = "keys.txt"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+
+def content_hash(text: str) -> str:
+    """Hash del contenido de un chunk (clave de la caché)."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Caché hash de contenido → embedding para un modelo.
+
+    Los archivos solo crecen por el final: primero se escriben las filas en
+    vectors.bin y después sus claves en keys.txt (fila i = línea i), siempre
+    bajo un lock de archivo, así un lector nunca ve una clave sin su vector.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = DEFAULT_CACHE_DIR,
+                 dtype: str = 'float32'):
+        """
+        Args:
+            model_name: Modelo de embeddings (cada modelo tiene su propia carpeta)
+            cache_dir: Directorio raíz de la caché
+            dtype: Precisión de almacenamiento ('float32' o 'float16')
+        """
+        if dtype not in CACHE_DTYPES:
+            raise ValueError(f"dtype no soportado: {dtype}")
+
+        self.model_name = model_name
+        self.directory = Path(cache_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '__', model_name)
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._rows: Dict[str, int] = {}
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_meta()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.directory / VECTORS_FILE
+
+    @property
+    def keys_path(self) -> Path:
+        return self.directory / KEYS_FILE
+
+    def _load_meta(self) -> None:
+        """Lee dimensión y dtype de una caché existente (el dtype guardado manda)."""
+        meta_path = self.directory / META_FILE
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.dim = meta['dim']
+            self.dtype = np.dtype(meta['dtype'])
+
+    def _write_meta(self) -> None:
+        meta = {'model': self.model_name, 'dim': self.dim, 'dtype': self.dtype.name}
+        tmp_path = self.directory / f"{META_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        tmp_path.replace(self.directory / META_FILE)
+
+    @contextmanager
+    def _file_lock(self):
+        """Lock exclusivo entre procesos (y entre hilos de este proceso)."""
+        with self._lock, open(self.directory / LOCK_FILE, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Incorpora las claves añadidas por otros procesos y re-mapea la matriz."""
+        if not self.keys_path.exists():
+            return
+
+        if self.keys_path.stat().st_size != self._keys_offset:
+            with open(self.keys_path, 'r', encoding='ascii') as f:
+                f.seek(self._keys_offset)
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # línea a medio escribir por otro proceso
+                    self._rows.setdefault(line.strip(), len(self._rows))
+                    self._keys_offset += len(line)
+            if self.dim is None:
+                self._load_meta()
+            self._matrix = None
+
+        if self._matrix is None and self._rows and self.dim:
+            self._matrix = np.memmap(self.vectors_path, dtype=self.dtype, mode='r',
+                                     shape=(len(self._rows), self.dim))
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Devuelve el embedding (float32) de cada clave, o None si no está en caché."""
+        with self._lock:
+            self._sync()
+            result = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    result.append(None)
+                    self.misses += 1
+                else:
+                    result.append(np.asarray(self._matrix[row], dtype=np.float32))
+                    self.hits += 1
+            return result
+
+    def put_many(self, keys: List[str], vectors: List[List[float]]) -> None:
+        """Añade embeddings nuevos a la caché (las claves ya presentes se ignoran)."""
+        if not keys:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        with self._file_lock():
+            self._sync()
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self._write_meta()
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Dimensión {matrix.shape[1]} distinta a la de la caché ({self.dim})")
+
+            new_rows = [i for i, key in enumerate(keys) if key not in self._rows]
+            new_rows = list({keys[i]: i for i in new_rows}.values())  # sin duplicados
+            if not new_rows:
+                return
+
+            with open(self.vectors_path, 'ab') as f:
+                # Descartar filas huérfanas de una escritura interrumpida
+                f.truncate(len(self._rows) * self.dim * self.dtype.itemsize)
+                f.write(matrix[new_rows].astype(self.dtype).tobytes())
+            with open(self.keys_path, 'a', encoding='ascii') as f:
+                f.write(''.join(f"{keys[i]}\n" for i in new_rows))
+            self._sync()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de la caché."""
+        return {
+            'path': str(self.directory),
+            'dtype': self.dtype.name,
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# Modelo de embeddings determinista que no descarga nada (benchmarks offline y CI)
+STUB_EMBEDDING_MODEL = "stub/hashing"
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Embeddings deterministas por hashing de palabras y bigramas (CRC32 con signo).
+
+    No captura semántica, pero textos con vocabulario compartido quedan cerca:
+    basta para ejercitar el pipeline completo sin red ni modelos.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        words = re.findall(r'\w+', text.casefold())
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Envuelve un modelo de embeddings de LangChain leyendo a través de EmbeddingCache.
+
+    embed_documents pasa por la caché en disco; los embeddings de consultas se
+    guardan en una LRU en memoria (las preguntas se repiten, el corpus no).
+    """
+
+    def __init__(self, embeddings: Any, model_name: str, cache_dir: str = DEFAULT_CACHE_DIR,
+                 dtype: str = 'float32', query_cache_size: int = 512):
+        self.embeddings = embeddings
+        self.cache = EmbeddingCache(model_name, cache_dir=cache_dir, dtype=dtype)
+        self.query_cache = LRUCache(maxsize=query_cache_size)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [content_hash(text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            self.cache.put_many([keys[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                cached[i] = np.asarray(vector, dtype=np.float32)
+
+        return [vector.tolist() for vector in cached]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.query_cache.get(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.query_cache.put(text, vector)
+        return list(vector)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings de varias consultas; cada consulta no cacheada se calcula una sola vez."""
+        vectors = [self.query_cache.get(text) for text in texts]
+        missing = list({texts[i]: i for i, vector in enumerate(vectors) if vector is None})
+        if missing:
+            # Con embed_query: hay modelos que codifican consultas distinto que documentos
+            computed = [self.embeddings.embed_query(text) for text in missing]
+            for text, vector in zip(missing, computed):
+                self.query_cache.put(text, vector)
+            by_text = dict(zip(missing, computed))
+            vectors = [by_text[text] if vector is None else vector
+                       for text, vector in zip(texts, vectors)]
+        return [list(vector) for vector in vectors]
@@ -0,0 +1,80 @@
+"""
+Cachés de Consultas
+
+LRU acotada con TTL opcional y contadores de aciertos/fallos. La usa
+CachedEmbeddings para los embeddings de consultas y RAGSystem para los
+resultados de recuperación (preguntas repetidas, FAQs, query de prueba).
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza una consulta para usarla como clave (mayúsculas y espacios)."""
+    return re.sub(r'\s+', ' ', query).strip().casefold()
+
+
+class LRUCache:
+    """LRU thread-safe con tamaño máximo y expiración opcional por entrada."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Número máximo de entradas (0 desactiva la caché)
+            ttl: Segundos de validez de cada entrada (None = sin expiración)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Devuelve el valor cacheado, o None si no existe o expiró."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Guarda un valor, desalojando la entrada menos usada si se supera maxsize."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Invalida todas las entradas (los contadores se conservan)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tamaño, aciertos, fallos y tasa de acierto."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl_s': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+        }
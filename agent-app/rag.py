@@ -5,10 +5,41 @@ Integra búsqueda híbrida (vectorial + BM25) con re-ranking.
 """
 
 import os
+import json
+import hashlib
+import shutil
+import threading
+import time
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import logging
 
+from chunking import enforce_token_bounds, token_histogram
+from config import ChunkingConfig, RerankerConfig
+from dedup import SOURCES_KEY, collapse_near_duplicates, document_url, metadata_sources
+from bm25_index import BM25_INDEX_FILE, BM25IndexRetriever, load_or_build
+from hybrid_retriever import HybridRetriever, fuse_documents, separation_margin
+from manuelita_cache import (
+    DEFAULT_CACHE_DIR,
+    STUB_EMBEDDING_MODEL,
+    CachedEmbeddings,
+    HashingEmbeddings,
+    LRUCache,
+    normalize_query,
+)
+from reranker import BatchedCrossEncoder, CachedReranker
+# VectorIndex y sus backends se re-exportan para usarlos desde rag
+from vector_index import (
+    VECTOR_BACKENDS,
+    VECTOR_DTYPES,
+    HNSWVectorIndex,
+    IndexedVectorStore,
+    NumpyVectorIndex,
+    VectorIndex,
+    benchmark_backends,
+    quantization_report,
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -17,71 +48,194 @@ try:
     from langchain_text_splitters import MarkdownHeaderTextSplitter
     from langchain_community.vectorstores import Chroma
     from langchain_huggingface import HuggingFaceEmbeddings
-    from langchain_community.retrievers import BM25Retriever
-    try:
-        from langchain.retrievers import EnsembleRetriever, ContextualCompressionRetriever
-    except ImportError:
-        from langchain_community.retrievers import EnsembleRetriever
-        from langchain.retrievers import ContextualCompressionRetriever
     try:
         from langchain_community.cross_encoders import HuggingFaceCrossEncoder
-        from langchain.retrievers.document_compressors import CrossEncoderReranker
     except ImportError:
         HuggingFaceCrossEncoder = None
-        CrossEncoderReranker = None
 except ImportError as e:
     logger.error(f"Dependencias RAG no instaladas: {e}")
-    EnsembleRetriever = None
-    ContextualCompressionRetriever = None
-    CrossEncoderReranker = None
     HuggingFaceCrossEncoder = None
 
 
+# Manifiesto que describe el índice vectorial persistido en vectordb_dir
+INDEX_MANIFEST_FILE = "index_manifest.json"
+INDEX_MANIFEST_VERSION = 2
+
+# Etapas de disponibilidad de la recuperación, de menor a mayor capacidad:
+# cargando → solo BM25 → híbrida (vectorial + BM25) → híbrida con re-ranking
+READINESS_STAGES = ('loading', 'bm25', 'hybrid', 'reranked')
+
+# Búsqueda híbrida: candidatos por rama y pesos de la fusión RRF
+CANDIDATES_PER_LEG = 7
+SEMANTIC_WEIGHT = 0.75
+KEYWORD_WEIGHT = 0.25
+RRF_C = 60
+
+
 class RAGSystem:
     """Sistema RAG con búsqueda híbrida y re-ranking."""
     
     def __init__(self, data_dir: str = "../data/raw/processed", 
                  vectordb_dir: str = "./vectordb",
-                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 embedding_cache_dir: str = DEFAULT_CACHE_DIR,
+                 embedding_cache_dtype: str = "float32",
+                 result_cache_size: int = 256,
+                 result_cache_ttl: Optional[float] = 3600.0,
+                 reranker_config: Optional[RerankerConfig] = None,
+                 chunking_config: Optional[ChunkingConfig] = None,
+                 vector_backend: str = "chroma",
+                 vector_dtype: str = "float32",
+                 sync_index: bool = True,
+                 background_init: bool = False,
+                 warmup_queries: Optional[List[str]] = None,
+                 warmup_top_k: int = 4):
         """
         Inicializa el sistema RAG.
         
         Args:
             data_dir: Directorio con archivos markdown
             vectordb_dir: Directorio para la base vectorial
-            embedding_model: Modelo de embeddings
+            embedding_model: Modelo de embeddings (STUB_EMBEDDING_MODEL para uno determinista sin descargas)
+            embedding_cache_dir: Caché de embeddings en disco compartida con rag/app.py
+            embedding_cache_dtype: Precisión de la caché ('float32' o 'float16')
+            result_cache_size: Máximo de resultados de recuperación cacheados (0 la desactiva)
+            result_cache_ttl: Segundos de validez de un resultado cacheado
+            reranker_config: Modelo, presupuesto de tokens, batch e hilos del re-ranker
+            chunking_config: Tamaño mínimo/máximo y solape de los chunks en tokens, y
+                umbral para colapsar chunks casi duplicados
+            vector_backend: Índice vectorial: 'chroma', 'numpy' (matriz memory-mapped)
+                o 'hnsw' (requiere hnswlib)
+            vector_dtype: Almacenamiento del backend 'numpy': 'float32', 'float16' o
+                'int8' (con escala por vector); las consultas se puntúan en float32
+            sync_index: Sincronizar al arrancar la base persistida con data_dir; con False
+                se abre tal cual y el primer refresh() aplica (y cuenta) los cambios
+            background_init: Cargar documentos y BM25 y volver de inmediato; el modelo de
+                embeddings, la base vectorial y el re-ranker se cargan en un hilo y la
+                recuperación pasa de BM25 a híbrida y a re-rankeada según terminan
+            warmup_queries: Consultas ejecutadas al terminar la carga (calientan modelos y cachés)
+            warmup_top_k: top_k de las consultas de calentamiento
         """
+        if vector_backend not in VECTOR_BACKENDS:
+            raise ValueError(f"vector_backend debe ser uno de {VECTOR_BACKENDS}")
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"vector_dtype debe ser uno de {VECTOR_DTYPES}")
+        if vector_dtype != "float32" and vector_backend != "numpy":
+            raise ValueError("La cuantización solo está disponible con vector_backend='numpy'")
+        
         self.data_dir = data_dir
         self.vectordb_dir = vectordb_dir
         self.embedding_model_name = embedding_model
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_dtype = embedding_cache_dtype
+        self.reranker_config = reranker_config or RerankerConfig()
+        self.chunking_config = chunking_config or ChunkingConfig()
+        self.vector_backend = vector_backend
+        self.vector_dtype = vector_dtype
+        self.sync_index = sync_index
         self.vectorstore = None
-        self.ensemble_retriever = None
-        self.reranking_retriever = None
+        self.embeddings = None
+        self.index_reused = False
+        self.bm25_index = None
+        self.index_version = None
+        self.result_cache = LRUCache(maxsize=result_cache_size, ttl=result_cache_ttl)
+        self.bm25_index_loaded = False
+        self.semantic_retriever = None
+        self.keyword_retriever = None
+        self.hybrid_retriever = None
+        self.reranker = None
         self.documents = []
+        self.raw_splits = []  # Chunks antes de colapsar casi duplicados
         self.splits = []
+        self.dedup_stats = {}
+        self.warmup_queries = list(warmup_queries or [])
+        self.warmup_top_k = warmup_top_k
+        self.readiness = 'loading'
+        self.load_times: Dict[str, float] = {}
+        self.init_error: Optional[str] = None
+        self.initialized = threading.Event()
+        self._init_thread: Optional[threading.Thread] = None
         
-        self._initialize()
+        self._initialize(background=background_init)
     
-    def _initialize(self) -> None:
-        """Inicializa componentes RAG."""
+    def _initialize(self, background: bool = False) -> None:
+        """
+        Inicializa componentes RAG por etapas.
+        
+        Documentos y BM25 se cargan siempre en el hilo actual (basta para responder);
+        los modelos se cargan después, en este hilo o en segundo plano.
+        """
         try:
             logger.info("Inicializando sistema RAG...")
             
             # 1. Cargar documentos
-            self._load_documents()
+            self._timed('documents', self._load_documents)
             
-            # 2. Crear embeddings
-            self._create_embeddings()
+            # 2. Crear retriever BM25
+            self._timed('bm25', self._create_keyword_retriever)
+            if self.keyword_retriever:
+                self._reach('bm25')
+        except Exception as e:
+            logger.error(f"Error inicializando RAG: {e}")
+            self.init_error = str(e)
+        
+        if background:
+            logger.info(f"Cargando modelos RAG en segundo plano (etapa actual: {self.readiness})...")
+            self._init_thread = threading.Thread(target=self._initialize_models,
+                                                 name="rag-init", daemon=True)
+            self._init_thread.start()
+        else:
+            self._initialize_models()
+    
+    def _initialize_models(self) -> None:
+        """Carga embeddings, base vectorial y re-ranker, subiendo de etapa según terminan."""
+        try:
+            # 3. Crear embeddings y base vectorial
+            self._timed('embeddings', self._create_embeddings)
             
-            # 3. Crear retriever híbrido
-            self._create_hybrid_retriever()
+            # 4. Crear retriever híbrido
+            self._timed('hybrid', self._create_hybrid_retriever)
+            if self.hybrid_retriever:
+                self._reach('hybrid')
             
-            # 4. Crear re-ranker
-            self._create_reranker()
+            # 5. Crear re-ranker
+            self._timed('reranker', self._create_reranker)
+            if self.hybrid_retriever and self.reranker:
+                self._reach('reranked')
+            
+            # 6. Consultas de calentamiento
+            if self.warmup_queries:
+                self._timed('warmup', lambda: self.search_batch(self.warmup_queries, self.warmup_top_k))
             
-            logger.info("✅ Sistema RAG inicializado correctamente")
+            logger.info(f"Inicialización del sistema RAG terminada (etapa: {self.readiness})")
         except Exception as e:
             logger.error(f"Error inicializando RAG: {e}")
+            self.init_error = str(e)
+        finally:
+            self.initialized.set()
+    
+    def _reach(self, stage: str) -> None:
+        """Sube a una etapa de READINESS_STAGES y lo registra."""
+        self.readiness = stage
+        logger.info(f"✅ Sistema RAG listo en etapa '{stage}'")
+    
+    def _timed(self, stage: str, step) -> None:
+        """Ejecuta un paso de la inicialización registrando su duración en load_times."""
+        start_time = time.perf_counter()
+        try:
+            step()
+        finally:
+            self.load_times[stage] = time.perf_counter() - start_time
+    
+    def wait_until_initialized(self, timeout: Optional[float] = None) -> str:
+        """
+        Espera a que termine la inicialización (útil con background_init).
+        
+        Returns:
+            La etapa alcanzada (ver READINESS_STAGES)
+        """
+        self.initialized.wait(timeout)
+        return self.readiness
     
     def _load_documents(self) -> None:
         """Carga documentos markdown."""
@@ -95,79 +249,362 @@ class RAGSystem:
             self.documents = loader.load()
             logger.info(f"✅ Cargados {len(self.documents)} documentos")
             
-            # Dividir con MarkdownHeaderTextSplitter
-            headers = [
-                ("#", "Titulo1"),
-                ("##", "Titulo2"),
-                ("###", "Titulo3"),
-            ]
-            splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers,
-                strip_headers=False
-            )
-            
-            self.splits = []
-            for doc in self.documents:
-                chunks = splitter.split_text(doc.page_content)
-                # Preservar metadata (source) del documento original
-                for chunk in chunks:
-                    chunk.metadata['source'] = doc.metadata.get('source', 'Unknown')
-                self.splits.extend(chunks)
-            
-            logger.info(f"✅ {len(self.splits)} chunks creados")
+            self.raw_splits = self._split_documents(self.documents)
+            self._collapse_duplicates()
+            logger.info(f"✅ {len(self.splits)} chunks creados "
+                        f"({self.dedup_stats['collapsed']} casi duplicados colapsados)")
         except Exception as e:
             logger.error(f"Error cargando documentos: {e}")
             self.documents = []
+            self.raw_splits = []
             self.splits = []
     
+    def _split_documents(self, documents: List[Any]) -> List[Any]:
+        """
+        Divide documentos por encabezados markdown preservando su source y
+        ajusta las secciones a los límites de tokens de chunking_config.
+        """
+        headers = [
+            ("#", "Titulo1"),
+            ("##", "Titulo2"),
+            ("###", "Titulo3"),
+        ]
+        splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers,
+            strip_headers=False
+        )
+        
+        splits = []
+        for doc in documents:
+            chunks = splitter.split_text(doc.page_content)
+            url = document_url(doc.page_content)
+            # Preservar metadata (source) del documento original
+            for chunk in chunks:
+                chunk.metadata['source'] = doc.metadata.get('source', 'Unknown')
+                if url:
+                    chunk.metadata['url'] = url
+            splits.extend(chunks)
+        
+        cfg = self.chunking_config
+        return enforce_token_bounds(splits, cfg.min_tokens, cfg.max_tokens, cfg.overlap_tokens)
+    
+    def _collapse_duplicates(self) -> None:
+        """Indexa un solo chunk por grupo de casi duplicados (boilerplate repetido entre páginas)."""
+        self.splits, self.dedup_stats = collapse_near_duplicates(
+            self.raw_splits, self.chunking_config.dedup_threshold
+        )
+    
+    @property
+    def index_manifest_path(self) -> Path:
+        """Ruta del manifiesto del índice vectorial persistido."""
+        return Path(self.vectordb_dir) / INDEX_MANIFEST_FILE
+    
+    @staticmethod
+    def _header_path(chunk: Any) -> str:
+        """Ruta de encabezados del chunk (Titulo1 > Titulo2 > Titulo3)."""
+        return " > ".join(
+            chunk.metadata[key] for key in ("Titulo1", "Titulo2", "Titulo3") if chunk.metadata.get(key)
+        )
+    
+    def _chunk_entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula el id estable de cada chunk: hash de (source, ruta de encabezados, contenido
+        y, si colapsa casi duplicados, sus archivos).
+        
+        Returns:
+            id de vector → {chunk, source, headers, content_hash}, en el orden de self.splits
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        for chunk in self.splits:
+            source = chunk.metadata.get('source', 'Unknown')
+            headers = self._header_path(chunk)
+            content_hash = hashlib.sha256(chunk.page_content.encode('utf-8')).hexdigest()
+            
+            key = f"{source}\0{headers}\0{content_hash}"
+            if chunk.metadata.get(SOURCES_KEY):
+                # Un chunk colapsado cambia de id (y de metadata indexada) si cambian sus duplicados
+                key += f"\0{chunk.metadata[SOURCES_KEY]}"
+            base_id = hashlib.sha256(key.encode('utf-8')).hexdigest()
+            chunk_id, occurrence = base_id, 1
+            # Secciones idénticas repetidas en un mismo archivo reciben ids distintos
+            while chunk_id in entries:
+                occurrence += 1
+                chunk_id = f"{base_id}-{occurrence}"
+            
+            entries[chunk_id] = {
+                'chunk': chunk,
+                'source': source,
+                'headers': headers,
+                'content_hash': content_hash,
+            }
+        return entries
+    
+    def _corpus_hash(self, chunk_ids: List[str]) -> str:
+        """Hash estable del corpus troceado (independiente del orden de carga)."""
+        return hashlib.sha256("\n".join(sorted(chunk_ids)).encode('utf-8')).hexdigest()
+    
+    def _load_index_manifest(self) -> Optional[Dict[str, Any]]:
+        """Lee el manifiesto del índice persistido, si existe y es legible."""
+        try:
+            with open(self.index_manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Manifiesto de índice ilegible, se reconstruirá: {e}")
+            return None
+    
+    def _write_index_manifest(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Escribe el manifiesto del índice (chunk → source, encabezados, hash) de forma atómica."""
+        manifest = {
+            'version': INDEX_MANIFEST_VERSION,
+            'corpus_hash': self._corpus_hash(list(entries)),
+            'embedding_model': self.embedding_model_name,
+            'vector_backend': self.vector_backend,
+            'vector_dtype': self.vector_dtype,
+            'total_chunks': len(entries),
+            'chunks': {
+                chunk_id: {
+                    'source': entry['source'],
+                    'headers': entry['headers'],
+                    'content_hash': entry['content_hash'],
+                }
+                for chunk_id, entry in entries.items()
+            },
+        }
+        tmp_path = self.index_manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.index_manifest_path)
+    
+    def _open_persisted_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Abre el índice persistido si fue creado con el mismo modelo de embeddings.
+        
+        Returns:
+            Los chunks registrados en el manifiesto, o None si hay que reconstruir
+        """
+        manifest = self._load_index_manifest()
+        if not manifest:
+            return None
+        
+        if (manifest.get('version') != INDEX_MANIFEST_VERSION
+                or manifest.get('embedding_model') != self.embedding_model_name
+                or manifest.get('vector_backend', 'chroma') != self.vector_backend
+                or manifest.get('vector_dtype', 'float32') != self.vector_dtype):
+            logger.info("Índice persistido con otro modelo, backend o formato, se reconstruirá")
+            return None
+        
+        if self.vector_backend == 'chroma':
+            vectorstore = Chroma(
+                persist_directory=self.vectordb_dir,
+                embedding_function=self.embeddings
+            )
+            stored = vectorstore._collection.count()
+        else:
+            vectorstore = IndexedVectorStore.load(self.vectordb_dir, self.embeddings, self.vector_backend)
+            stored = vectorstore.count() if vectorstore else 0
+        
+        indexed_chunks = manifest.get('chunks', {})
+        if vectorstore is None or stored != len(indexed_chunks):
+            logger.warning(f"Índice persistido inconsistente ({stored} vectores, "
+                           f"{len(indexed_chunks)} en manifiesto), se reconstruirá")
+            return None
+        
+        self.vectorstore = vectorstore
+        return indexed_chunks
+    
+    def _sync_vectorstore(self, indexed_chunks: Dict[str, Any],
+                          entries: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Embebe solo los chunks nuevos o modificados y elimina los vectores de chunks retirados."""
+        to_delete = [chunk_id for chunk_id in indexed_chunks if chunk_id not in entries]
+        to_add = [chunk_id for chunk_id in entries if chunk_id not in indexed_chunks]
+        
+        if to_delete:
+            self.vectorstore.delete(ids=to_delete)
+        if to_add:
+            self.vectorstore.add_documents([entries[chunk_id]['chunk'] for chunk_id in to_add], ids=to_add)
+        
+        return {
+            'added': len(to_add),
+            'removed': len(to_delete),
+            'unchanged': len(entries) - len(to_add),
+        }
+    
     def _create_embeddings(self) -> None:
-        """Crea base vectorial con embeddings."""
+        """Crea base vectorial con embeddings, reutilizando el índice persistido si es válido."""
         try:
             if not self.splits:
                 logger.warning("No hay splits para embeddings")
                 return
             
-            embeddings = HuggingFaceEmbeddings(
-                model_name=self.embedding_model_name
+            if self.embedding_model_name == STUB_EMBEDDING_MODEL:
+                base_embeddings = HashingEmbeddings()
+            else:
+                base_embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model_name)
+            
+            # Los chunks ya embebidos (por este u otro proceso) se leen de la caché
+            self.embeddings = CachedEmbeddings(
+                base_embeddings,
+                model_name=self.embedding_model_name,
+                cache_dir=self.embedding_cache_dir,
+                dtype=self.embedding_cache_dtype,
             )
             
+            entries = self._chunk_entries()
+            indexed_chunks = self._open_persisted_index()
+            if indexed_chunks is not None and not self.sync_index:
+                self.index_reused = True
+                logger.info("✅ Base vectorial persistida abierta sin sincronizar (pendiente de refresh)")
+                return
+            if indexed_chunks is not None:
+                changes = self._sync_vectorstore(indexed_chunks, entries)
+                if changes['added'] or changes['removed']:
+                    self._write_index_manifest(entries)
+                self.index_reused = True
+                logger.info(f"✅ Base vectorial persistida reutilizada "
+                            f"(+{changes['added']} / -{changes['removed']} chunks)")
+                return
+            
+            # Reconstruir desde cero: from_documents añade al directorio existente,
+            # así que se elimina primero para no duplicar vectores
+            if Path(self.vectordb_dir).exists():
+                shutil.rmtree(self.vectordb_dir)
             Path(self.vectordb_dir).mkdir(parents=True, exist_ok=True)
             
-            self.vectorstore = Chroma.from_documents(
-                documents=self.splits,
-                embedding=embeddings,
-                persist_directory=self.vectordb_dir
-            )
+            documents = [entry['chunk'] for entry in entries.values()]
+            if self.vector_backend == 'chroma':
+                self.vectorstore = Chroma.from_documents(
+                    documents=documents,
+                    embedding=self.embeddings,
+                    ids=list(entries),
+                    persist_directory=self.vectordb_dir
+                )
+            else:
+                self.vectorstore = IndexedVectorStore.from_documents(
+                    documents, self.embeddings, list(entries), self.vectordb_dir,
+                    self.vector_backend, self.vector_dtype
+                )
+            self._write_index_manifest(entries)
+            # El índice BM25 se guardó en vectordb_dir antes de borrarlo
+            if self.bm25_index is not None:
+                self.bm25_index.save(Path(self.vectordb_dir) / BM25_INDEX_FILE)
+            self.index_reused = False
             logger.info("✅ Base vectorial creada")
         except Exception as e:
             logger.error(f"Error creando embeddings: {e}")
     
-    def _create_hybrid_retriever(self) -> None:
-        """Crea retriever híbrido (vectorial + BM25)."""
+    def refresh(self, sources: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Actualiza el índice con los cambios del corpus sin re-embeber lo que no cambió.
+        
+        Args:
+            sources: Archivos markdown añadidos, modificados o eliminados (p. ej. los de un
+                changeset del pipeline). Si es None se vuelve a escanear todo data_dir.
+        
+        Returns:
+            Resumen con chunks añadidos, eliminados y sin cambios
+        """
+        start_time = time.perf_counter()
+        
+        if not self.vectorstore:
+            logger.warning("Vectorstore no disponible, no se puede refrescar")
+            return {'success': False, 'message': 'Vectorstore no disponible'}
+        
+        if sources is None:
+            loader = DirectoryLoader(
+                path=self.data_dir,
+                glob="**/*.md",
+                loader_cls=TextLoader,
+                loader_kwargs={"encoding": "utf-8"},
+            )
+            self.documents = loader.load()
+            self.raw_splits = self._split_documents(self.documents)
+        else:
+            # Solo se releen los archivos indicados; el resto del corpus se conserva
+            changed = {str(Path(source).resolve()) for source in sources}
+            
+            def is_changed(item) -> bool:
+                return str(Path(item.metadata.get('source', '')).resolve()) in changed
+            
+            reloaded = []
+            for source in sources:
+                if Path(source).is_file():
+                    reloaded.extend(TextLoader(str(source), encoding="utf-8").load())
+            
+            self.documents = [doc for doc in self.documents if not is_changed(doc)] + reloaded
+            self.raw_splits = ([chunk for chunk in self.raw_splits if not is_changed(chunk)]
+                               + self._split_documents(reloaded))
+        
+        # Los grupos de duplicados se recalculan sobre todo el corpus
+        self._collapse_duplicates()
+        
+        manifest = self._load_index_manifest() or {}
+        entries = self._chunk_entries()
+        changes = self._sync_vectorstore(manifest.get('chunks', {}), entries)
+        self._write_index_manifest(entries)
+        
+        # Los resultados cacheados corresponden a la versión anterior del índice
+        self.index_version = self._corpus_hash(list(entries))
+        self.result_cache.clear()
+        
+        # BM25 se reconstruye sobre los chunks actualizados; el re-ranker (y su
+        # caché por hash de chunk) sigue siendo válido
+        self._create_keyword_retriever()
+        self._create_hybrid_retriever()
+        if not self.reranker:
+            self._create_reranker()
+        
+        duration = time.perf_counter() - start_time
+        logger.info(f"✅ Índice RAG refrescado en {duration:.2f}s "
+                    f"(+{changes['added']} / -{changes['removed']} chunks)")
+        return {'success': True, **changes, 'duration_s': duration}
+    
+    def _create_keyword_retriever(self) -> None:
+        """Crea la rama BM25 (solo necesita los chunks, no los modelos)."""
         try:
-            if not self.vectorstore or not self.splits:
-                logger.warning("Vectorstore o splits no disponibles")
+            if not self.splits:
+                logger.warning("Splits no disponibles")
                 return
             
-            if not EnsembleRetriever:
-                logger.warning("EnsembleRetriever no disponible, usando solo vectorstore")
-                self.ensemble_retriever = self.vectorstore.as_retriever(search_kwargs={"k": 7})
+            # BM25: índice CSR persistido junto a la base vectorial
+            start_time = time.perf_counter()
+            chunk_ids = list(self._chunk_entries())
+            self.index_version = self._corpus_hash(chunk_ids)
+            Path(self.vectordb_dir).mkdir(parents=True, exist_ok=True)
+            self.bm25_index, self.bm25_index_loaded = load_or_build(
+                Path(self.vectordb_dir) / BM25_INDEX_FILE,
+                [chunk.page_content for chunk in self.splits],
+                chunk_ids,
+            )
+            self.keyword_retriever = BM25IndexRetriever(index=self.bm25_index, docs=self.splits,
+                                                        k=CANDIDATES_PER_LEG)
+            logger.info(f"✅ Índice BM25 {'cargado' if self.bm25_index_loaded else 'construido'} "
+                        f"en {(time.perf_counter() - start_time) * 1000:.1f} ms")
+        except Exception as e:
+            logger.error(f"Error creando retriever BM25: {e}")
+    
+    def _create_hybrid_retriever(self) -> None:
+        """Crea la rama vectorial y la búsqueda híbrida (vectorial + BM25)."""
+        try:
+            if not self.vectorstore or not self.keyword_retriever:
+                logger.warning("Vectorstore o retriever BM25 no disponibles")
                 return
             
             # Semantic
-            semantic_retriever = self.vectorstore.as_retriever(
-                search_kwargs={"k": 7}
+            self.semantic_retriever = self.vectorstore.as_retriever(
+                search_kwargs={"k": CANDIDATES_PER_LEG}
             )
             
-            # BM25
-            keyword_retriever = BM25Retriever.from_documents(self.splits)
-            keyword_retriever.k = 7
-            
-            # Ensemble
-            self.ensemble_retriever = EnsembleRetriever(
-                retrievers=[semantic_retriever, keyword_retriever],
-                weights=[0.75, 0.25]
+            # Ambas ramas en paralelo, fusionadas con RRF ponderado
+            previous = self.hybrid_retriever
+            self.hybrid_retriever = HybridRetriever(
+                [('semantic', self.semantic_retriever, SEMANTIC_WEIGHT),
+                 ('bm25', self.keyword_retriever, KEYWORD_WEIGHT)],
+                rrf_c=RRF_C,
             )
+            if previous:
+                previous.close()
             logger.info("✅ Retriever híbrido creado")
         except Exception as e:
             logger.error(f"Error creando hybrid retriever: {e}")
@@ -175,66 +612,169 @@ class RAGSystem:
     def _create_reranker(self) -> None:
         """Crea re-ranker con Cross-Encoder."""
         try:
-            if not self.ensemble_retriever:
-                logger.warning("Ensemble retriever no disponible")
+            if not self.hybrid_retriever:
+                logger.warning("Retriever híbrido no disponible")
                 return
             
-            if not HuggingFaceCrossEncoder or not CrossEncoderReranker:
-                logger.warning("HuggingFaceCrossEncoder no disponible, usando ensemble sin re-ranking")
-                self.reranking_retriever = self.ensemble_retriever
+            cfg = self.reranker_config
+            if not cfg.enabled:
+                logger.info("Re-ranking desactivado, usando fusión híbrida")
                 return
             
-            reranker_model = HuggingFaceCrossEncoder(
-                model_name="BAAI/bge-reranker-base"
-            )
-            compressor = CrossEncoderReranker(
-                model=reranker_model,
-                top_n=4
-            )
+            try:
+                reranker_model = BatchedCrossEncoder(
+                    cfg.model,
+                    max_length=cfg.max_length,
+                    batch_size=cfg.batch_size,
+                    device=cfg.device,
+                    torch_threads=cfg.torch_threads,
+                    torch_interop_threads=cfg.torch_interop_threads,
+                )
+            except ImportError:
+                if not HuggingFaceCrossEncoder:
+                    logger.warning("Cross-encoder no disponible, usando fusión híbrida sin re-ranking")
+                    return
+                reranker_model = HuggingFaceCrossEncoder(model_name=cfg.model)
             
-            self.reranking_retriever = ContextualCompressionRetriever(
-                base_compressor=compressor,
-                base_retriever=self.ensemble_retriever
-            )
+            prune_margin = cfg.prune_margin
+            if prune_margin is None:
+                prune_margin = separation_margin([SEMANTIC_WEIGHT, KEYWORD_WEIGHT], cfg.top_n, RRF_C)
+            self.reranker = CachedReranker(reranker_model, top_n=cfg.top_n, prune_margin=prune_margin)
             logger.info("✅ Re-ranker creado")
         except Exception as e:
             logger.error(f"Error creando reranker: {e}")
-            # Fallback: usar ensemble sin re-ranking
-            self.reranking_retriever = self.ensemble_retriever
+            # Fallback: usar la fusión sin re-ranking
+            self.reranker = None
     
     def retrieve(self, query: str, top_k: int = 4) -> Tuple[List[str], List[Dict[str, Any]]]:
         """
         Recupera contexto para una query.
         
+        Mientras los modelos cargan (background_init) usa solo BM25, luego la
+        búsqueda híbrida y por último la híbrida con re-ranking.
+        
         Returns:
             (contexto_consolidado, documentos_recuperados)
         """
         try:
-            if not self.reranking_retriever:
-                logger.warning("Reranking retriever no disponible")
+            # La etapa se lee antes que los componentes: nunca es mayor que la que se usa
+            stage = self.readiness
+            hybrid_retriever, reranker = self.hybrid_retriever, self.reranker
+            if not hybrid_retriever and not self.keyword_retriever:
+                logger.warning("Retriever no disponible")
                 return "", []
             
-            docs = self.reranking_retriever.invoke(query)
+            cache_key = (normalize_query(query), top_k, self.index_version, stage)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                consolidated_context, doc_info = cached
+                return consolidated_context, [dict(info) for info in doc_info]
             
-            # Consolidar contexto
-            context_parts = []
-            doc_info = []
+            if hybrid_retriever:
+                candidates = hybrid_retriever.retrieve(query)
+            else:
+                candidates = fuse_documents([self.keyword_retriever.invoke(query)], [KEYWORD_WEIGHT], RRF_C)
+            docs = [doc for doc, _ in candidates[:self.reranker_config.top_n]]
+            if reranker:
+                try:
+                    docs = reranker.rerank(query, candidates)
+                except Exception as e:
+                    logger.warning(f"Re-ranking falló, usando orden de la fusión: {e}")
             
-            for i, doc in enumerate(docs[:top_k]):
-                context_parts.append(doc.page_content)
-                doc_info.append({
-                    'rank': i + 1,
-                    'content': doc.page_content[:200],  # Preview
-                    'source': doc.metadata.get('source', 'Unknown'),
-                    'relevance': 'Alta' if i < 2 else 'Media'
-                })
-            
-            consolidated_context = "\n---\n".join(context_parts)
+            consolidated_context, doc_info = self._consolidate(docs, top_k)
+            self.result_cache.put(cache_key, (consolidated_context, [dict(info) for info in doc_info]))
             return consolidated_context, doc_info
         except Exception as e:
             logger.error(f"Error retrieving: {e}")
             return "", []
     
+    @staticmethod
+    def _consolidate(docs: List[Any], top_k: int) -> Tuple[str, List[Dict[str, Any]]]:
+        """Une los top_k documentos en un contexto y arma sus metadatos."""
+        context_parts = []
+        doc_info = []
+        
+        for i, doc in enumerate(docs[:top_k]):
+            context_parts.append(doc.page_content)
+            doc_info.append({
+                'rank': i + 1,
+                'content': doc.page_content[:200],  # Preview
+                'source': doc.metadata.get('source', 'Unknown'),
+                'sources': metadata_sources(doc.metadata),
+                'relevance': 'Alta' if i < 2 else 'Media'
+            })
+        
+        return "\n---\n".join(context_parts), doc_info
+    
+    def _semantic_candidates_batch(self, queries: List[str]) -> List[List[Any]]:
+        """Rama semántica de un lote: cada consulta distinta se embebe una vez (con caché)."""
+        if hasattr(self.embeddings, 'embed_queries'):
+            query_vectors = self.embeddings.embed_queries(queries)
+        else:
+            query_vectors = [self.embeddings.embed_query(query) for query in queries]
+        return [self.vectorstore.similarity_search_by_vector(vector, k=CANDIDATES_PER_LEG)
+                for vector in query_vectors]
+    
+    def retrieve_batch(self, queries: List[str],
+                       top_k: int = 4) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Recupera contexto para un lote de queries (evaluación offline, pre-calentado de cachés).
+        
+        Equivale a llamar retrieve() por cada query, pero embebe cada query
+        distinta una sola vez, puntúa BM25 con un producto disperso para todo
+        el lote y re-rankea los pares de todas las queries en batches conjuntos.
+        Los resultados quedan en la caché de resultados.
+        
+        Returns:
+            [(contexto_consolidado, documentos_recuperados)] en el orden de queries
+        """
+        results: List[Optional[Tuple[str, List[Dict[str, Any]]]]] = [None] * len(queries)
+        try:
+            stage = self.readiness
+            if not self.hybrid_retriever:
+                # Modelos aún cargando: una a una, con la etapa disponible
+                return [self.retrieve(query, top_k) for query in queries]
+            
+            # Queries no cacheadas, sin repetir
+            pending: Dict[Tuple[str, int, Optional[str], str], List[int]] = {}
+            for i, query in enumerate(queries):
+                cache_key = (normalize_query(query), top_k, self.index_version, stage)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    consolidated_context, doc_info = cached
+                    results[i] = (consolidated_context, [dict(info) for info in doc_info])
+                else:
+                    pending.setdefault(cache_key, []).append(i)
+            
+            if pending:
+                batch = [queries[positions[0]] for positions in pending.values()]
+                semantic = self._semantic_candidates_batch(batch)
+                keyword = [[self.splits[i] for i, _ in ranked]
+                           for ranked in self.bm25_index.top_k_batch(batch, CANDIDATES_PER_LEG)]
+                candidates = [fuse_documents([semantic_docs, keyword_docs],
+                                             [SEMANTIC_WEIGHT, KEYWORD_WEIGHT], RRF_C)
+                              for semantic_docs, keyword_docs in zip(semantic, keyword)]
+                
+                ranked_docs = [[doc for doc, _ in query_candidates[:self.reranker_config.top_n]]
+                               for query_candidates in candidates]
+                reranker = self.reranker
+                if reranker:
+                    try:
+                        ranked_docs = reranker.rerank_batch(batch, candidates)
+                    except Exception as e:
+                        logger.warning(f"Re-ranking falló, usando orden de la fusión: {e}")
+                
+                for (cache_key, positions), docs in zip(pending.items(), ranked_docs):
+                    consolidated_context, doc_info = self._consolidate(docs, top_k)
+                    self.result_cache.put(cache_key, (consolidated_context, [dict(info) for info in doc_info]))
+                    for i in positions:
+                        results[i] = (consolidated_context, [dict(info) for info in doc_info])
+            
+            return results
+        except Exception as e:
+            logger.error(f"Error retrieving batch: {e}")
+            return [result or ("", []) for result in results]
+    
     def search(self, query: str, top_k: int = 4) -> Dict[str, Any]:
         """
         Búsqueda completa con contexto y metadatos.
@@ -249,6 +789,26 @@ class RAGSystem:
             'total_chunks': len(self.splits)
         }
     
+    def search_batch(self, queries: List[str], top_k: int = 4) -> List[Dict[str, Any]]:
+        """
+        search() para un lote de queries, con la recuperación de retrieve_batch().
+        """
+        return [
+            {
+                'query': query,
+                'context': context,
+                'documents': docs,
+                'total_docs_available': len(self.documents),
+                'total_chunks': len(self.splits)
+            }
+            for query, (context, docs) in zip(queries, self.retrieve_batch(queries, top_k))
+        ]
+    
+    def _vector_index_bytes(self) -> Optional[int]:
+        """Memoria de los vectores del índice (solo backend 'numpy')."""
+        index = getattr(self.vectorstore, 'index', None)
+        return getattr(index, 'nbytes', None)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas del sistema RAG."""
         return {
@@ -256,14 +816,168 @@ class RAGSystem:
             'total_chunks': len(self.splits),
             'documents_loaded': len(self.documents),
             'chunks_created': len(self.splits),
+            'chunk_tokens': token_histogram(self.splits),
+            'near_duplicates': self.dedup_stats,
             'embedding_model': self.embedding_model_name,
             'vectorstore_available': self.vectorstore is not None,
-            'retriever_available': self.reranking_retriever is not None
+            'vector_backend': self.vector_backend,
+            'vector_dtype': self.vector_dtype,
+            'vector_index_bytes': self._vector_index_bytes(),
+            'index_reused': self.index_reused,
+            'bm25_index_loaded': self.bm25_index_loaded,
+            'embedding_cache': self.embeddings.cache.get_stats() if self.embeddings else None,
+            'query_embedding_cache': self.embeddings.query_cache.get_stats() if self.embeddings else None,
+            'result_cache': self.result_cache.get_stats(),
+            'retrieval_latency': self.hybrid_retriever.get_stats() if self.hybrid_retriever else None,
+            'reranker': self.reranker.get_stats() if self.reranker else None,
+            'readiness': {
+                'stage': self.readiness,
+                'initializing': not self.initialized.is_set(),
+                'load_times_s': dict(self.load_times),
+                'error': self.init_error,
+            },
+            'retriever_available': self.hybrid_retriever is not None or self.keyword_retriever is not None
         }
 
 
+def changeset_sources(changeset_files: List[str], base_dir: str = ".") -> List[str]:
+    """
+    Lee los changesets del pipeline de scraping y devuelve los archivos afectados.
+    
+    Args:
+        changeset_files: Rutas a archivos changeset_<tipo>_<fecha>.json
+        base_dir: Directorio desde el que se ejecutó el pipeline (las rutas son relativas a él)
+    """
+    sources = []
+    for changeset_file in changeset_files:
+        with open(changeset_file, 'r', encoding='utf-8') as f:
+            changeset = json.load(f)
+        for change_type in ('added', 'updated', 'removed'):
+            for change in changeset.get(change_type, []):
+                if change.get('output_path'):
+                    sources.append(str(Path(base_dir) / change['output_path']))
+    return sources
+
+
 if __name__ == '__main__':
-    # Ejemplo de uso
-    rag = RAGSystem()
-    result = rag.search("¿Cuál es la historia de Manuelita?")
-    print(f"Contexto: {result['context'][:300]}...")
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sistema RAG de Manuelita")
+    subparsers = parser.add_subparsers(dest="command")
+    refresh_parser = subparsers.add_parser("refresh", help="Actualizar el índice con los cambios del corpus")
+    refresh_parser.add_argument("--changeset", action="append", default=[],
+                                help="Changeset JSON del pipeline (se puede repetir); sin él se re-escanea data_dir")
+    refresh_parser.add_argument("--base-dir", default=".",
+                                help="Directorio desde el que se ejecutó el pipeline de scraping")
+    refresh_parser.add_argument("--data-dir", default="../data/raw/processed")
+    refresh_parser.add_argument("--vectordb-dir", default="./vectordb")
+    refresh_parser.add_argument("--vector-backend", choices=VECTOR_BACKENDS, default="chroma")
+    refresh_parser.add_argument("--vector-dtype", choices=VECTOR_DTYPES, default="float32")
+    bench_parser = subparsers.add_parser("bench-index", help="Comparar backends vectoriales sobre el corpus")
+    bench_parser.add_argument("--data-dir", default="../data/raw/processed")
+    bench_parser.add_argument("--vectordb-dir", default=None,
+                              help="Por defecto un directorio temporal (no toca ./vectordb)")
+    bench_parser.add_argument("--backend", action="append", choices=VECTOR_BACKENDS,
+                              help="Backend a comparar (se puede repetir); por defecto todos")
+    bench_parser.add_argument("--k", type=int, default=CANDIDATES_PER_LEG)
+    quant_parser = subparsers.add_parser("quant-report",
+                                         help="Recall@k de float16/int8 frente a float32 en el golden set")
+    quant_parser.add_argument("--data-dir", default="../data/raw/processed")
+    quant_parser.add_argument("--vectordb-dir", default=None,
+                              help="Por defecto un directorio temporal (no toca ./vectordb)")
+    quant_parser.add_argument("--k", type=int, default=CANDIDATES_PER_LEG)
+    rag_bench_parser = subparsers.add_parser("bench",
+                                             help="Recall@k, MRR, nDCG y latencia por etapa sobre el golden set")
+    rag_bench_parser.add_argument("--data-dir", default="../data/raw/processed")
+    rag_bench_parser.add_argument("--vectordb-dir", default=None,
+                                  help="Por defecto un directorio temporal (no toca ./vectordb)")
+    rag_bench_parser.add_argument("--golden", default=None, help="Golden set JSON (por defecto el del repo)")
+    rag_bench_parser.add_argument("--k", type=int, default=4)
+    rag_bench_parser.add_argument("--repeat", type=int, default=1, help="Pasadas por el golden set")
+    rag_bench_parser.add_argument("--vector-backend", choices=VECTOR_BACKENDS, default="chroma")
+    rag_bench_parser.add_argument("--stub-embeddings", action="store_true",
+                                  help="Embeddings deterministas sin descargar modelos (CI, offline)")
+    rag_bench_parser.add_argument("--no-rerank", action="store_true", help="Evaluar sin cross-encoder")
+    rag_bench_parser.add_argument("--prune-margin", type=float, default=None,
+                                  help="Margen de poda del re-ranker (0 = re-rankear siempre)")
+    rag_bench_parser.add_argument("--per-query", action="store_true", help="Incluir el detalle por consulta")
+    args = parser.parse_args()
+    
+    if args.command == "refresh":
+        # Sin sincronizar al arrancar: el resumen cuenta los cambios que aplica refresh()
+        rag = RAGSystem(data_dir=args.data_dir, vectordb_dir=args.vectordb_dir,
+                        vector_backend=args.vector_backend, vector_dtype=args.vector_dtype,
+                        sync_index=False)
+        if rag.index_reused:
+            sources = changeset_sources(args.changeset, args.base_dir) if args.changeset else None
+            summary = rag.refresh(sources)
+        else:
+            # Sin índice reutilizable la inicialización lo reconstruyó entero
+            summary = {'success': rag.vectorstore is not None, 'rebuilt': True,
+                       'added': len(rag.splits), 'removed': 0, 'unchanged': 0}
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    elif args.command == "bench-index":
+        import tempfile
+        from config import SAMPLE_FAQS
+        
+        with tempfile.TemporaryDirectory() as workdir:
+            # El índice del benchmark no debe reemplazar el de ./vectordb
+            rag = RAGSystem(data_dir=args.data_dir,
+                            vectordb_dir=args.vectordb_dir or str(Path(workdir) / "vectordb"))
+            entries = rag._chunk_entries()
+            # Consultas: las FAQs de ejemplo más las rutas de encabezados del corpus
+            queries = [faq['question'] for faq in SAMPLE_FAQS]
+            queries += sorted({entry['headers'] for entry in entries.values() if entry['headers']})[:100]
+            rows = benchmark_backends(
+                [entry['chunk'] for entry in entries.values()], list(entries), rag.embeddings,
+                queries, workdir, backends=tuple(args.backend or VECTOR_BACKENDS), k=args.k
+            )
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    elif args.command == "quant-report":
+        import tempfile
+        import numpy as np
+        from evaluation import load_golden_queries
+        
+        with tempfile.TemporaryDirectory() as workdir:
+            # El informe no debe reemplazar el índice de ./vectordb
+            rag = RAGSystem(data_dir=args.data_dir,
+                            vectordb_dir=args.vectordb_dir or str(Path(workdir) / "vectordb"))
+            entries = rag._chunk_entries()
+            golden = load_golden_queries()
+            vectors = np.asarray(rag.embeddings.embed_documents(
+                [entry['chunk'].page_content for entry in entries.values()]), dtype=np.float32)
+            rows = quantization_report(
+                vectors, list(entries),
+                [rag.embeddings.embed_query(item['query']) for item in golden],
+                # Recall por archivo de origen: cuántos de los archivos relevantes aparecen en el top-k
+                [set(item['relevant_sources']) for item in golden],
+                groups={chunk_id: Path(entry['source']).name for chunk_id, entry in entries.items()},
+                k=args.k,
+            )
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    elif args.command == "bench":
+        import tempfile
+        from evaluation import GOLDEN_QUERIES_FILE, load_golden_set, run_benchmark
+        
+        golden_set = load_golden_set(args.golden or GOLDEN_QUERIES_FILE)
+        reranker_config = RerankerConfig(enabled=not args.no_rerank, prune_margin=args.prune_margin)
+        with tempfile.TemporaryDirectory() as workdir:
+            # Otro backend o modelo reconstruiría (borrándolo) el índice de ./vectordb
+            vectordb_dir = args.vectordb_dir or str(Path(workdir) / "vectordb")
+            embedding_options = {}
+            if args.stub_embeddings:
+                embedding_options = {'embedding_model': STUB_EMBEDDING_MODEL,
+                                     'embedding_cache_dir': str(Path(workdir) / "embeddings")}
+            rag = RAGSystem(data_dir=args.data_dir, vectordb_dir=vectordb_dir,
+                            reranker_config=reranker_config, vector_backend=args.vector_backend,
+                            **embedding_options)
+            report = run_benchmark(rag, golden_set['queries'], k=args.k, repeat=args.repeat)
+        report = {'golden_set_version': golden_set.get('version'), **report}
+        if not args.per_query:
+            report.pop('per_query')
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        # Ejemplo de uso
+        rag = RAGSystem()
+        result = rag.search("¿Cuál es la historia de Manuelita?")
+        print(f"Contexto: {result['context'][:300]}...")
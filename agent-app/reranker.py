@@ -0,0 +1,248 @@
+"""
+Re-ranking con Caché y Poda Adaptativa
+
+El cross-encoder es el paso más caro de la recuperación: puntúa cada par
+(consulta, chunk) candidato en CPU. CachedReranker guarda esas puntuaciones
+por (hash de consulta, hash de chunk) y evita el cross-encoder cuando la
+fusión híbrida ya separa claramente el top-n, o lo limita a los top-m
+candidatos de la fusión.
+
+BatchedCrossEncoder ejecuta el cross-encoder directamente con transformers:
+trunca cada par a un presupuesto de tokens, puntúa los pares en un batch con
+padding, fija los hilos de torch desde la configuración y mide cada llamada.
+"""
+
+import hashlib
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from manuelita_cache import LRUCache, normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def configure_torch_threads(intra_op: int = 0, inter_op: int = 0) -> None:
+    """Fija los hilos intra-op e inter-op de torch (0 deja el valor por defecto)."""
+    import torch
+
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+    if inter_op > 0:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            # Solo se puede fijar antes del primer trabajo paralelo del proceso
+            logger.warning(f"No se pudieron fijar los hilos inter-op de torch: {e}")
+
+
+class BatchedCrossEncoder:
+    """Cross-encoder con truncado por tokens, batch con padding y tiempos por llamada."""
+
+    def __init__(self, model_name: str, max_length: int = 384, batch_size: int = 16,
+                 device: str = "cpu", torch_threads: int = 0, torch_interop_threads: int = 0):
+        """
+        Args:
+            model_name: Modelo de Hugging Face (p. ej. BAAI/bge-reranker-base)
+            max_length: Presupuesto de tokens por par; se recorta primero el chunk
+            batch_size: Pares por forward
+            device: Dispositivo de torch
+            torch_threads: Hilos intra-op de torch (0 = por defecto)
+            torch_interop_threads: Hilos inter-op de torch (0 = por defecto)
+        """
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        configure_torch_threads(torch_threads, torch_interop_threads)
+        self._torch = torch
+        self.model_name = model_name
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to(device)
+        self.model.eval()
+
+        self.calls = 0
+        self.pairs = 0
+        self.durations: deque = deque(maxlen=1000)
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Puntúa pares (consulta, chunk); misma escala que HuggingFaceCrossEncoder."""
+        if not pairs:
+            return []
+
+        torch = self._torch
+        start_time = time.perf_counter()
+        scores: List[float] = []
+        with torch.inference_mode():
+            for i in range(0, len(pairs), self.batch_size):
+                batch = pairs[i:i + self.batch_size]
+                features = self.tokenizer(
+                    [query for query, _ in batch],
+                    [passage for _, passage in batch],
+                    padding=True,
+                    truncation='longest_first',
+                    max_length=self.max_length,
+                    return_tensors='pt',
+                ).to(self.device)
+                logits = self.model(**features).logits
+                if logits.shape[-1] == 1:
+                    batch_scores = torch.sigmoid(logits[:, 0])
+                else:
+                    batch_scores = torch.softmax(logits, dim=-1)[:, 1]
+                scores.extend(batch_scores.float().cpu().tolist())
+
+        duration = time.perf_counter() - start_time
+        self.calls += 1
+        self.pairs += len(pairs)
+        self.durations.append(duration)
+        logger.debug(f"Re-ranking de {len(pairs)} pares en {duration * 1000:.1f} ms")
+        return scores
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Llamadas, pares y latencia por llamada (ms) del cross-encoder."""
+        durations = sorted(self.durations)
+
+        def percentile(q: float) -> Optional[float]:
+            if not durations:
+                return None
+            return durations[min(len(durations) - 1, int(q * len(durations)))] * 1000
+
+        return {
+            'model': self.model_name,
+            'calls': self.calls,
+            'pairs': self.pairs,
+            'max_length': self.max_length,
+            'batch_size': self.batch_size,
+            'torch_threads': self._torch.get_num_threads(),
+            'last_ms': self.durations[-1] * 1000 if durations else None,
+            'mean_ms': sum(durations) / len(durations) * 1000 if durations else None,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+        }
+
+
+class CachedReranker:
+    """Re-ranker sobre un cross-encoder con caché de puntuaciones y poda adaptativa."""
+
+    def __init__(self, model: Any, top_n: int = 4, max_candidates: int = 8,
+                 prune_margin: float = 0.25, score_cache_size: int = 4096):
+        """
+        Args:
+            model: Cross-encoder con score(pares) -> puntuaciones (p. ej. HuggingFaceCrossEncoder)
+            top_n: Documentos devueltos tras el re-ranking
+            max_candidates: Solo se re-rankean los top-m candidatos de la fusión
+            prune_margin: Salto relativo entre la puntuación fusionada del n-ésimo
+                candidato y la del siguiente a partir del cual no se re-rankea
+                (0 desactiva la poda); con RRF, hybrid_retriever.separation_margin
+                da el valor que corresponde a los pesos de las ramas
+            score_cache_size: Máximo de pares (consulta, chunk) cacheados
+        """
+        self.model = model
+        self.top_n = top_n
+        self.max_candidates = max(max_candidates, top_n)
+        self.prune_margin = prune_margin
+        self.score_cache = LRUCache(maxsize=score_cache_size)
+        self.calls = 0
+        self.skipped = 0
+        self.pairs_scored = 0
+
+    def _is_separated(self, fused_scores: List[float]) -> bool:
+        """Si la fusión ya separa el top-n del resto por al menos prune_margin."""
+        if not self.prune_margin or len(fused_scores) <= self.top_n:
+            return False
+        last_kept, first_dropped = fused_scores[self.top_n - 1], fused_scores[self.top_n]
+        # Tolerancia de redondeo: separation_margin es justo el salto de un caso límite
+        return last_kept > 0 and (last_kept - first_dropped) / last_kept >= self.prune_margin - 1e-9
+
+    def score(self, query: str, docs: List[Any]) -> List[float]:
+        """Puntúa los pares (consulta, chunk), calculando con el modelo solo los no cacheados."""
+        query_hash = _hash(normalize_query(query))
+        keys = [(query_hash, _hash(doc.page_content)) for doc in docs]
+        scores = [self.score_cache.get(key) for key in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            computed = self.model.score([(query, docs[i].page_content) for i in missing])
+            self.pairs_scored += len(missing)
+            for i, score in zip(missing, computed):
+                scores[i] = float(score)
+                self.score_cache.put(keys[i], scores[i])
+        return scores
+
+    def rerank(self, query: str, candidates: List[Tuple[Any, float]]) -> List[Any]:
+        """
+        Ordena los candidatos de la fusión y devuelve los top_n.
+
+        Args:
+            query: Consulta del usuario
+            candidates: (documento, puntuación fusionada), ordenados de mayor a menor
+        """
+        self.calls += 1
+        fused_scores = [score for _, score in candidates]
+        if len(candidates) <= 1 or self._is_separated(fused_scores):
+            self.skipped += 1
+            return [doc for doc, _ in candidates[:self.top_n]]
+
+        docs = [doc for doc, _ in candidates[:self.max_candidates]]
+        scores = self.score(query, docs)
+        ranked = sorted(zip(docs, scores), key=lambda item: item[1], reverse=True)
+        return [doc for doc, _ in ranked[:self.top_n]]
+
+    def rerank_batch(self, queries: List[str],
+                     candidates: List[List[Tuple[Any, float]]]) -> List[List[Any]]:
+        """
+        rerank para un lote de consultas: los pares no cacheados de todas las
+        consultas se puntúan juntos, en los batches del modelo.
+        """
+        results: List[Optional[List[Any]]] = [None] * len(queries)
+        pending = []
+        for i, query_candidates in enumerate(candidates):
+            self.calls += 1
+            fused_scores = [score for _, score in query_candidates]
+            if len(query_candidates) <= 1 or self._is_separated(fused_scores):
+                self.skipped += 1
+                results[i] = [doc for doc, _ in query_candidates[:self.top_n]]
+            else:
+                pending.append((i, [doc for doc, _ in query_candidates[:self.max_candidates]]))
+
+        # Puntuaciones cacheadas; los pares que faltan, de todas las consultas, van juntos al modelo
+        pending_scores = []
+        missing: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for i, docs in pending:
+            query_hash = _hash(normalize_query(queries[i]))
+            keys = [(query_hash, _hash(doc.page_content)) for doc in docs]
+            scores = [self.score_cache.get(key) for key in keys]
+            for key, doc, score in zip(keys, docs, scores):
+                if score is None:
+                    missing.setdefault(key, (queries[i], doc.page_content))
+            pending_scores.append((keys, scores))
+
+        computed: Dict[Tuple[str, str], float] = {}
+        if missing:
+            computed = dict(zip(missing, map(float, self.model.score(list(missing.values())))))
+            self.pairs_scored += len(missing)
+            for key, score in computed.items():
+                self.score_cache.put(key, score)
+
+        for (i, docs), (keys, scores) in zip(pending, pending_scores):
+            scores = [computed[key] if score is None else score for key, score in zip(keys, scores)]
+            ranked = sorted(zip(docs, scores), key=lambda item: item[1], reverse=True)
+            results[i] = [doc for doc, _ in ranked[:self.top_n]]
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Llamadas, llamadas podadas, pares calculados por el modelo y uso de la caché."""
+        return {
+            'calls': self.calls,
+            'skipped': self.skipped,
+            'pairs_scored': self.pairs_scored,
+            'score_cache': self.score_cache.get_stats(),
+            'model': self.model.get_stats() if hasattr(self.model, 'get_stats') else None,
+        }
@@ -0,0 +1,41 @@
+"""
+Configuración común de los tests de agent-app.
+
+Los módulos de agent-app se importan por nombre (como hace app.py), así que
+el directorio de la app se añade a sys.path. Los tests cubren las piezas de
+recuperación que solo dependen de numpy; el modelo de embeddings es el stub
+determinista HashingEmbeddings.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+AGENT_APP_DIR = Path(__file__).resolve().parent.parent
+if str(AGENT_APP_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_APP_DIR))
+
+
+class Doc:
+    """Documento mínimo con la interfaz de langchain_core.documents.Document."""
+
+    def __init__(self, page_content: str, metadata: dict = None):
+        self.page_content = page_content
+        self.metadata = metadata or {}
+
+    def __repr__(self) -> str:
+        return f"Doc({self.page_content[:30]!r}, {self.metadata!r})"
+
+
+@pytest.fixture
+def corpus():
+    """Corpus pequeño en español sobre los negocios de Manuelita."""
+    return [
+        "Manuelita produce azúcar y etanol a partir de la caña en el Valle del Cauca",
+        "La fundación Manuelita apoya la educación de las comunidades vecinas",
+        "Manuelita cultiva uva de mesa y produce vino en el norte de Chile",
+        "El aceite de palma de Manuelita se produce en los Llanos Orientales",
+        "Los camarones de cultivo de Manuelita se exportan desde Colombia",
+        "La línea ética permite reportar conductas contrarias al código de ética",
+    ]
@@ -0,0 +1,101 @@
+"""
+RAGSystem con componentes de prueba.
+
+Los componentes que dependen de LangChain y de los modelos (carga de
+markdown, base vectorial, cross-encoder) se sustituyen en una subclase por
+equivalentes sobre los índices de este paquete y HashingEmbeddings; la
+secuencia de etapas, el hilo de carga, las cachés y la fusión son los de
+RAGSystem.
+"""
+
+import numpy as np
+
+from bm25_index import BM25Index
+from conftest import Doc
+from manuelita_cache import STUB_EMBEDDING_MODEL, CachedEmbeddings, HashingEmbeddings
+from rag import CANDIDATES_PER_LEG, RAGSystem
+from reranker import CachedReranker
+
+
+class KeywordRetriever:
+    def __init__(self, index, docs):
+        self.index = index
+        self.docs = docs
+
+    def invoke(self, query):
+        return [self.docs[i] for i, _ in self.index.top_k(query, CANDIDATES_PER_LEG)]
+
+
+class VectorStore:
+    """Búsqueda exacta por coseno sobre los chunks."""
+
+    def __init__(self, docs, embeddings):
+        self.docs = docs
+        self.embeddings = embeddings
+        self.matrix = np.asarray(embeddings.embed_documents([doc.page_content for doc in docs]))
+
+    def similarity_search_by_vector(self, vector, k=4):
+        order = np.argsort(-(self.matrix @ np.asarray(vector)), kind='stable')
+        return [self.docs[i] for i in order[:k]]
+
+    def as_retriever(self, search_kwargs):
+        store, k = self, search_kwargs['k']
+        return type("Retriever", (), {
+            "invoke": lambda _, query: store.similarity_search_by_vector(store.embeddings.embed_query(query), k),
+        })()
+
+
+class OverlapCrossEncoder:
+    def __init__(self):
+        self.pairs = 0
+
+    def score(self, pairs):
+        self.pairs += len(pairs)
+        return [float(len(set(query.casefold().split()) & set(passage.casefold().split())))
+                for query, passage in pairs]
+
+
+class StagedRAG(RAGSystem):
+    """
+    RAGSystem con componentes de prueba. Los gates retienen la carga de
+    embeddings y del re-ranker; failures hace fallar los pasos indicados.
+    """
+
+    def __init__(self, corpus, tmp_path, gates=None, failures=(), **kwargs):
+        self.corpus = corpus
+        self.cache_dir = str(tmp_path / "embeddings")
+        self.gates = gates or {}
+        self.failures = set(failures)
+        super().__init__(data_dir=str(tmp_path / "data"), vectordb_dir=str(tmp_path / "vectordb"),
+                         embedding_model=STUB_EMBEDDING_MODEL, **kwargs)
+
+    def _step(self, name):
+        if name in self.gates:
+            assert self.gates[name].wait(timeout=5)
+        if name in self.failures:
+            raise RuntimeError(f"{name} no disponible")
+
+    def _load_documents(self):
+        self._step('documents')
+        self.documents = [Doc(text, {'source': f"doc{i}.md"}) for i, text in enumerate(self.corpus)]
+        self.raw_splits = list(self.documents)
+        self._collapse_duplicates()
+
+    def _create_keyword_retriever(self):
+        if not self.splits:
+            return
+        self.index_version = "v1"
+        self.bm25_index = BM25Index.build([doc.page_content for doc in self.splits],
+                                          [f"chunk-{i}" for i in range(len(self.splits))])
+        self.keyword_retriever = KeywordRetriever(self.bm25_index, self.splits)
+
+    def _create_embeddings(self):
+        self._step('embeddings')
+        self.embeddings = CachedEmbeddings(HashingEmbeddings(dim=64), STUB_EMBEDDING_MODEL,
+                                           cache_dir=self.cache_dir)
+        self.vectorstore = VectorStore(self.splits, self.embeddings)
+
+    def _create_reranker(self):
+        self._step('reranker')
+        if self.hybrid_retriever and self.reranker_config.enabled:
+            self.reranker = CachedReranker(OverlapCrossEncoder(), top_n=self.reranker_config.top_n)
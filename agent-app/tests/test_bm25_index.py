@@ -0,0 +1,132 @@
+"""Tests del índice BM25 persistido."""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from bm25_index import BM25Index, load_or_build
+
+
+def reference_scores(texts, query, k1=1.5, b=0.75, epsilon=0.25):
+    """BM25Okapi de rank_bm25, término a término."""
+    docs = [text.split() for text in texts]
+    avgdl = sum(len(doc) for doc in docs) / len(docs)
+    document_frequency = Counter(term for doc in docs for term in set(doc))
+    idf = {term: math.log(len(docs) - freq + 0.5) - math.log(freq + 0.5)
+           for term, freq in document_frequency.items()}
+    average_idf = sum(idf.values()) / len(idf)
+    idf = {term: value if value >= 0 else epsilon * average_idf for term, value in idf.items()}
+
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        norm = k1 * (1 - b + b * len(doc) / avgdl)
+        scores.append(sum(idf.get(term, 0.0) * tf[term] * (k1 + 1) / (tf[term] + norm)
+                          for term in query.split()))
+    return np.array(scores)
+
+
+def _keys(texts):
+    return [f"chunk-{i}" for i in range(len(texts))]
+
+
+@pytest.mark.parametrize("query", ["Manuelita produce azúcar", "vino Chile", "ética", "sin coincidencias"])
+def test_scores_match_bm25okapi(corpus, query):
+    index = BM25Index.build(corpus, _keys(corpus))
+
+    np.testing.assert_allclose(index.get_scores(query), reference_scores(corpus, query), rtol=1e-5, atol=1e-6)
+
+
+def test_batch_scores_match_single_queries(corpus):
+    index = BM25Index.build(corpus, _keys(corpus))
+    queries = ["azúcar etanol", "Manuelita", "palma Llanos", "xyz"]
+
+    batch = index.get_scores_batch(queries)
+
+    for row, query in zip(batch, queries):
+        np.testing.assert_allclose(row, index.get_scores(query), rtol=1e-6)
+    assert index.top_k_batch(queries, 2) == [index.top_k(query, 2) for query in queries]
+
+
+def test_top_k_orders_by_score(corpus):
+    index = BM25Index.build(corpus, _keys(corpus))
+
+    ranked = index.top_k("uva vino Chile", 3)
+
+    assert ranked[0][0] == 2
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_save_load_round_trip(corpus, tmp_path):
+    index = BM25Index.build(corpus, _keys(corpus))
+    path = tmp_path / "bm25_index.npz"
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+
+    assert loaded.keys == index.keys
+    assert loaded.vocabulary == index.vocabulary
+    np.testing.assert_array_equal(loaded.get_scores("caña azúcar"), index.get_scores("caña azúcar"))
+    assert [p.name for p in tmp_path.iterdir()] == ["bm25_index.npz"]
+
+
+def test_load_missing_file_returns_none(tmp_path):
+    assert BM25Index.load(tmp_path / "missing.npz") is None
+
+
+def test_load_or_build_reuses_matching_index(corpus, tmp_path):
+    path = tmp_path / "bm25_index.npz"
+    _, loaded = load_or_build(path, corpus, _keys(corpus))
+    assert not loaded
+
+    index, loaded = load_or_build(path, corpus, _keys(corpus))
+    assert loaded
+    assert index.num_docs == len(corpus)
+
+
+def test_load_or_build_rebuilds_for_other_documents(corpus, tmp_path):
+    path = tmp_path / "bm25_index.npz"
+    load_or_build(path, corpus, _keys(corpus))
+
+    index, loaded = load_or_build(path, corpus[:3], _keys(corpus[:3]))
+
+    assert not loaded
+    assert BM25Index.load(path).keys == _keys(corpus[:3])
+
+
+def _truncate(path):
+    path.write_bytes(path.read_bytes()[:100])
+
+
+def _garbage(path):
+    path.write_bytes(b"no es un npz")
+
+
+def _missing_array(path):
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != 'weights'}
+    np.savez(path, **arrays)
+
+
+def _inconsistent_arrays(path):
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+    arrays['doc_ids'] = arrays['doc_ids'][:-1]
+    np.savez(path, **arrays)
+
+
+@pytest.mark.parametrize("damage", [_truncate, _garbage, _missing_array, _inconsistent_arrays])
+def test_load_or_build_rebuilds_damaged_index(corpus, tmp_path, damage, caplog):
+    path = tmp_path / "bm25_index.npz"
+    load_or_build(path, corpus, _keys(corpus))
+    damage(path)
+
+    index, loaded = load_or_build(path, corpus, _keys(corpus))
+
+    assert not loaded
+    assert "se reconstruirá" in caplog.text
+    np.testing.assert_allclose(index.get_scores("Manuelita"), reference_scores(corpus, "Manuelita"), rtol=1e-5)
+    # El archivo reparado vuelve a cargarse
+    assert load_or_build(path, corpus, _keys(corpus))[1]
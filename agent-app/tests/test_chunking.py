@@ -0,0 +1,127 @@
+"""Tests del troceado por tamaño de tokens."""
+
+import pytest
+
+from chunking import (
+    count_tokens,
+    enforce_token_bounds,
+    merge_small_sections,
+    split_long_section,
+    token_histogram,
+)
+from conftest import Doc
+
+
+def section(words, source="a.md", **headers):
+    return Doc(" ".join(words), {"source": source, **headers})
+
+
+def numbered(count, start=0, sentence_every=None):
+    """Palabras w0, w1, ...; con sentence_every, cada n-ésima cierra una frase."""
+    return [f"w{i}." if sentence_every and (i + 1) % sentence_every == 0 else f"w{i}"
+            for i in range(start, start + count)]
+
+
+def test_split_respects_max_tokens_and_overlap():
+    chunk = section(numbered(100))
+
+    parts = split_long_section(chunk, max_tokens=30, overlap_tokens=5)
+
+    assert all(count_tokens(part.page_content) <= 30 for part in parts)
+    for previous, current in zip(parts, parts[1:]):
+        assert previous.page_content.split()[-5:] == current.page_content.split()[:5]
+    # Las ventanas cubren todo el texto original
+    assert parts[0].page_content.split()[0] == "w0"
+    assert parts[-1].page_content.split()[-1] == "w99"
+    assert all(part.metadata == chunk.metadata for part in parts)
+
+
+def test_split_prefers_sentence_ends():
+    chunk = section(numbered(60, sentence_every=12))
+
+    parts = split_long_section(chunk, max_tokens=30, overlap_tokens=4)
+
+    assert all(part.page_content.endswith(".") for part in parts)
+    assert count_tokens(parts[0].page_content) == 24
+
+
+def test_split_keeps_original_text():
+    text = "Primera línea del texto.\n\n**Negrita** y más palabras aquí; fin.\nOtra línea final"
+    chunk = Doc(text, {"source": "a.md"})
+
+    parts = split_long_section(chunk, max_tokens=6, overlap_tokens=1)
+
+    assert all(part.page_content in text for part in parts)
+    assert "\n\n**Negrita**" in parts[0].page_content + parts[1].page_content
+
+
+def test_short_section_is_returned_unchanged():
+    chunk = section(numbered(10))
+
+    assert split_long_section(chunk, max_tokens=10, overlap_tokens=2) == [chunk]
+
+
+def test_merge_small_sibling_sections():
+    chunks = [
+        section(numbered(5), Titulo1="Empresa", Titulo2="Historia"),
+        section(numbered(5, 5), Titulo1="Empresa", Titulo2="Valores"),
+        section(numbered(50, 10), Titulo1="Empresa", Titulo2="Gobierno"),
+    ]
+
+    merged = merge_small_sections(chunks, min_tokens=20)
+
+    assert len(merged) == 1
+    assert count_tokens(merged[0].page_content) == 60
+    # Solo se conservan los encabezados comunes
+    assert merged[0].metadata == {"source": "a.md", "Titulo1": "Empresa"}
+
+
+def test_merge_parent_with_first_subsection():
+    chunks = [section(numbered(3), Titulo1="Negocios"),
+              section(numbered(30, 3), Titulo1="Negocios", Titulo2="Azúcar")]
+
+    merged = merge_small_sections(chunks, min_tokens=10)
+
+    assert len(merged) == 1
+
+
+@pytest.mark.parametrize("other", [
+    section(numbered(5, 5), source="b.md", Titulo1="Empresa"),
+    section(numbered(5, 5), Titulo1="Negocios", Titulo2="Azúcar"),
+])
+def test_sections_from_other_source_or_parent_are_not_merged(other):
+    chunks = [section(numbered(5), Titulo1="Empresa", Titulo2="Historia"), other]
+
+    assert merge_small_sections(chunks, min_tokens=20) == chunks
+
+
+def test_large_sections_are_not_merged():
+    chunks = [section(numbered(30), Titulo1="A"), section(numbered(30, 30), Titulo1="B")]
+
+    assert merge_small_sections(chunks, min_tokens=20) == chunks
+
+
+def test_enforce_token_bounds():
+    chunks = [section(numbered(8), Titulo1="Empresa", Titulo2="Historia"),
+              section(numbered(8, 8), Titulo1="Empresa", Titulo2="Valores"),
+              section(numbered(500, 16, sentence_every=15), Titulo1="Negocios"),
+              section(numbered(60, 516), source="b.md")]
+
+    bounded = enforce_token_bounds(chunks, min_tokens=20, max_tokens=100, overlap_tokens=10)
+
+    sizes = [count_tokens(chunk.page_content) for chunk in bounded]
+    assert max(sizes) <= 100
+    assert min(sizes) >= 16
+    # Las dos secciones pequeñas se fusionan con su hermana grande antes de partirla
+    assert bounded[0].page_content.split()[:16] == numbered(16)
+    assert {chunk.metadata["source"] for chunk in bounded} == {"a.md", "b.md"}
+
+
+def test_token_histogram():
+    chunks = [section(numbered(n)) for n in (10, 60, 70, 120)]
+
+    stats = token_histogram(chunks, bin_width=50)
+
+    assert stats["histogram"] == {"0-49": 1, "50-99": 2, "100-149": 1}
+    assert (stats["min"], stats["max"], stats["mean"]) == (10, 120, 65)
+    assert token_histogram([])["histogram"] == {}
@@ -0,0 +1,87 @@
+"""Tests de la eliminación de chunks casi duplicados."""
+
+from conftest import Doc
+from dedup import (
+    SOURCES_KEY,
+    URLS_KEY,
+    collapse_near_duplicates,
+    document_url,
+    metadata_sources,
+    minhash_signatures,
+    near_duplicate_groups,
+)
+
+FOOTER = ("Manuelita 160 años. Contáctenos en la línea de atención al cliente, "
+          "síganos en redes sociales y conozca nuestra política de privacidad y "
+          "el código de ética de la organización en todos los países")
+
+
+def test_minhash_is_deterministic_and_estimates_jaccard():
+    texts = [FOOTER, FOOTER + " donde operamos", "La fundación apoya la educación en el Valle"]
+
+    signatures = minhash_signatures(texts)
+
+    assert (signatures == minhash_signatures(texts)).all()
+    assert (signatures[0] == signatures[1]).mean() > 0.8
+    assert (signatures[0] == signatures[2]).mean() < 0.2
+
+
+def test_groups_near_duplicates_only():
+    texts = [FOOTER, "Texto distinto sobre la producción de azúcar y etanol en Colombia",
+             FOOTER.upper(), FOOTER + " donde operamos", "Vino y uva de mesa en el norte de Chile"]
+
+    groups = near_duplicate_groups(texts, threshold=0.8)
+
+    assert sorted(groups) == [[0, 2, 3], [1], [4]]
+
+
+def test_higher_threshold_splits_groups():
+    texts = [FOOTER, FOOTER + " donde operamos hoy con orgullo y compromiso"]
+
+    assert len(near_duplicate_groups(texts, threshold=0.5)) == 1
+    assert len(near_duplicate_groups(texts, threshold=0.99)) == 2
+
+
+def test_collapse_keeps_one_chunk_with_all_sources():
+    chunks = [
+        Doc("Manuelita produce azúcar y etanol en el Valle del Cauca", {"source": "z.md"}),
+        Doc(FOOTER, {"source": "noticias.md", "url": "https://www.manuelita.com/noticias/"}),
+        Doc(FOOTER, {"source": "empresa.md", "url": "https://www.manuelita.com/empresa/"}),
+        Doc(FOOTER + " donde operamos", {"source": "contacto.md"}),
+    ]
+
+    collapsed, stats = collapse_near_duplicates(chunks, threshold=0.8)
+
+    # El representante no depende del orden de carga: el de menor source
+    assert [chunk.page_content for chunk in collapsed] == [chunks[0].page_content, chunks[3].page_content]
+    footer = collapsed[1]
+    assert footer.metadata["source"] == "contacto.md"
+    assert metadata_sources(footer.metadata) == ["contacto.md", "empresa.md", "noticias.md"]
+    assert footer.metadata[URLS_KEY].split("\n") == ["https://www.manuelita.com/empresa/",
+                                                     "https://www.manuelita.com/noticias/"]
+    assert SOURCES_KEY not in collapsed[0].metadata
+    assert (stats["chunks_in"], stats["chunks_out"], stats["collapsed"], stats["groups"]) == (4, 2, 2, 1)
+
+
+def test_collapse_is_independent_of_input_order():
+    chunks = [Doc(FOOTER, {"source": f"{name}.md"}) for name in ("c", "a", "b")]
+
+    first, _ = collapse_near_duplicates(chunks)
+    second, _ = collapse_near_duplicates(list(reversed(chunks)))
+
+    assert first[0].metadata == second[0].metadata
+
+
+def test_collapse_disabled_or_empty():
+    chunks = [Doc(FOOTER, {"source": "a.md"}), Doc(FOOTER, {"source": "b.md"})]
+
+    assert collapse_near_duplicates(chunks, threshold=0)[0] == chunks
+    assert collapse_near_duplicates([])[1]["chunks_out"] == 0
+
+
+def test_metadata_sources_and_document_url():
+    assert metadata_sources({"source": "a.md"}) == ["a.md"]
+    assert metadata_sources({}) == ["Unknown"]
+    assert metadata_sources({"source": "a.md", SOURCES_KEY: "a.md\nb.md"}) == ["a.md", "b.md"]
+    assert document_url("# https://www.manuelita.com/empresa/\n\nTexto") == "https://www.manuelita.com/empresa/"
+    assert document_url("# Título\n") == ""
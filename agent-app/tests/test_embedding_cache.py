@@ -0,0 +1,160 @@
+"""Tests de la caché de embeddings en disco compartida entre procesos."""
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from manuelita_cache import CachedEmbeddings, EmbeddingCache, HashingEmbeddings
+from manuelita_cache.embedding_cache import content_hash
+
+MODEL = "test/hashing"
+
+
+def _vectors(texts, dim=16):
+    return HashingEmbeddings(dim=dim).embed_documents(texts)
+
+
+def _texts(prefix, count):
+    return [f"{prefix} chunk {i} de Manuelita" for i in range(count)]
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    texts = _texts("a", 3)
+    keys = [content_hash(text) for text in texts]
+
+    cache.put_many(keys, _vectors(texts))
+
+    for got, expected in zip(cache.get_many(keys), _vectors(texts)):
+        np.testing.assert_allclose(got, expected)
+    assert cache.get_many([content_hash("otro")]) == [None]
+    assert cache.get_stats()['entries'] == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_files_only_grow_and_duplicates_are_ignored(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    texts = _texts("a", 2)
+    keys = [content_hash(text) for text in texts]
+    cache.put_many(keys, _vectors(texts))
+    size = cache.vectors_path.stat().st_size
+
+    cache.put_many(keys + keys[:1], _vectors(texts + texts[:1]))
+    assert cache.vectors_path.stat().st_size == size
+
+    extra = _texts("b", 1)
+    cache.put_many([content_hash(extra[0])], _vectors(extra))
+    assert cache.vectors_path.stat().st_size == size + 16 * 4
+    assert cache.keys_path.read_text(encoding="ascii").splitlines() == keys + [content_hash(extra[0])]
+
+
+def test_float16_storage(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path), dtype="float16")
+    texts = _texts("a", 2)
+    cache.put_many([content_hash(text) for text in texts], _vectors(texts))
+
+    reopened = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+
+    assert reopened.dtype == np.float16
+    got = reopened.get_many([content_hash(texts[0])])[0]
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, _vectors(texts)[0], atol=1e-3)
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    cache.put_many(["a"], _vectors(["a"], dim=16))
+
+    with pytest.raises(ValueError):
+        cache.put_many(["b"], _vectors(["b"], dim=8))
+
+
+def test_other_instances_see_appended_rows(tmp_path):
+    reader = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    writer = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    assert reader.get_many(["a"]) == [None]
+
+    writer.put_many(["a", "b"], _vectors(["a", "b"]))
+
+    np.testing.assert_allclose(reader.get_many(["b"])[0], _vectors(["b"])[0])
+    assert len(reader) == 2
+
+
+def test_partial_writes_are_ignored_and_repaired(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    cache.put_many(["a"], _vectors(["a"]))
+    # Un proceso interrumpido dejó una fila huérfana y una clave a medio escribir
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\0" * 16 * 4)
+    with open(cache.keys_path, "a", encoding="ascii") as f:
+        f.write("b")
+
+    reader = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    assert reader.get_many(["a", "b"])[1] is None
+    assert len(reader) == 1
+
+
+def test_orphan_rows_are_truncated_on_next_write(tmp_path):
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    cache.put_many(["a"], _vectors(["a"]))
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\0" * 16 * 4)
+
+    cache.put_many(["b"], _vectors(["b"]))
+
+    assert cache.vectors_path.stat().st_size == 2 * 16 * 4
+    np.testing.assert_allclose(EmbeddingCache(MODEL, cache_dir=str(tmp_path)).get_many(["b"])[0],
+                               _vectors(["b"])[0])
+
+
+def _write_from_process(cache_dir, prefix, count):
+    cache = EmbeddingCache(MODEL, cache_dir=cache_dir)
+    texts = _texts(prefix, count)
+    # Lotes pequeños para intercalar las escrituras de los procesos
+    for start in range(0, count, 5):
+        batch = texts[start:start + 5]
+        cache.put_many([content_hash(text) for text in batch], _vectors(batch))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requiere fork")
+def test_concurrent_processes_keep_rows_aligned(tmp_path):
+    context = multiprocessing.get_context("fork")
+    # Los procesos comparten la mitad de los textos: las claves repetidas no se duplican
+    workers = [context.Process(target=_write_from_process, args=(str(tmp_path), prefix, 40))
+               for prefix in ("a", "b", "a", "c")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    cache = EmbeddingCache(MODEL, cache_dir=str(tmp_path))
+    texts = _texts("a", 40) + _texts("b", 40) + _texts("c", 40)
+    assert len(cache) == len(texts)
+    assert cache.vectors_path.stat().st_size == len(texts) * 16 * 4
+    for got, expected in zip(cache.get_many([content_hash(text) for text in texts]), _vectors(texts)):
+        np.testing.assert_allclose(got, expected)
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__(dim=16)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_cached_embeddings_only_embed_new_chunks(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, MODEL, cache_dir=str(tmp_path))
+    embeddings.embed_documents(_texts("a", 3))
+
+    # Otro proceso (o un reinicio) con la misma caché
+    restarted = CachedEmbeddings(model, MODEL, cache_dir=str(tmp_path))
+    vectors = restarted.embed_documents(_texts("a", 3) + _texts("b", 1))
+
+    assert model.embedded == _texts("a", 3) + _texts("b", 1)
+    np.testing.assert_allclose(vectors, _vectors(_texts("a", 3) + _texts("b", 1)), rtol=1e-6)
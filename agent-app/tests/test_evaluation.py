@@ -0,0 +1,109 @@
+"""Tests de las métricas del golden set y del harness de benchmark."""
+
+import math
+
+import pytest
+
+from conftest import Doc
+from evaluation import BENCH_STAGES, is_relevant, load_golden_queries, run_benchmark, score_ranking
+from rag_stubs import StagedRAG
+
+
+def ranking(*sources):
+    """Documentos con el source indicado; una tupla es un chunk colapsado con varios archivos."""
+    docs = []
+    for source in sources:
+        if isinstance(source, tuple):
+            docs.append(Doc("texto", {"source": source[0], "sources": "\n".join(source)}))
+        else:
+            docs.append(Doc("texto", {"source": f"/data/processed/{source}"}))
+    return docs
+
+
+def dcg(ranks):
+    return sum(1 / math.log2(rank + 1) for rank in ranks)
+
+
+def test_perfect_ranking():
+    metrics = score_ranking(ranking("a.md", "b.md", "x.md"), ["a.md", "b.md"], k=3)
+
+    assert metrics == {"recall": 1.0, "reciprocal_rank": 1.0, "ndcg": 1.0, "hit": 1.0}
+
+
+def test_relevant_files_below_the_top():
+    metrics = score_ranking(ranking("x.md", "a.md", "y.md", "b.md"), ["a.md", "b.md"], k=4)
+
+    assert metrics["recall"] == 1.0
+    assert metrics["reciprocal_rank"] == 0.5
+    assert metrics["ndcg"] == pytest.approx(dcg([2, 4]) / dcg([1, 2]))
+
+
+def test_only_the_top_k_counts():
+    metrics = score_ranking(ranking("x.md", "y.md", "a.md"), ["a.md"], k=2)
+
+    assert metrics == {"recall": 0.0, "reciprocal_rank": 0.0, "ndcg": 0.0, "hit": 0.0}
+
+
+def test_repeated_file_gains_once():
+    metrics = score_ranking(ranking("a.md", "a.md", "b.md"), ["a.md", "b.md", "c.md"], k=3)
+
+    assert metrics["recall"] == pytest.approx(2 / 3)
+    # La segunda aparición de a.md no suma; el ideal son tres archivos en tres posiciones
+    assert metrics["ndcg"] == pytest.approx(dcg([1, 3]) / dcg([1, 2, 3]))
+
+
+def test_collapsed_chunk_counts_all_its_files():
+    metrics = score_ranking(ranking("x.md", ("otro.md", "a.md", "b.md")), ["a.md", "b.md"], k=2)
+
+    assert metrics["recall"] == 1.0
+    assert metrics["reciprocal_rank"] == 0.5
+    assert metrics["ndcg"] == pytest.approx(dcg([2]) / dcg([1, 2]))
+
+
+def test_ideal_is_capped_at_k():
+    metrics = score_ranking(ranking("a.md"), ["a.md", "b.md", "c.md"], k=1)
+
+    assert metrics["ndcg"] == 1.0
+    assert metrics["recall"] == pytest.approx(1 / 3)
+
+
+def test_is_relevant_compares_file_names():
+    assert is_relevant("/data/raw/processed/empresa.md", ["empresa.md"])
+    assert not is_relevant("/data/raw/processed/empresa.md", ["azucar.md"])
+
+
+def test_repo_golden_set_is_well_formed():
+    golden = load_golden_queries()
+
+    assert golden
+    assert all(item["query"] and item["relevant_sources"] for item in golden)
+
+
+GOLDEN = [
+    {"query": "azúcar y etanol de caña", "relevant_sources": ["doc0.md"]},
+    {"query": "uva de mesa y vino en Chile", "relevant_sources": ["doc2.md"]},
+    {"query": "aceite de palma en los Llanos", "relevant_sources": ["doc3.md"]},
+    {"query": "línea ética y código de ética", "relevant_sources": ["doc5.md"]},
+]
+
+
+@pytest.mark.parametrize("rerank", [True, False])
+def test_run_benchmark_with_stub_embeddings(corpus, tmp_path, rerank):
+    from config import RerankerConfig
+
+    rag = StagedRAG(corpus, tmp_path, reranker_config=RerankerConfig(enabled=rerank))
+
+    report = run_benchmark(rag, GOLDEN, k=2, repeat=2)
+
+    assert report["queries"] == len(GOLDEN)
+    assert report["recall_at_2"] == report["hit_rate_at_2"] == 1.0
+    assert report["mrr"] == 1.0
+    assert report["ndcg_at_2"] == 1.0
+    assert report["config"]["reranker"] == (rag.reranker_config.model if rerank else None)
+    assert report["config"]["embedding_model"] == "stub/hashing"
+    for stage in BENCH_STAGES:
+        latency = report["latency"][stage]
+        assert latency["p50_ms"] <= latency["p95_ms"]
+    assert len(report["per_query"]) == len(GOLDEN)
+    # El benchmark no pasa por la caché de resultados
+    assert len(rag.result_cache) == 0
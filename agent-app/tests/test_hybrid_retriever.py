@@ -0,0 +1,162 @@
+"""Tests de la fusión RRF y del retriever híbrido concurrente."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import Doc
+from hybrid_retriever import HybridRetriever, fuse_documents, reciprocal_rank_fusion, separation_margin
+
+
+def reference_rrf(rankings, weights, c):
+    scores = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (rank + c)
+    return scores
+
+
+def test_rrf_matches_definition():
+    rankings = [["a", "b", "c", "d"], ["c", "a", "e"]]
+
+    keys, scores = reciprocal_rank_fusion(rankings, [0.7, 0.3], c=60)
+
+    expected = reference_rrf(rankings, [0.7, 0.3], 60)
+    assert keys == ["a", "c", "b", "d", "e"]
+    np.testing.assert_allclose(scores, [expected[key] for key in keys])
+
+
+def test_rrf_weights_change_the_order():
+    rankings = [["semantic"], ["keyword"]]
+
+    assert reciprocal_rank_fusion(rankings, [0.7, 0.3])[0] == ["semantic", "keyword"]
+    assert reciprocal_rank_fusion(rankings, [0.3, 0.7])[0] == ["keyword", "semantic"]
+
+
+def test_rrf_ties_keep_first_appearance():
+    keys, scores = reciprocal_rank_fusion([["x", "y"], ["y", "x"]], [1.0, 1.0])
+
+    assert keys == ["x", "y"]
+    assert scores[0] == scores[1]
+
+
+def test_rrf_smaller_c_favours_top_ranks():
+    rankings = [["a", "b", "c"], ["b", "c", "a"], ["c", "a", "b"], ["a", "c", "b"]]
+
+    _, flat = reciprocal_rank_fusion(rankings, [1.0] * 4, c=1000)
+    _, steep = reciprocal_rank_fusion(rankings, [1.0] * 4, c=1)
+
+    assert flat[0] / flat[-1] < steep[0] / steep[-1]
+
+
+def test_rrf_empty_rankings():
+    keys, scores = reciprocal_rank_fusion([[], []], [0.5, 0.5])
+
+    assert keys == []
+    assert len(scores) == 0
+
+
+def test_fuse_documents_deduplicates_by_content():
+    shared = Doc("Manuelita produce azúcar", {"source": "a.md"})
+    semantic = [shared, Doc("vino de Chile", {"source": "b.md"})]
+    keyword = [Doc("Manuelita produce azúcar", {"source": "copia.md"}), Doc("palma", {"source": "c.md"})]
+
+    fused = fuse_documents([semantic, keyword], [0.7, 0.3])
+
+    assert [doc.page_content for doc, _ in fused] == ["Manuelita produce azúcar", "vino de Chile", "palma"]
+    # Se conserva el primer documento visto con ese contenido
+    assert fused[0][0] is shared
+    assert fused[0][1] == pytest.approx(0.7 / 61 + 0.3 / 61)
+
+
+class FakeRetriever:
+    def __init__(self, docs, barrier=None, error=None):
+        self.docs = docs
+        self.barrier = barrier
+        self.error = error
+
+    def invoke(self, query):
+        if self.barrier:
+            # Solo se supera si las dos ramas corren a la vez
+            self.barrier.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return self.docs
+
+
+def test_hybrid_retriever_runs_legs_concurrently():
+    barrier = threading.Barrier(2)
+    retriever = HybridRetriever([
+        ("vector", FakeRetriever([Doc("uno"), Doc("dos")], barrier), 0.7),
+        ("bm25", FakeRetriever([Doc("dos"), Doc("tres")], barrier), 0.3),
+    ])
+    try:
+        fused = retriever.retrieve("consulta")
+    finally:
+        retriever.close()
+
+    assert [doc.page_content for doc, _ in fused] == ["dos", "uno", "tres"]
+    assert not barrier.broken
+    assert all(len(retriever.latencies[name]) == 1 for name in ("vector", "bm25", "total"))
+
+
+def test_hybrid_retriever_survives_a_failing_leg():
+    retriever = HybridRetriever([
+        ("vector", FakeRetriever([], error=RuntimeError("chroma caído")), 0.7),
+        ("bm25", FakeRetriever([Doc("tres")]), 0.3),
+    ])
+    try:
+        fused = retriever.retrieve("consulta")
+    finally:
+        retriever.close()
+
+    assert [doc.page_content for doc, _ in fused] == ["tres"]
+    assert fused[0][1] == pytest.approx(0.3 / 61)
+
+
+class GatedRetriever(FakeRetriever):
+    """Se queda dentro de invoke hasta que se abre release."""
+
+    def __init__(self, docs):
+        super().__init__(docs)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def invoke(self, query):
+        self.entered.set()
+        assert self.release.wait(timeout=5)
+        return self.docs
+
+
+def test_close_waits_for_in_flight_calls():
+    vector = GatedRetriever([Doc("uno")])
+    retriever = HybridRetriever([
+        ("vector", vector, 0.7),
+        ("bm25", FakeRetriever([Doc("dos")]), 0.3),
+    ])
+    in_flight = []
+    caller = threading.Thread(target=lambda: in_flight.append(retriever.retrieve("consulta")))
+    caller.start()
+    assert vector.entered.wait(timeout=5)
+
+    # Como en un refresh: el retriever se reemplaza y se cierra con una llamada en curso
+    retriever.close()
+    vector.release.set()
+    late = retriever.retrieve("consulta")
+    caller.join(timeout=5)
+
+    assert [doc.page_content for doc, _ in in_flight[0]] == ["uno", "dos"]
+    assert [doc.page_content for doc, _ in late] == ["uno", "dos"]
+    assert retriever.executor._shutdown
+
+
+def test_separation_margin_is_the_gap_of_the_boundary_case():
+    semantic = ["a", "b", "c", "d", "e"]
+    keyword = ["a", "b", "c", "d", "x"]
+
+    _, scores = reciprocal_rank_fusion([semantic, keyword], [0.75, 0.25])
+
+    assert (scores[3] - scores[4]) / scores[3] == pytest.approx(separation_margin([0.75, 0.25], 4))
+    assert separation_margin([0.75, 0.25], 4) < 0.5
+    assert separation_margin([1.0], 4) == pytest.approx(1 / 65)
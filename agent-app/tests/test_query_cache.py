@@ -0,0 +1,137 @@
+"""Tests de la LRU de consultas."""
+
+import pytest
+
+from manuelita_cache import CachedEmbeddings, HashingEmbeddings, LRUCache, normalize_query
+from manuelita_cache import query_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(query_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" pasa a ser la menos usada
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_put_refreshes_existing_key():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+
+    cache.put("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(maxsize=4, ttl=60)
+    cache.put("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_hits_do_not_extend_ttl(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    for _ in range(3):
+        clock.now += 4
+        cache.get("a")
+
+    assert cache.get("a") is None
+
+
+def test_zero_maxsize_disables_cache():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache(maxsize=4, ttl=30)
+    assert cache.get_stats()['hit_rate'] is None
+
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    cache.get("a")
+
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 2, 0)
+    assert stats['hit_rate'] == 0.5
+    assert stats['ttl_s'] == 30
+
+
+def test_normalize_query():
+    assert normalize_query("  ¿Qué  produce\tManuelita?\n") == "¿qué produce manuelita?"
+    assert normalize_query("AZÚCAR") == normalize_query("azúcar")
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings que registra los textos que llegan al modelo."""
+
+    def __init__(self):
+        super().__init__(dim=32)
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return super().embed_query(text)
+
+
+def test_cached_embeddings_reuse_query_vectors(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, "test/counting", cache_dir=str(tmp_path))
+
+    first = embeddings.embed_query("¿Qué produce Manuelita?")
+    second = embeddings.embed_query("¿Qué produce Manuelita?")
+
+    assert first == second == model.embed_query("¿Qué produce Manuelita?")
+    assert model.calls[:-1] == [["¿Qué produce Manuelita?"]]
+
+
+def test_embed_queries_embeds_only_the_misses_as_queries(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, "test/counting", cache_dir=str(tmp_path))
+    embeddings.embed_query("azúcar")
+
+    vectors = embeddings.embed_queries(["vino", "azúcar", "palma", "vino"])
+
+    assert model.calls[1:] == [["vino"], ["palma"]]
+    assert vectors == [embeddings.embed_query(text) for text in ["vino", "azúcar", "palma", "vino"]]
+    assert embeddings.query_cache.get_stats()['size'] == 3
@@ -0,0 +1,176 @@
+"""
+Tests del índice persistido de RAGSystem: reutilización por manifiesto e
+indexado incremental.
+
+Usan el backend 'numpy', el modelo STUB_EMBEDDING_MODEL y una caché de
+embeddings temporal; necesitan los cargadores y el splitter de LangChain.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("langchain_community.document_loaders")
+pytest.importorskip("langchain_text_splitters")
+
+from bm25_index import BM25_INDEX_FILE
+from config import RerankerConfig
+from rag import INDEX_MANIFEST_FILE, RAGSystem
+
+PAGES = {
+    "empresa.md": "# https://www.manuelita.com/empresa/\n\n"
+                  "## Historia\n\nManuelita fue fundada en 1864 en el Valle del Cauca y es una de las "
+                  "empresas agroindustriales más antiguas de Colombia con operaciones en varios países.\n\n"
+                  "## Valores\n\nLa compañía trabaja con integridad, respeto por las personas y cuidado "
+                  "del medio ambiente en todas sus operaciones y negocios agroindustriales.",
+    "azucar.md": "# https://www.manuelita.com/azucar/\n\n"
+                 "## Azúcar y etanol\n\nEl ingenio procesa caña para producir azúcar, mieles, etanol "
+                 "carburante y energía eléctrica a partir del bagazo en el Valle del Cauca.",
+    "vino.md": "# https://www.manuelita.com/vino/\n\n"
+               "## Uvas y vinos\n\nEn Chile Manuelita cultiva uva de mesa para exportación y produce "
+               "vinos en el valle de Elqui con viñedos propios y bodegas modernas.",
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    directory = tmp_path / "data"
+    directory.mkdir()
+    for name, text in PAGES.items():
+        (directory / name).write_text(text, encoding="utf-8")
+    return directory
+
+
+@pytest.fixture
+def make_rag(data_dir, tmp_path):
+    def make(**kwargs):
+        options = dict(data_dir=str(data_dir), vectordb_dir=str(tmp_path / "vectordb"),
+                       embedding_model="stub/hashing", embedding_cache_dir=str(tmp_path / "embeddings"),
+                       vector_backend="numpy", reranker_config=RerankerConfig(enabled=False))
+        options.update(kwargs)
+        return RAGSystem(**options)
+
+    return make
+
+
+def manifest(rag):
+    return json.loads((Path(rag.vectordb_dir) / INDEX_MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def test_first_run_builds_index_and_manifest(make_rag):
+    rag = make_rag()
+
+    assert not rag.index_reused
+    assert rag.readiness == 'hybrid'
+    assert manifest(rag)['total_chunks'] == len(rag.splits) == rag.vectorstore.count()
+    assert set(manifest(rag)['chunks']) == set(rag._chunk_entries())
+
+
+def test_unchanged_corpus_reuses_persisted_index(make_rag):
+    make_rag()
+
+    rag = make_rag()
+
+    assert rag.index_reused
+    assert rag.bm25_index_loaded
+    # No se embebió ningún chunk: la base se abrió desde disco
+    assert rag.embeddings.cache.get_stats()['hits'] + rag.embeddings.cache.get_stats()['misses'] == 0
+    assert rag.retrieve("uva de mesa en Chile", top_k=1)[1][0]['source'].endswith("vino.md")
+
+
+def test_bm25_index_survives_vector_store_rebuild(make_rag):
+    make_rag()
+    # Cambiar el formato obliga a reconstruir la base vectorial
+    rag = make_rag(vector_dtype="int8")
+
+    assert not rag.index_reused
+    assert (Path(rag.vectordb_dir) / BM25_INDEX_FILE).exists()
+    assert make_rag(vector_dtype="int8").bm25_index_loaded
+
+
+@pytest.mark.parametrize("key, value", [
+    ("embedding_model", "otro/modelo"),
+    ("vector_dtype", "float16"),
+    ("version", 0),
+])
+def test_manifest_mismatch_triggers_rebuild(make_rag, key, value):
+    rag = make_rag()
+    data = manifest(rag)
+    data[key] = value
+    (Path(rag.vectordb_dir) / INDEX_MANIFEST_FILE).write_text(json.dumps(data), encoding="utf-8")
+
+    assert not make_rag().index_reused
+
+
+def test_unreadable_manifest_triggers_rebuild(make_rag):
+    rag = make_rag()
+    (Path(rag.vectordb_dir) / INDEX_MANIFEST_FILE).write_text("{", encoding="utf-8")
+
+    rebuilt = make_rag()
+
+    assert not rebuilt.index_reused
+    assert manifest(rebuilt)['total_chunks'] == len(rebuilt.splits)
+
+
+def test_edited_file_is_synced_on_startup(make_rag, data_dir):
+    first = make_rag()
+    chunks_before = len(first.splits)
+    (data_dir / "azucar.md").write_text(PAGES["azucar.md"] + " Nueva planta de biogás.", encoding="utf-8")
+
+    rag = make_rag()
+
+    assert rag.index_reused
+    # Solo el chunk modificado se embebió de nuevo
+    assert rag.embeddings.cache.get_stats()['misses'] == 1
+    assert rag.vectorstore.count() == chunks_before
+
+
+def test_refresh_changed_sources(make_rag, data_dir):
+    rag = make_rag()
+    version = rag.index_version
+    rag.retrieve("vinos del valle de Elqui")
+    (data_dir / "vino.md").unlink()
+    (data_dir / "palma.md").write_text(
+        "# https://www.manuelita.com/palma/\n\n## Aceites\n\nEn los Llanos Orientales Manuelita "
+        "produce aceite de palma y biodiésel con plantaciones sostenibles certificadas.",
+        encoding="utf-8")
+
+    summary = rag.refresh([str(data_dir / "vino.md"), str(data_dir / "palma.md")])
+
+    assert (summary['added'], summary['removed']) == (1, 1)
+    assert summary['unchanged'] == len(rag.splits) - 1
+    assert rag.index_version != version
+    assert len(rag.result_cache) == 0
+    sources = {Path(entry['source']).name for entry in manifest(rag)['chunks'].values()}
+    assert sources == {"empresa.md", "azucar.md", "palma.md"}
+    assert rag.retrieve("aceite de palma", top_k=1)[1][0]['source'].endswith("palma.md")
+
+
+def test_deferred_sync_counts_changes_in_refresh(make_rag, data_dir):
+    make_rag()
+    (data_dir / "palma.md").write_text(
+        "# https://www.manuelita.com/palma/\n\n## Aceites\n\nEn los Llanos Orientales Manuelita "
+        "produce aceite de palma y biodiésel con plantaciones sostenibles certificadas.",
+        encoding="utf-8")
+
+    rag = make_rag(sync_index=False)
+    assert rag.index_reused
+    assert rag.vectorstore.count() == len(rag.splits) - 1
+
+    summary = rag.refresh([str(data_dir / "palma.md")])
+
+    assert (summary['added'], summary['removed']) == (1, 0)
+    assert rag.vectorstore.count() == len(rag.splits)
+    assert set(manifest(rag)['chunks']) == set(rag._chunk_entries())
+
+
+def test_full_rescan_matches_incremental_refresh(make_rag, data_dir):
+    rag = make_rag()
+    (data_dir / "empresa.md").write_text(PAGES["empresa.md"].replace("1864", "1864 por Santiago Eder"),
+                                         encoding="utf-8")
+
+    summary = rag.refresh()
+
+    assert (summary['added'], summary['removed']) == (1, 1)
+    assert set(manifest(rag)['chunks']) == set(make_rag()._chunk_entries())
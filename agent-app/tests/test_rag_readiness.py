@@ -0,0 +1,130 @@
+"""Tests de las etapas de disponibilidad de RAGSystem (sobre rag_stubs.StagedRAG)."""
+
+import threading
+import time
+
+import pytest
+
+from rag import READINESS_STAGES
+from rag_stubs import StagedRAG
+
+
+def wait_for_stage(rag, stage, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while READINESS_STAGES.index(rag.readiness) < READINESS_STAGES.index(stage):
+        assert time.monotonic() < deadline, f"etapa {rag.readiness}, se esperaba {stage}"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def gates():
+    return {'embeddings': threading.Event(), 'reranker': threading.Event()}
+
+
+def test_synchronous_init_reaches_reranked(corpus, tmp_path):
+    rag = StagedRAG(corpus, tmp_path)
+
+    assert rag.readiness == 'reranked'
+    assert rag.initialized.is_set()
+    stats = rag.get_stats()['readiness']
+    assert not stats['initializing']
+    assert set(stats['load_times_s']) == {'documents', 'bm25', 'embeddings', 'hybrid', 'reranker'}
+    assert stats['error'] is None
+
+
+def test_background_init_moves_through_the_stages(corpus, tmp_path, gates):
+    rag = StagedRAG(corpus, tmp_path, gates=gates, background_init=True)
+    try:
+        # El constructor vuelve con BM25 listo
+        assert rag.readiness == 'bm25'
+        assert not rag.initialized.is_set()
+        _, docs = rag.retrieve("uva vino Chile", top_k=1)
+        assert docs[0]['source'] == "doc2.md"
+
+        gates['embeddings'].set()
+        wait_for_stage(rag, 'hybrid')
+        assert rag.reranker is None
+        assert rag.get_stats()['readiness']['initializing']
+
+        gates['reranker'].set()
+        assert rag.wait_until_initialized(timeout=5) == 'reranked'
+        assert rag.reranker is not None
+    finally:
+        for gate in gates.values():
+            gate.set()
+        rag.wait_until_initialized(timeout=5)
+
+
+def test_background_init_logs_each_stage_when_reached(corpus, tmp_path, gates, caplog):
+    caplog.set_level("INFO", logger="rag")
+    rag = StagedRAG(corpus, tmp_path, gates=gates, background_init=True)
+    try:
+        assert "Cargando modelos RAG en segundo plano" in caplog.text
+        assert "'bm25'" in caplog.text
+        assert "'hybrid'" not in caplog.text and "terminada" not in caplog.text
+
+        for gate in gates.values():
+            gate.set()
+        rag.wait_until_initialized(timeout=5)
+
+        stages = [message.split("'")[1] for message in caplog.messages if "listo en etapa" in message]
+        assert stages == ['bm25', 'hybrid', 'reranked']
+        assert caplog.messages[-1] == "Inicialización del sistema RAG terminada (etapa: reranked)"
+    finally:
+        for gate in gates.values():
+            gate.set()
+        rag.wait_until_initialized(timeout=5)
+
+
+def test_results_are_cached_per_stage(corpus, tmp_path, gates):
+    rag = StagedRAG(corpus, tmp_path, gates=gates, background_init=True)
+    try:
+        rag.retrieve("Manuelita produce azúcar")
+        for gate in gates.values():
+            gate.set()
+        rag.wait_until_initialized(timeout=5)
+
+        rag.retrieve("Manuelita produce azúcar")
+        rag.retrieve("manuelita  produce azúcar")
+
+        # El resultado de la etapa BM25 no se reutiliza tras el re-ranker
+        assert rag.reranker.model.pairs > 0
+        assert rag.reranker.get_stats()['calls'] == 1
+        assert rag.result_cache.get_stats()['hits'] == 1
+    finally:
+        for gate in gates.values():
+            gate.set()
+
+
+def test_warmup_queries_fill_the_result_cache(corpus, tmp_path):
+    rag = StagedRAG(corpus, tmp_path, warmup_queries=["azúcar y etanol", "vino de Chile"])
+
+    assert 'warmup' in rag.load_times
+    assert len(rag.result_cache) == 2
+    rag.retrieve("vino de Chile")
+    assert rag.result_cache.get_stats()['hits'] == 1
+
+
+def test_disabled_reranker_stays_hybrid(corpus, tmp_path):
+    from config import RerankerConfig
+
+    rag = StagedRAG(corpus, tmp_path, reranker_config=RerankerConfig(enabled=False))
+
+    assert rag.readiness == 'hybrid'
+    assert rag.retrieve("aceite de palma")[1]
+
+
+def test_failed_model_load_keeps_bm25(corpus, tmp_path):
+    rag = StagedRAG(corpus, tmp_path, failures={'embeddings'}, background_init=True)
+
+    assert rag.wait_until_initialized(timeout=5) == 'bm25'
+    assert "embeddings no disponible" in rag.init_error
+    assert rag.retrieve("camarones Colombia")[1][0]['source'] == "doc4.md"
+
+
+def test_failed_document_load_stays_loading(corpus, tmp_path):
+    rag = StagedRAG(corpus, tmp_path, failures={'documents'})
+
+    assert rag.readiness == 'loading'
+    assert rag.initialized.is_set()
+    assert rag.retrieve("azúcar") == ("", [])
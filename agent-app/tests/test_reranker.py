@@ -0,0 +1,252 @@
+"""Tests del re-ranker con caché de puntuaciones y poda adaptativa."""
+
+import pytest
+
+from conftest import Doc
+from hybrid_retriever import DEFAULT_RRF_C, fuse_documents, separation_margin
+from reranker import CachedReranker
+
+
+class FakeCrossEncoder:
+    """Puntúa cada par por el número de palabras de la consulta presentes en el chunk."""
+
+    def __init__(self):
+        self.calls = []
+
+    def score(self, pairs):
+        self.calls.append(list(pairs))
+        return [float(len(set(query.casefold().split()) & set(passage.casefold().split())))
+                for query, passage in pairs]
+
+
+def candidates(texts, scores=None):
+    """(documento, puntuación fusionada) con puntuaciones casi empatadas por defecto."""
+    scores = scores or [1.0 - 0.01 * i for i in range(len(texts))]
+    return [(Doc(text), score) for text, score in zip(texts, scores)]
+
+
+TEXTS = [
+    "informe anual de la compañía",
+    "Manuelita produce vino en Chile",
+    "Manuelita produce azúcar y etanol en Colombia",
+    "fundación y comunidades",
+    "aceite de palma",
+]
+
+
+@pytest.fixture
+def model():
+    return FakeCrossEncoder()
+
+
+def test_rerank_orders_by_cross_encoder_score(model):
+    reranker = CachedReranker(model, top_n=2, max_candidates=5)
+
+    docs = reranker.rerank("Manuelita produce azúcar", candidates(TEXTS))
+
+    assert [doc.page_content for doc in docs] == [TEXTS[2], TEXTS[1]]
+    assert len(model.calls[0]) == 5
+
+
+def test_only_top_m_candidates_are_scored(model):
+    reranker = CachedReranker(model, top_n=2, max_candidates=3)
+
+    docs = reranker.rerank("aceite de palma", candidates(TEXTS))
+
+    assert [passage for _, passage in model.calls[0]] == TEXTS[:3]
+    assert TEXTS[4] not in [doc.page_content for doc in docs]
+
+
+def test_scores_are_cached_per_normalized_query(model):
+    reranker = CachedReranker(model, top_n=2, max_candidates=4)
+    reranker.rerank("Manuelita produce azúcar", candidates(TEXTS))
+
+    reranker.rerank("  manuelita PRODUCE azúcar ", candidates(TEXTS))
+    reranker.rerank("Manuelita produce azúcar", candidates(TEXTS[:2] + ["nuevo chunk"] + TEXTS[3:]))
+
+    assert len(model.calls) == 2
+    assert [passage for _, passage in model.calls[1]] == ["nuevo chunk"]
+    assert reranker.get_stats()['pairs_scored'] == 5
+
+
+def test_clear_separation_skips_the_cross_encoder(model):
+    reranker = CachedReranker(model, top_n=2, prune_margin=0.5)
+
+    docs = reranker.rerank("Manuelita produce azúcar", candidates(TEXTS, [1.0, 0.9, 0.3, 0.2, 0.1]))
+
+    assert model.calls == []
+    assert [doc.page_content for doc in docs] == TEXTS[:2]
+    assert reranker.get_stats()['skipped'] == 1
+
+
+def test_small_gap_is_reranked(model):
+    reranker = CachedReranker(model, top_n=2, prune_margin=0.5)
+
+    reranker.rerank("Manuelita produce azúcar", candidates(TEXTS, [1.0, 0.9, 0.6, 0.2, 0.1]))
+
+    assert len(model.calls) == 1
+
+
+def test_zero_margin_disables_pruning(model):
+    reranker = CachedReranker(model, top_n=2, prune_margin=0)
+
+    reranker.rerank("Manuelita produce azúcar", candidates(TEXTS, [1.0, 0.9, 0.01, 0.0, 0.0]))
+
+    assert len(model.calls) == 1
+
+
+@pytest.mark.parametrize("count", [0, 1])
+def test_single_candidate_is_not_scored(model, count):
+    reranker = CachedReranker(model, top_n=2)
+
+    docs = reranker.rerank("azúcar", candidates(TEXTS[:count]))
+
+    assert [doc.page_content for doc in docs] == TEXTS[:count]
+    assert model.calls == []
+
+
+def fused(semantic, keyword):
+    """Candidatos de la fusión RRF real de dos ramas con los pesos del RAG."""
+    docs = {text: Doc(text) for text in semantic + keyword}
+    return fuse_documents([[docs[text] for text in semantic], [docs[text] for text in keyword]],
+                          [0.75, 0.25], DEFAULT_RRF_C)
+
+
+@pytest.fixture
+def fusion_reranker(model):
+    return CachedReranker(model, top_n=4, prune_margin=separation_margin([0.75, 0.25], 4))
+
+
+@pytest.mark.parametrize("semantic, keyword", [
+    # Las ramas coinciden en el top-4 y el siguiente solo lo aporta la rama semántica
+    (["a", "b", "c", "d", "e", "f", "g"], ["a", "b", "c", "d", "h", "i", "j"]),
+    (["a", "b", "c", "d", "e", "f", "g"], ["d", "c", "b", "a", "h", "i", "j"]),
+    # El siguiente solo lo aporta BM25
+    (["a", "b", "c", "d"], ["a", "b", "c", "d", "h", "i", "j"]),
+])
+def test_fusion_that_separates_the_top_n_skips_reranking(model, fusion_reranker, semantic, keyword):
+    docs = fusion_reranker.rerank("consulta", fused(semantic, keyword))
+
+    assert {doc.page_content for doc in docs} == {"a", "b", "c", "d"}
+    assert model.calls == []
+
+
+@pytest.mark.parametrize("keyword", [
+    ["h", "i", "j", "k", "l", "m", "n"],
+    ["a", "b", "c", "h", "d", "i", "j"],
+    ["e", "a", "b", "c", "d", "i", "j"],
+])
+def test_ambiguous_fusion_is_reranked(model, fusion_reranker, keyword):
+    fusion_reranker.rerank("consulta", fused(["a", "b", "c", "d", "e", "f", "g"], keyword))
+
+    assert len(model.calls) == 1
+
+
+def test_rerank_batch_matches_rerank(model):
+    queries = ["Manuelita produce azúcar", "aceite de palma", "fundación comunidades"]
+    batch_candidates = [candidates(TEXTS), candidates(TEXTS, [1.0, 0.9, 0.3, 0.2, 0.1]),
+                        candidates(list(reversed(TEXTS)))]
+
+    batched = CachedReranker(FakeCrossEncoder(), top_n=2, max_candidates=4)
+    single = CachedReranker(FakeCrossEncoder(), top_n=2, max_candidates=4)
+
+    assert batched.rerank_batch(queries, batch_candidates) == \
+        [single.rerank(query, query_candidates) for query, query_candidates in zip(queries, batch_candidates)]
+    assert batched.get_stats()['skipped'] == single.get_stats()['skipped'] == 1
+
+
+def test_rerank_batch_scores_all_misses_in_one_call(model):
+    reranker = CachedReranker(model, top_n=2, max_candidates=3)
+    reranker.rerank("Manuelita produce azúcar", candidates(TEXTS))
+
+    reranker.rerank_batch(
+        ["Manuelita produce azúcar", "aceite de palma", "  aceite DE palma"],
+        [candidates(TEXTS), candidates(TEXTS), candidates(TEXTS)],
+    )
+
+    # Un solo lote al modelo; los pares cacheados y los repetidos no se vuelven a puntuar
+    assert len(model.calls) == 2
+    assert model.calls[1] == [("aceite de palma", text) for text in TEXTS[:3]]
+    assert reranker.get_stats()['calls'] == 4
+
+
+def test_rerank_batch_without_pending_pairs_skips_the_model(model):
+    reranker = CachedReranker(model, top_n=2)
+
+    results = reranker.rerank_batch(["azúcar", "palma"],
+                                    [candidates(TEXTS[:1]), candidates(TEXTS, [1.0, 0.9, 0.1, 0.1, 0.1])])
+
+    assert [[doc.page_content for doc in docs] for docs in results] == [TEXTS[:1], TEXTS[:2]]
+    assert model.calls == []
+
+
+class FakeFeatures(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, queries, passages, **kwargs):
+        import torch
+
+        self.calls.append((list(queries), list(passages), kwargs))
+        return FakeFeatures(lengths=torch.tensor([float(len(p.split())) for p in passages]))
+
+
+class FakeSequenceClassifier:
+    """Un logit por par: el número de palabras del chunk menos 3."""
+
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+    def __call__(self, lengths):
+        return type("Output", (), {"logits": (lengths - 3.0)[:, None]})()
+
+
+@pytest.fixture
+def batched_encoder(monkeypatch):
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    from reranker import BatchedCrossEncoder
+
+    tokenizer = FakeTokenizer()
+    monkeypatch.setattr(transformers.AutoTokenizer, "from_pretrained", lambda name: tokenizer)
+    monkeypatch.setattr(transformers.AutoModelForSequenceClassification, "from_pretrained",
+                        lambda name: FakeSequenceClassifier())
+    encoder = BatchedCrossEncoder("fake/reranker", max_length=64, batch_size=2)
+    return torch, tokenizer, encoder
+
+
+def test_batched_cross_encoder_scores_in_truncated_batches(batched_encoder):
+    torch, tokenizer, encoder = batched_encoder
+    pairs = [("consulta", text) for text in TEXTS]
+
+    scores = encoder.score(pairs)
+
+    expected = torch.sigmoid(torch.tensor([len(text.split()) - 3.0 for text in TEXTS])).tolist()
+    assert scores == pytest.approx(expected)
+    assert [len(passages) for _, passages, _ in tokenizer.calls] == [2, 2, 1]
+    assert all(kwargs['max_length'] == 64 and kwargs['truncation'] == 'longest_first'
+               for _, _, kwargs in tokenizer.calls)
+    stats = encoder.get_stats()
+    assert (stats['calls'], stats['pairs']) == (1, len(TEXTS))
+    assert stats['p50_ms'] is not None
+
+
+def test_batched_cross_encoder_plugs_into_cached_reranker(batched_encoder):
+    _, tokenizer, encoder = batched_encoder
+    reranker = CachedReranker(encoder, top_n=2, max_candidates=5)
+
+    docs = reranker.rerank("consulta", candidates(TEXTS))
+    reranker.rerank("consulta", candidates(TEXTS))
+
+    # Los chunks más largos puntúan más; en los empates se mantiene el orden de la fusión
+    assert [doc.page_content for doc in docs] == [TEXTS[2], TEXTS[0]]
+    assert encoder.get_stats()['calls'] == 1
+    assert len(tokenizer.calls) == 3
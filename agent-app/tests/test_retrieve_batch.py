@@ -0,0 +1,72 @@
+"""Tests de RAGSystem.retrieve_batch frente a retrieve() (sobre rag_stubs.StagedRAG)."""
+
+import threading
+
+import pytest
+
+from config import RerankerConfig
+from rag import READINESS_STAGES
+from rag_stubs import StagedRAG
+
+
+QUERIES = [
+    "Manuelita produce azúcar",
+    "vino de Chile",
+    "manuelita  PRODUCE azúcar",
+    "aceite de palma en los Llanos",
+    "código de ética",
+]
+
+
+@pytest.mark.parametrize("rerank", [True, False])
+def test_batch_matches_single_queries(corpus, tmp_path, rerank):
+    config = RerankerConfig(enabled=rerank)
+    batched = StagedRAG(corpus, tmp_path / "batch", reranker_config=config)
+    single = StagedRAG(corpus, tmp_path / "single", reranker_config=config)
+
+    assert batched.retrieve_batch(QUERIES) == [single.retrieve(query) for query in QUERIES]
+    # Las variantes normalizadas comparten entrada
+    assert len(batched.result_cache) == len(QUERIES) - 1
+
+
+def test_batch_reuses_cached_results(corpus, tmp_path):
+    rag = StagedRAG(corpus, tmp_path / "rag")
+    reference = StagedRAG(corpus, tmp_path / "reference")
+    expected = [reference.retrieve(QUERIES[0])]
+    first_pairs = reference.reranker.model.pairs
+    expected.append(reference.retrieve(QUERIES[1]))
+    rag.retrieve(QUERIES[1])
+    pairs = rag.reranker.model.pairs
+
+    results = rag.retrieve_batch(QUERIES[:2])
+
+    assert results == expected
+    assert rag.result_cache.get_stats()['hits'] == 1
+    # Solo la query no cacheada llega al cross-encoder
+    assert rag.reranker.model.pairs - pairs == first_pairs
+
+
+def test_batch_results_are_cached_per_stage(corpus, tmp_path):
+    gates = {'embeddings': threading.Event(), 'reranker': threading.Event()}
+    rag = StagedRAG(corpus, tmp_path / "rag", gates=gates, background_init=True)
+    try:
+        assert rag.readiness == 'bm25'
+        early = rag.retrieve_batch(QUERIES[:2])
+        assert early == [rag.retrieve(query) for query in QUERIES[:2]]
+
+        for gate in gates.values():
+            gate.set()
+        assert rag.wait_until_initialized(timeout=5) == READINESS_STAGES[-1]
+        hits = rag.result_cache.get_stats()['hits']
+
+        results = rag.retrieve_batch(QUERIES[:2])
+
+        # El resultado de la etapa BM25 no se sirve tras el re-ranker
+        assert rag.result_cache.get_stats()['hits'] == hits
+        reference = StagedRAG(corpus, tmp_path / "reference")
+        assert results == [reference.retrieve(query) for query in QUERIES[:2]]
+        assert results != early
+    finally:
+        for gate in gates.values():
+            gate.set()
+        rag.wait_until_initialized(timeout=5)
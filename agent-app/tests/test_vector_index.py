@@ -0,0 +1,160 @@
+"""Tests de los índices vectoriales y su cuantización."""
+
+import json
+
+import numpy as np
+import pytest
+
+from conftest import Doc
+from manuelita_cache import HashingEmbeddings
+from vector_index import (
+    DOCUMENTS_FILE,
+    IndexedVectorStore,
+    NumpyVectorIndex,
+    create_vector_index,
+    quantization_report,
+    quantize,
+)
+
+
+@pytest.fixture
+def embedded(corpus):
+    """Embeddings del corpus (repetido con variaciones para tener vecinos cercanos) y consultas."""
+    texts = [f"{text} {suffix}" for text in corpus for suffix in ("", "en 2024", "según el informe anual")]
+    model = HashingEmbeddings(dim=128)
+    vectors = np.asarray(model.embed_documents(texts), dtype=np.float32)
+    queries = [model.embed_query(text) for text in ("azúcar y etanol", "vino de Chile",
+                                                    "aceite de palma", "código de ética", "camarones")]
+    return vectors, [f"chunk-{i}" for i in range(len(texts))], queries
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantize_round_trip_error_is_small(embedded, dtype):
+    vectors, _, _ = embedded
+    matrix, scales = quantize(vectors, dtype)
+
+    restored = matrix.astype(np.float32) * (scales[:, None] if scales is not None else 1.0)
+
+    assert matrix.dtype == np.dtype(dtype)
+    assert np.abs(restored - vectors).max() <= (0.5 / 127 if dtype == 'int8' else 1e-3)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_scores_and_recall_match_float32(embedded, dtype):
+    vectors, ids, queries = embedded
+    baseline = NumpyVectorIndex(vectors.shape[1])
+    baseline.add(ids, vectors)
+    quantized = NumpyVectorIndex(vectors.shape[1], dtype=dtype)
+    quantized.add(ids, vectors)
+
+    for query in queries:
+        np.testing.assert_allclose(quantized.scores(np.asarray(query)),
+                                   baseline.scores(np.asarray(query)), atol=0.02)
+        (best, _), = quantized.search(np.asarray(query), 1)
+        assert best in {chunk_id for chunk_id, _ in baseline.search(np.asarray(query), 3)}
+    assert quantized.nbytes < baseline.nbytes
+
+
+def test_quantization_report_recall_against_float32(embedded):
+    vectors, ids, queries = embedded
+    relevant = [{ids[3 * topic]} for topic in (0, 2, 3, 5, 4)]
+
+    rows = {row['dtype']: row for row in quantization_report(vectors, ids, queries, relevant, k=3)}
+
+    assert rows['float32']['neighbor_overlap_at_k'] == 1.0
+    assert rows['float32']['recall_delta'] == 0.0
+    assert rows['int8']['compression'] > 3
+    assert rows['float16']['compression'] == pytest.approx(2.0)
+    for dtype in ("float16", "int8"):
+        assert rows[dtype]['neighbor_overlap_at_k'] >= 0.9
+        assert abs(rows[dtype]['recall_delta']) <= 0.2
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_save_load_memory_maps_matrix(embedded, tmp_path, dtype):
+    vectors, ids, queries = embedded
+    index = NumpyVectorIndex(vectors.shape[1], dtype=dtype)
+    index.add(ids, vectors)
+    index.save(tmp_path)
+
+    loaded = NumpyVectorIndex.load(tmp_path)
+
+    assert isinstance(loaded.matrix, np.memmap)
+    assert loaded.dtype == dtype
+    assert loaded.search(np.asarray(queries[0]), 5) == index.search(np.asarray(queries[0]), 5)
+
+
+def test_add_replaces_existing_ids_and_delete_removes(embedded):
+    vectors, ids, _ = embedded
+    index = NumpyVectorIndex(vectors.shape[1], dtype='int8')
+    index.add(ids, vectors)
+
+    index.add(ids[:2], vectors[:2])
+    index.delete([ids[0]])
+
+    assert len(index) == len(ids) - 1
+    assert index.ids[-1] == ids[1]
+    assert len(index.scales) == len(index)
+    assert index.search(vectors[0], 1)[0][0] != ids[0]
+
+
+def test_exact_search_finds_each_vector_first(embedded):
+    vectors, ids, _ = embedded
+    index = create_vector_index('numpy', vectors.shape[1])
+    index.add(ids, vectors)
+
+    for chunk_id, vector in zip(ids, vectors):
+        (best, score), = index.search(vector, 1)
+        assert score == pytest.approx(1.0, abs=1e-5)
+        assert np.allclose(vectors[ids.index(best)], vector)
+    assert index.search(vectors[0], 100)[-1][1] <= index.search(vectors[0], 100)[0][1]
+    assert len(index.search(vectors[0], 100)) == len(ids)
+
+
+@pytest.mark.parametrize("backend, dtype", [("chroma", "float32"), ("numpy", "int4"), ("hnsw", "int8")])
+def test_create_vector_index_rejects_unsupported(backend, dtype):
+    with pytest.raises(ValueError):
+        create_vector_index(backend, 8, dtype)
+
+
+def test_hnsw_matches_exact_search(embedded, tmp_path):
+    pytest.importorskip("hnswlib")
+    vectors, ids, queries = embedded
+    exact = create_vector_index('numpy', vectors.shape[1])
+    exact.add(ids, vectors)
+    hnsw = create_vector_index('hnsw', vectors.shape[1])
+    hnsw.add(ids, vectors)
+    hnsw.delete(ids[:1])
+    exact.delete(ids[:1])
+    hnsw.save(tmp_path)
+
+    loaded = type(hnsw).load(tmp_path)
+
+    for query in queries:
+        expected = [chunk_id for chunk_id, _ in exact.search(np.asarray(query), 3)]
+        assert [chunk_id for chunk_id, _ in loaded.search(np.asarray(query), 3)] == expected
+    assert len(loaded) == len(ids) - 1
+
+
+def test_indexed_vector_store_persists_every_change(corpus, tmp_path):
+    embedding = HashingEmbeddings(dim=64)
+    docs = [Doc(text, {"source": f"doc{i}.md"}) for i, text in enumerate(corpus)]
+    ids = [f"chunk-{i}" for i in range(len(docs))]
+    store = IndexedVectorStore.from_documents(docs[:4], embedding, ids[:4], str(tmp_path))
+
+    store.add_documents(docs[4:], ids[4:])
+    store.delete(ids[:1])
+
+    loaded = IndexedVectorStore.load(str(tmp_path), embedding)
+    assert loaded.count() == len(docs) - 1
+    assert loaded.documents == store.documents
+    assert loaded.documents["chunk-5"] == {"page_content": corpus[5], "metadata": {"source": "doc5.md"}}
+    query = np.asarray(embedding.embed_query(corpus[2]))
+    assert loaded.index.search(query, 1)[0][0] == "chunk-2"
+    assert "chunk-0" not in json.loads((tmp_path / DOCUMENTS_FILE).read_text(encoding="utf-8"))
+
+
+def test_indexed_vector_store_load_missing(tmp_path):
+    assert IndexedVectorStore.load(str(tmp_path), HashingEmbeddings()) is None
+    with pytest.raises(ValueError):
+        IndexedVectorStore.load(str(tmp_path), HashingEmbeddings(), backend="chroma")
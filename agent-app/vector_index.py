@@ -0,0 +1,527 @@
+"""
+Índices Vectoriales Intercambiables
+
+Alternativas a Chroma para corpus de unos miles de chunks, con la misma
+interfaz (VectorIndex):
+
+- NumpyVectorIndex: matriz de embeddings normalizados guardada en .npy y
+  abierta con memory-map; una búsqueda es un producto matriz-vector más
+  np.argpartition para el top-k. La matriz puede cuantizarse a float16 o a
+  int8 con una escala por vector; la consulta se mantiene en float32
+  (puntuación asimétrica).
+- HNSWVectorIndex: grafo HNSW de hnswlib (opcional) para corpus mayores.
+
+IndexedVectorStore expone sobre cualquiera de ellos el subconjunto de la API
+de Chroma que usa RAGSystem, y benchmark_backends los compara con Chroma
+sobre el mismo corpus.
+
+Solo la matriz de NumpyVectorIndex se abre con memory-map, y únicamente
+hasta el primer add/delete, que la copian a memoria. El texto y la metadata
+de los chunks (documents.json) se cargan enteros en memoria y el archivo se
+reescribe completo en cada persist, así que el consumo de memoria y el coste
+de cada actualización crecen con el corpus: pensado para miles de chunks, no
+para millones.
+"""
+
+import json
+import shutil
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from langchain_core.callbacks import CallbackManagerForRetrieverRun
+    from langchain_core.documents import Document
+    from langchain_core.retrievers import BaseRetriever
+except ImportError:
+    BaseRetriever = None
+    Document = None
+
+
+VECTOR_BACKENDS = ('chroma', 'numpy', 'hnsw')
+VECTOR_DTYPES = ('float32', 'float16', 'int8')
+IDS_FILE = "ids.json"
+DOCUMENTS_FILE = "documents.json"
+
+# Filas des-cuantizadas por bloque al puntuar (acota la memoria temporal)
+SCORE_BLOCK_ROWS = 4096
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normaliza filas a norma 1 (el producto interno pasa a ser similitud coseno)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Cuantiza vectores normalizados.
+
+    Returns:
+        (matriz en el dtype pedido, escala por fila para int8 o None)
+    """
+    if dtype == 'float32':
+        return vectors.astype(np.float32), None
+    if dtype == 'float16':
+        return vectors.astype(np.float16), None
+    if dtype == 'int8':
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        matrix = np.round(vectors / scales[:, None]).astype(np.int8)
+        return matrix, scales.astype(np.float32)
+    raise ValueError(f"dtype de índice vectorial no soportado: {dtype}")
+
+
+def _write_json(path: Path, data: Any) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+class VectorIndex(ABC):
+    """Índice de vectores por id con búsqueda por similitud coseno."""
+
+    backend = ""
+
+    @abstractmethod
+    def add(self, ids: List[str], vectors: np.ndarray) -> None:
+        """Añade vectores (los ids existentes se reemplazan)."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Elimina vectores por id (los ids desconocidos se ignoran)."""
+
+    @abstractmethod
+    def search(self, query_vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Los k vectores más similares como (id, similitud coseno), de mayor a menor."""
+
+    @abstractmethod
+    def save(self, directory: Path) -> None:
+        """Guarda el índice en un directorio."""
+
+    @classmethod
+    @abstractmethod
+    def load(cls, directory: Path) -> Optional["VectorIndex"]:
+        """Carga un índice guardado, o None si no existe."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de vectores indexados."""
+
+
+class NumpyVectorIndex(VectorIndex):
+    """Matriz normalizada en memoria o memory-mapped, opcionalmente cuantizada; búsqueda exacta."""
+
+    backend = "numpy"
+    VECTORS_FILE = "vectors.npy"
+    SCALES_FILE = "scales.npy"
+
+    def __init__(self, dim: int, ids: Optional[List[str]] = None,
+                 matrix: Optional[np.ndarray] = None, dtype: str = 'float32',
+                 scales: Optional[np.ndarray] = None):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"dtype de índice vectorial no soportado: {dtype}")
+        self.dim = dim
+        self.dtype = dtype
+        self.ids: List[str] = list(ids or [])
+        self.matrix = matrix if matrix is not None else np.empty((0, dim), dtype=dtype)
+        if dtype == 'int8' and scales is None:
+            scales = np.empty(0, dtype=np.float32)
+        self.scales = scales
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por los vectores (y sus escalas)."""
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def add(self, ids: List[str], vectors: np.ndarray) -> None:
+        self.delete(ids)
+        matrix, scales = quantize(_normalize(vectors), self.dtype)
+        self.matrix = np.vstack([self.matrix, matrix])
+        if scales is not None:
+            self.scales = np.concatenate([self.scales, scales])
+        self.ids.extend(ids)
+
+    def delete(self, ids: List[str]) -> None:
+        removed = set(ids)
+        keep = [i for i, chunk_id in enumerate(self.ids) if chunk_id not in removed]
+        if len(keep) != len(self.ids):
+            self.matrix = np.asarray(self.matrix)[keep]
+            if self.scales is not None:
+                self.scales = np.asarray(self.scales)[keep]
+            self.ids = [self.ids[i] for i in keep]
+
+    def scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Similitud coseno de la consulta (float32) con todos los vectores."""
+        query = _normalize(query_vector)[0]
+        if self.dtype == 'float32':
+            return self.matrix @ query
+
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), SCORE_BLOCK_ROWS):
+            end = start + SCORE_BLOCK_ROWS
+            scores[start:end] = self.matrix[start:end].astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def search(self, query_vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return []
+        scores = self.scores(query_vector)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates])]
+        return [(self.ids[i], float(scores[i])) for i in ranked]
+
+    def save(self, directory: Path) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {self.VECTORS_FILE: self.matrix}
+        if self.scales is not None:
+            arrays[self.SCALES_FILE] = self.scales
+        for filename, array in arrays.items():
+            tmp_path = directory / f".{filename}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            tmp_path.replace(directory / filename)
+        if self.scales is None and (directory / self.SCALES_FILE).exists():
+            (directory / self.SCALES_FILE).unlink()
+        _write_json(directory / IDS_FILE, self.ids)
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["NumpyVectorIndex"]:
+        directory = Path(directory)
+        if not (directory / cls.VECTORS_FILE).exists() or not (directory / IDS_FILE).exists():
+            return None
+        matrix = np.load(directory / cls.VECTORS_FILE, mmap_mode='r')
+        scales = None
+        if matrix.dtype == np.int8:
+            scales = np.load(directory / cls.SCALES_FILE, mmap_mode='r')
+        with open(directory / IDS_FILE, 'r', encoding='utf-8') as f:
+            ids = json.load(f)
+        return cls(matrix.shape[1], ids, matrix, dtype=matrix.dtype.name, scales=scales)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class HNSWVectorIndex(VectorIndex):
+    """Grafo HNSW aproximado (requiere hnswlib)."""
+
+    backend = "hnsw"
+    INDEX_FILE = "hnsw.bin"
+    META_FILE = "hnsw_meta.json"
+
+    def __init__(self, dim: int, max_elements: int = 1024, M: int = 16,
+                 ef_construction: int = 200, ef_search: int = 64):
+        import hnswlib
+
+        self.dim = dim
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.index = hnswlib.Index(space='cosine', dim=dim)
+        self.index.init_index(max_elements=max_elements, M=M, ef_construction=ef_construction)
+        self.index.set_ef(ef_search)
+        self.labels: Dict[str, int] = {}
+        self.ids_by_label: Dict[int, str] = {}
+        self.next_label = 0
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self.labels)
+
+    def add(self, ids: List[str], vectors: np.ndarray) -> None:
+        self.delete(ids)
+        needed = self.next_label + len(ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+
+        labels = np.arange(self.next_label, needed)
+        self.index.add_items(_normalize(vectors), labels)
+        self.labels.update(zip(ids, labels.tolist()))
+        self.ids_by_label.update(zip(labels.tolist(), ids))
+        self.next_label = needed
+
+    def delete(self, ids: List[str]) -> None:
+        for chunk_id in ids:
+            label = self.labels.pop(chunk_id, None)
+            if label is not None:
+                self.index.mark_deleted(label)
+                del self.ids_by_label[label]
+
+    def search(self, query_vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        k = min(k, len(self.labels))
+        if k <= 0:
+            return []
+        labels, distances = self.index.knn_query(_normalize(query_vector), k=k)
+        return [(self.ids_by_label[int(label)], 1.0 - float(distance))
+                for label, distance in zip(labels[0], distances[0])]
+
+    def save(self, directory: Path) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.index.save_index(str(directory / self.INDEX_FILE))
+        _write_json(directory / self.META_FILE, {
+            'dim': self.dim,
+            'M': self.M,
+            'ef_construction': self.ef_construction,
+            'ef_search': self.ef_search,
+            'labels': self.labels,
+            'next_label': self.next_label,
+        })
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["HNSWVectorIndex"]:
+        directory = Path(directory)
+        if not (directory / cls.INDEX_FILE).exists() or not (directory / cls.META_FILE).exists():
+            return None
+        with open(directory / cls.META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        index = cls(meta['dim'], max_elements=1, M=meta['M'],
+                    ef_construction=meta['ef_construction'], ef_search=meta['ef_search'])
+        index.index.load_index(str(directory / cls.INDEX_FILE), max_elements=max(meta['next_label'], 1))
+        index.index.set_ef(meta['ef_search'])
+        index.labels = meta['labels']
+        index.ids_by_label = {label: chunk_id for chunk_id, label in index.labels.items()}
+        index.next_label = meta['next_label']
+        return index
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+INDEX_CLASSES = {
+    'numpy': NumpyVectorIndex,
+    'hnsw': HNSWVectorIndex,
+}
+
+
+def create_vector_index(backend: str, dim: int, dtype: str = 'float32') -> VectorIndex:
+    """Crea un índice vacío del backend indicado ('numpy' o 'hnsw'; solo numpy se cuantiza)."""
+    if backend not in INDEX_CLASSES:
+        raise ValueError(f"Backend de índice vectorial no soportado: {backend}")
+    if backend == 'numpy':
+        return NumpyVectorIndex(dim, dtype=dtype)
+    if dtype != 'float32':
+        raise ValueError(f"El backend {backend} solo admite float32")
+    return INDEX_CLASSES[backend](dim)
+
+
+class IndexedVectorStore:
+    """
+    Base vectorial sobre un VectorIndex con la parte de la API de Chroma que usa RAGSystem.
+
+    Guarda los documentos junto al índice y persiste tras cada cambio, como
+    el cliente persistente de Chroma. Los documentos viven en un dict en
+    memoria y cada persist reescribe documents.json completo (y la matriz
+    del índice), de modo que add_documents/delete cuestan O(corpus).
+    """
+
+    def __init__(self, index: VectorIndex, embedding: Any, persist_directory: str,
+                 documents: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.index = index
+        self.embedding = embedding
+        self.persist_directory = Path(persist_directory)
+        self.documents = documents or {}
+
+    @classmethod
+    def from_documents(cls, documents: List[Any], embedding: Any, ids: List[str],
+                       persist_directory: str, backend: str = 'numpy',
+                       dtype: str = 'float32') -> "IndexedVectorStore":
+        vectors = np.asarray(embedding.embed_documents([doc.page_content for doc in documents]),
+                             dtype=np.float32)
+        store = cls(create_vector_index(backend, vectors.shape[1], dtype), embedding, persist_directory)
+        store._add(documents, ids, vectors)
+        store.persist()
+        return store
+
+    @classmethod
+    def load(cls, persist_directory: str, embedding: Any,
+             backend: str = 'numpy') -> Optional["IndexedVectorStore"]:
+        """Abre una base persistida, o None si no existe."""
+        if backend not in INDEX_CLASSES:
+            raise ValueError(f"Backend de índice vectorial no soportado: {backend}")
+        index = INDEX_CLASSES[backend].load(persist_directory)
+        documents_path = Path(persist_directory) / DOCUMENTS_FILE
+        if index is None or not documents_path.exists():
+            return None
+        with open(documents_path, 'r', encoding='utf-8') as f:
+            documents = json.load(f)
+        return cls(index, embedding, persist_directory, documents)
+
+    def _add(self, documents: List[Any], ids: List[str], vectors: np.ndarray) -> None:
+        self.index.add(ids, vectors)
+        for chunk_id, doc in zip(ids, documents):
+            self.documents[chunk_id] = {'page_content': doc.page_content, 'metadata': doc.metadata}
+
+    def add_documents(self, documents: List[Any], ids: List[str]) -> List[str]:
+        vectors = np.asarray(self.embedding.embed_documents([doc.page_content for doc in documents]),
+                             dtype=np.float32)
+        self._add(documents, ids, vectors)
+        self.persist()
+        return ids
+
+    def delete(self, ids: List[str]) -> None:
+        self.index.delete(ids)
+        for chunk_id in ids:
+            self.documents.pop(chunk_id, None)
+        self.persist()
+
+    def count(self) -> int:
+        return len(self.index)
+
+    def persist(self) -> None:
+        self.index.save(self.persist_directory)
+        _write_json(self.persist_directory / DOCUMENTS_FILE, self.documents)
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Any, float]]:
+        query_vector = np.asarray(self.embedding.embed_query(query), dtype=np.float32)
+        return [(Document(**self.documents[chunk_id]), score)
+                for chunk_id, score in self.index.search(query_vector, k)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Any]:
+        query_vector = np.asarray(embedding, dtype=np.float32)
+        return [Document(**self.documents[chunk_id]) for chunk_id, _ in self.index.search(query_vector, k)]
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Any]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def as_retriever(self, search_kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        return VectorIndexRetriever(store=self, k=(search_kwargs or {}).get('k', 4))
+
+
+if BaseRetriever is not None:
+
+    class VectorIndexRetriever(BaseRetriever):
+        """Retriever de LangChain sobre un IndexedVectorStore."""
+
+        store: Any
+        k: int = 4
+
+        def _get_relevant_documents(self, query: str, *,
+                                    run_manager: CallbackManagerForRetrieverRun) -> List[Any]:
+            return self.store.similarity_search(query, self.k)
+else:
+    VectorIndexRetriever = None
+
+
+def benchmark_backends(documents: List[Any], ids: List[str], embedding: Any, queries: List[str],
+                       workdir: str, backends: Tuple[str, ...] = VECTOR_BACKENDS,
+                       k: int = 7) -> List[Dict[str, Any]]:
+    """
+    Compara backends vectoriales sobre el mismo corpus y consultas.
+
+    Mide construcción, carga en frío, latencia por consulta (p50/p95) y el
+    solapamiento del top-k con el backend exacto 'numpy'. Los backends cuyas
+    dependencias no están instaladas se reportan con su error.
+    """
+    from langchain_community.vectorstores import Chroma
+
+    query_vectors = [embedding.embed_query(query) for query in queries]
+    reference: Optional[List[set]] = None
+    rows = []
+
+    for backend in sorted(backends, key=lambda name: name != 'numpy'):
+        directory = Path(workdir) / backend
+        if directory.exists():
+            shutil.rmtree(directory)
+        row: Dict[str, Any] = {'backend': backend}
+        try:
+            start_time = time.perf_counter()
+            if backend == 'chroma':
+                Chroma.from_documents(documents=documents, embedding=embedding, ids=ids,
+                                      persist_directory=str(directory))
+            else:
+                IndexedVectorStore.from_documents(documents, embedding, ids, str(directory), backend)
+            row['build_s'] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            if backend == 'chroma':
+                store = Chroma(persist_directory=str(directory), embedding_function=embedding)
+                search = lambda vector: [doc.page_content for doc in store.similarity_search_by_vector(vector, k=k)]
+            else:
+                store = IndexedVectorStore.load(str(directory), embedding, backend)
+                search = lambda vector: [store.documents[chunk_id]['page_content']
+                                         for chunk_id, _ in store.index.search(np.asarray(vector), k)]
+            row['load_s'] = time.perf_counter() - start_time
+
+            latencies, results = [], []
+            for vector in query_vectors:
+                start_time = time.perf_counter()
+                results.append(set(search(vector)))
+                latencies.append(time.perf_counter() - start_time)
+            latencies.sort()
+            row['query_p50_ms'] = latencies[len(latencies) // 2] * 1000
+            row['query_p95_ms'] = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000
+
+            if reference is None:
+                reference = results
+            row['overlap_at_k'] = float(np.mean([len(a & b) / max(len(b), 1)
+                                                 for a, b in zip(results, reference)]))
+        except ImportError as e:
+            row['error'] = f"no disponible: {e}"
+        rows.append(row)
+
+    return rows
+
+
+def quantization_report(vectors: np.ndarray, ids: List[str], query_vectors: List[List[float]],
+                        relevant: Optional[List[set]] = None, groups: Optional[Dict[str, str]] = None,
+                        k: int = 7) -> List[Dict[str, Any]]:
+    """
+    Compara cada dtype de NumpyVectorIndex con float32 sobre las mismas consultas.
+
+    Args:
+        vectors: Embeddings del corpus (float32)
+        ids: Id de cada vector
+        query_vectors: Embeddings de las consultas
+        relevant: Elementos relevantes por consulta (conjunto de referencia); si se
+            omite solo se mide el solapamiento con los vecinos float32
+        groups: id → grupo (p. ej. archivo de origen) para medir el recall por
+            grupo en lugar de por id
+        k: Profundidad del top-k
+
+    Returns:
+        Por dtype: bytes, compresión, solapamiento con float32, recall@k y su
+        diferencia respecto a float32
+    """
+    rows = []
+    reference: Optional[List[set]] = None
+    baseline_recall = None
+
+    for dtype in VECTOR_DTYPES:
+        index = NumpyVectorIndex(vectors.shape[1], dtype=dtype)
+        index.add(list(ids), vectors)
+        results = [{chunk_id for chunk_id, _ in index.search(np.asarray(query), k)}
+                   for query in query_vectors]
+        if reference is None:
+            reference = results
+            baseline_bytes = index.nbytes
+
+        row: Dict[str, Any] = {
+            'dtype': dtype,
+            'bytes': index.nbytes,
+            'compression': baseline_bytes / index.nbytes if index.nbytes else None,
+            'neighbor_overlap_at_k': float(np.mean([len(a & b) / max(len(b), 1)
+                                                    for a, b in zip(results, reference)])),
+        }
+        if relevant:
+            found_sets = [{groups[chunk_id] for chunk_id in found} if groups else found for found in results]
+            recall = float(np.mean([len(found & expected) / len(expected)
+                                    for found, expected in zip(found_sets, relevant) if expected]))
+            if baseline_recall is None:
+                baseline_recall = recall
+            row['recall_at_k'] = recall
+            row['recall_delta'] = recall - baseline_recall
+        rows.append(row)
+
+    return rows
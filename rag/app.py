@@ -13,7 +13,10 @@
 # ==============================================================================
 
 import gradio as gr
+import importlib.util
 import os
+import sys
+from pathlib import Path
 
 # --- LangChain / Infra RAG ---
 from langchain.retrievers import EnsembleRetriever, ContextualCompressionRetriever
@@ -29,6 +32,35 @@ from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+# --- Caché de embeddings compartida con agent-app (opcional) ---
+# El paquete manuelita_cache se carga por ruta: añadir agent-app a sys.path
+# expondría sus módulos config, memory, rag, agent y parser a este app.
+SHARED_CACHE_DIR = Path(__file__).resolve().parent.parent / "agent-app" / "manuelita_cache"
+
+
+def load_shared_cache():
+    """Importa agent-app/manuelita_cache como paquete 'manuelita_cache'."""
+    if "manuelita_cache" in sys.modules:
+        return sys.modules["manuelita_cache"]
+    spec = importlib.util.spec_from_file_location(
+        "manuelita_cache", SHARED_CACHE_DIR / "__init__.py",
+        submodule_search_locations=[str(SHARED_CACHE_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[spec.name]
+        raise
+    return module
+
+
+try:
+    CachedEmbeddings = load_shared_cache().CachedEmbeddings
+except (ImportError, OSError):
+    CachedEmbeddings = None
+
 print("Starting Manuelita Chatbot (RAG)…")
 rag_chain = None
 initialization_error = None
@@ -88,9 +120,11 @@ try:
     # 3) Búsqueda Híbrida (Vectorial + BM25)
     # --------------------------------------------------------------------------
     print("Building hybrid retriever (vector + keyword)…")
-    embedding_model = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    embedding_model_name = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
+    if CachedEmbeddings is not None:
+        # Reutiliza los embeddings ya calculados por esta app o por agent-app
+        embedding_model = CachedEmbeddings(embedding_model, model_name=embedding_model_name)
     vectorstore = Chroma.from_documents(documents=splits, embedding=embedding_model)
 
     # - Semántico
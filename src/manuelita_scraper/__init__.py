@@ -5,20 +5,63 @@ This package provides a complete ETL pipeline for scraping and processing
 Manuelita corporate and news content.
 """
 
-from .pipeline import ManuelitaPipeline
-from .config import AppConfig, init_config, get_config
-from .logging_config import get_logger, init_logging
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name → submodule defining it. Submodules are imported on first
+# attribute access so that lightweight CLI commands don't pay for
+# requests, BeautifulSoup, html2text, pydantic or structlog at startup.
+_LAZY_EXPORTS = {
+    # Main pipeline
+    "ManuelitaPipeline": ".pipeline",
+    
+    # Configuration
+    "AppConfig": ".config",
+    "init_config": ".config",
+    "get_config": ".config",
+    
+    # Logging
+    "get_logger": ".logging_config",
+    "init_logging": ".logging_config",
+    
+    # Extractors
+    "CorporateExtractor": ".extractors.corporate",
+    "NewsExtractor": ".extractors.news",
+    
+    # Transformers
+    "CorporateTransformer": ".transformers.corporate",
+    "NewsTransformer": ".transformers.news",
+    
+    # Loaders
+    "FileLoader": ".loaders.file_loader",
+    "ContentItem": ".loaders.file_loader",
+}
+
+if TYPE_CHECKING:
+    from .pipeline import ManuelitaPipeline
+    from .config import AppConfig, init_config, get_config
+    from .logging_config import get_logger, init_logging
+    from .extractors.corporate import CorporateExtractor
+    from .extractors.news import NewsExtractor
+    from .transformers.corporate import CorporateTransformer
+    from .transformers.news import NewsTransformer
+    from .loaders.file_loader import FileLoader, ContentItem
+
+
+def __getattr__(name):
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Extractors
-from .extractors.corporate import CorporateExtractor
-from .extractors.news import NewsExtractor
 
-# Transformers  
-from .transformers.corporate import CorporateTransformer
-from .transformers.news import NewsTransformer
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# Loaders
-from .loaders.file_loader import FileLoader, ContentItem
 
 __version__ = "0.2.0"
 __author__ = "AI Engineering Team"
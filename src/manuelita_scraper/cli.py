@@ -7,13 +7,15 @@ Provides a CLI for running the scraping pipeline operations.
 import click
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
-from .pipeline import ManuelitaPipeline
-from .transformers.corporate import CorporateTransformer
-from .transformers.news import NewsTransformer
-from .config import init_config
+# Only lightweight modules are imported here; pipeline, configuration and
+# logging modules (pydantic, structlog, requests, BeautifulSoup) are imported
+# inside the commands that need them to keep CLI startup fast.
+from .profiling import PROFILE_MODES, StageProfiler
+from .run_report import compare_runs, list_runs, load_run_manifest, resolve_run_manifest
 
 
 def print_json(data):
@@ -36,6 +38,40 @@ def print_warning(message: str):
     click.echo(click.style(f"⚠️ {message}", fg='yellow'))
 
 
+def profile_option(command):
+    """Add the --profile option to a command."""
+    return click.option('--profile', 'profile_mode', type=click.Choice(PROFILE_MODES), default=None,
+                        help='Profile each stage (cpu: cProfile, mem: tracemalloc) of a single-threaded '
+                             'run and write the results next to the run manifest')(command)
+
+
+def _start_profiler(profile_mode: Optional[str]) -> Optional[StageProfiler]:
+    """Start a stage profiler and attach it to the logger, if profiling was requested."""
+    if not profile_mode:
+        return None
+    from .logging_config import get_logger
+    
+    profiler = StageProfiler(profile_mode).start()
+    get_logger().set_profiler(profiler)
+    return profiler
+
+
+def _finish_profiler(profiler: Optional[StageProfiler], output_dir: Path) -> None:
+    """Detach the profiler and write its per-stage output."""
+    if profiler is None:
+        return
+    from .logging_config import get_logger
+    
+    profiler.stop()
+    get_logger().set_profiler(None)
+    
+    try:
+        paths = profiler.write(output_dir)
+        click.echo(f"🔬 Profile ({profiler.mode}): {paths[-1]}")
+    except Exception as e:
+        print_warning(f"Failed to write profile: {str(e)}")
+
+
 @click.group()
 @click.option('--env', '--environment', default='development', 
               help='Environment configuration to use (development/production)')
@@ -51,43 +87,55 @@ def cli(ctx, env):
               type=click.Choice(['corporate', 'news', 'both']), 
               default='both',
               help='Type of content to extract')
+@profile_option
 @click.pass_context
-def extract(ctx, content_type):
+def extract(ctx, content_type, profile_mode):
     """Extract content from configured URLs."""
     env = ctx.obj['environment']
     
     try:
+        from .pipeline import ManuelitaPipeline
+        
         pipeline = ManuelitaPipeline(env)
         click.echo(f"🚀 Starting extraction with {env} environment...")
         
-        if content_type == 'corporate':
-            result = pipeline.extract_corporate_content()
-            if result:
-                print_success(f"Extracted {len(result)} corporate pages")
-            else:
-                print_warning("No corporate content extracted")
-                
-        elif content_type == 'news':
-            result, discovered_links = pipeline.extract_news_content()
-            if result:
-                print_success(f"Extracted {len(result)} news items, discovered {len(discovered_links)} links")
-            else:
-                print_warning("No news content extracted")
-                
-        elif content_type == 'both':
-            corporate_result = pipeline.extract_corporate_content()
-            news_result, discovered_links = pipeline.extract_news_content()
-            
-            total_extracted = len(corporate_result) + len(news_result)
-            print_success(f"Extracted {total_extracted} items total")
-            click.echo(f"  - Corporate: {len(corporate_result)}")
-            click.echo(f"  - News: {len(news_result)} (discovered {len(discovered_links)} links)")
+        profiler = _start_profiler(profile_mode)
+        try:
+            _run_extraction(pipeline, content_type)
+        finally:
+            _finish_profiler(profiler, pipeline.runs_directory / pipeline.new_run_id(f"extract_{content_type}"))
             
     except Exception as e:
         print_error(f"Extraction failed: {str(e)}")
         sys.exit(1)
 
 
+def _run_extraction(pipeline, content_type):
+    """Run the extraction step for a content type and print its summary."""
+    if content_type == 'corporate':
+        result = pipeline.extract_corporate_content()
+        if result:
+            print_success(f"Extracted {len(result)} corporate pages")
+        else:
+            print_warning("No corporate content extracted")
+            
+    elif content_type == 'news':
+        result, discovered_links = pipeline.extract_news_content()
+        if result:
+            print_success(f"Extracted {len(result)} news items, discovered {len(discovered_links)} links")
+        else:
+            print_warning("No news content extracted")
+            
+    elif content_type == 'both':
+        corporate_result = pipeline.extract_corporate_content()
+        news_result, discovered_links = pipeline.extract_news_content()
+        
+        total_extracted = len(corporate_result) + len(news_result)
+        print_success(f"Extracted {total_extracted} items total")
+        click.echo(f"  - Corporate: {len(corporate_result)}")
+        click.echo(f"  - News: {len(news_result)} (discovered {len(discovered_links)} links)")
+
+
 @cli.command()
 @click.option('--input-dir', required=True, 
               help='Input directory containing content to clean')
@@ -97,12 +145,18 @@ def extract(ctx, content_type):
               type=click.Choice(['corporate', 'news']),
               default='corporate',
               help='Type of content to clean')
+@profile_option
 @click.pass_context
-def clean(ctx, input_dir, output_dir, content_type):
+def clean(ctx, input_dir, output_dir, content_type, profile_mode):
     """Clean existing content files."""
     env = ctx.obj['environment']
     
     try:
+        from .config import init_config
+        from .pipeline import ManuelitaPipeline
+        from .transformers.corporate import CorporateTransformer
+        from .transformers.news import NewsTransformer
+        
         config = init_config(env)
         
         if content_type == 'corporate':
@@ -114,7 +168,12 @@ def clean(ctx, input_dir, output_dir, content_type):
         click.echo(f"  Input: {input_dir}")
         click.echo(f"  Output: {output_dir}")
         
-        results = transformer.transform_directory(input_dir, output_dir)
+        profiler = _start_profiler(profile_mode)
+        try:
+            results = transformer.transform_directory(input_dir, output_dir)
+        finally:
+            runs_directory = Path(config.scraping.output.base_directory) / "runs"
+            _finish_profiler(profiler, runs_directory / ManuelitaPipeline.new_run_id(f"clean_{content_type}"))
         
         successful = sum(1 for success in results.values() if success)
         total = len(results)
@@ -140,21 +199,70 @@ def clean(ctx, input_dir, output_dir, content_type):
               type=click.Choice(['corporate', 'news', 'full']),
               default='full',
               help='Type of pipeline to run')
+@click.option('--stream', 'streaming', is_flag=True, default=False,
+              help='Stream documents through extract → transform → load one at a time')
+@click.option('--concurrent', is_flag=True, default=False,
+              help='Run corporate and news pipelines in parallel (full pipeline only)')
+@click.option('--incremental', is_flag=True, default=False,
+              help='Only re-process documents that changed since the last run (uses the change manifest)')
+@click.option('--metrics-file', default=None,
+              help='Write Prometheus metrics to this file at the end of the run')
+@click.option('--metrics-port', type=int, default=None,
+              help='Serve live Prometheus metrics on this local port during the run')
+@profile_option
 @click.pass_context
-def pipeline(ctx, pipeline_type):
+def pipeline(ctx, pipeline_type, streaming, concurrent, incremental, metrics_file, metrics_port, profile_mode):
     """Run the complete ETL pipeline."""
     env = ctx.obj['environment']
     
+    if incremental and (streaming or concurrent):
+        raise click.UsageError("--incremental cannot be combined with --stream or --concurrent")
+    if profile_mode and concurrent:
+        # cProfile only sees the thread that enabled it, so stages would be misattributed
+        raise click.UsageError("--profile cannot be combined with --concurrent")
+    
     try:
+        from .pipeline import ManuelitaPipeline
+        
         pipeline_instance = ManuelitaPipeline(env)
-        click.echo(f"🏗️ Starting {pipeline_type} pipeline with {env} environment...")
+        mode = " (streaming)" if streaming else " (incremental)" if incremental else ""
+        click.echo(f"🏗️ Starting {pipeline_type} pipeline{mode} with {env} environment...")
+        
+        metrics_server = pipeline_instance.start_metrics_server(metrics_port)
+        if metrics_server:
+            click.echo(f"📈 Metrics endpoint: http://{metrics_server.host}:{metrics_server.port}/metrics")
+        
+        run_id = pipeline_instance.new_run_id(pipeline_type)
+        profiler = _start_profiler(profile_mode)
+        start_time = time.perf_counter()
+        try:
+            if incremental:
+                result = pipeline_instance.run_incremental_pipeline(pipeline_type)
+            elif pipeline_type == 'corporate':
+                result = pipeline_instance.run_corporate_pipeline(streaming=streaming)
+            elif pipeline_type == 'news':
+                result = pipeline_instance.run_news_pipeline(streaming=streaming)
+            else:  # full
+                result = pipeline_instance.run_full_pipeline(streaming=streaming, concurrent=concurrent)
+        finally:
+            _finish_profiler(profiler, pipeline_instance.runs_directory / run_id)
+            if metrics_server:
+                metrics_server.stop()
+            metrics_path = pipeline_instance.export_metrics_textfile(metrics_file)
+            if metrics_path:
+                click.echo(f"📈 Prometheus metrics: {metrics_path}")
+        
+        manifest_path = pipeline_instance.record_run(
+            pipeline_type, result, time.perf_counter() - start_time,
+            mode={'streaming': streaming, 'concurrent': concurrent, 'incremental': incremental},
+            run_id=run_id
+        )
+        if manifest_path:
+            click.echo(f"🧾 Run manifest: {manifest_path}")
         
-        if pipeline_type == 'corporate':
-            result = pipeline_instance.run_corporate_pipeline()
-        elif pipeline_type == 'news':
-            result = pipeline_instance.run_news_pipeline()
-        else:  # full
-            result = pipeline_instance.run_full_pipeline()
+        if incremental:
+            _print_incremental_summary(result, pipeline_type)
+            return
         
         if result['success']:
             print_success("Pipeline completed successfully!")
@@ -182,6 +290,26 @@ def pipeline(ctx, pipeline_type):
         sys.exit(1)
 
 
+def _print_incremental_summary(result, pipeline_type):
+    """Print the changeset summary of an incremental pipeline run."""
+    type_results = [result[name] for name in ('corporate', 'news')] if pipeline_type == 'full' else [result]
+    
+    if not result['success']:
+        failed = [r for r in type_results if not r['success']]
+        print_error(f"Pipeline failed: {failed[0].get('message', 'No content extracted')}")
+        sys.exit(1)
+    
+    print_success("Incremental pipeline completed successfully!")
+    click.echo(f"📊 Changeset:")
+    for type_result in type_results:
+        click.echo(f"  {type_result['pipeline_type']}: "
+                   f"+{type_result['added_count']} added, "
+                   f"~{type_result['updated_count']} updated, "
+                   f"-{type_result['removed_count']} removed, "
+                   f"{type_result['unchanged_count']} unchanged")
+        click.echo(f"    Changeset file: {type_result['changeset_path']}")
+
+
 @cli.command()
 @click.pass_context
 def status(ctx):
@@ -189,6 +317,8 @@ def status(ctx):
     env = ctx.obj['environment']
     
     try:
+        from .pipeline import ManuelitaPipeline
+        
         pipeline = ManuelitaPipeline(env)
         status_info = pipeline.get_pipeline_status()
         
@@ -211,10 +341,11 @@ def status(ctx):
                     click.echo(f"    {name}: {value}")
             
             if metrics['timings']:
-                click.echo("  Average timings:")
+                click.echo("  Timings (avg / p50 / p90 / p99):")
                 for name, timing_data in metrics['timings'].items():
-                    avg_time = timing_data['average']
-                    click.echo(f"    {name}: {avg_time:.2f}s")
+                    click.echo(f"    {name}: {timing_data['average']:.2f}s / "
+                               f"{timing_data['p50']:.2f}s / {timing_data['p90']:.2f}s / "
+                               f"{timing_data['p99']:.2f}s")
         
     except Exception as e:
         print_error(f"Failed to get status: {str(e)}")
@@ -228,6 +359,8 @@ def config(ctx):
     env = ctx.obj['environment']
     
     try:
+        from .config import init_config
+        
         config_obj = init_config(env)
         
         click.echo(f"⚙️ Configuration ({env} environment)")
@@ -266,6 +399,101 @@ def count(directory, pattern):
         sys.exit(1)
 
 
+def _format_metric(value):
+    """Format a run manifest value for table output."""
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:,.4f}"
+    return f"{value:,}"
+
+
+@cli.group()
+def runs():
+    """Inspect and compare pipeline run manifests."""
+
+
+@runs.command('list')
+@click.pass_context
+def runs_list(ctx):
+    """List recorded pipeline runs."""
+    env = ctx.obj['environment']
+    
+    try:
+        from .config import init_config
+        
+        config_obj = init_config(env)
+        runs_dir = Path(config_obj.scraping.output.base_directory) / "runs"
+        manifests = list_runs(runs_dir)
+        
+        if not manifests:
+            print_warning(f"No run manifests found in {runs_dir}")
+            return
+        
+        click.echo(f"🧾 Runs in {runs_dir}")
+        for manifest in manifests:
+            totals = manifest.get('totals', {})
+            status_icon = "✅" if manifest.get('success') else "❌"
+            click.echo(f"  {status_icon} {manifest['run_id']}: "
+                       f"{manifest.get('wall_time_s', 0):.2f}s, "
+                       f"{totals.get('loaded', 0)} loaded, "
+                       f"{_format_metric(totals.get('items_per_s'))} items/s")
+            
+    except Exception as e:
+        print_error(f"Failed to list runs: {str(e)}")
+        sys.exit(1)
+
+
+@runs.command('compare')
+@click.argument('baseline')
+@click.argument('candidate')
+@click.option('--threshold', default=0.10, show_default=True,
+              help='Relative change flagged as a regression')
+@click.option('--json', 'as_json', is_flag=True, default=False, help='Output the diff as JSON')
+@click.pass_context
+def runs_compare(ctx, baseline, candidate, threshold, as_json):
+    """Compare two runs (run ids or manifest paths) and flag regressions."""
+    env = ctx.obj['environment']
+    
+    try:
+        from .config import init_config
+        
+        config_obj = init_config(env)
+        runs_dir = Path(config_obj.scraping.output.base_directory) / "runs"
+        baseline_manifest = load_run_manifest(resolve_run_manifest(baseline, runs_dir))
+        candidate_manifest = load_run_manifest(resolve_run_manifest(candidate, runs_dir))
+        rows = compare_runs(baseline_manifest, candidate_manifest, threshold)
+        regressions = [row for row in rows if row['regression']]
+        
+        if as_json:
+            print_json({
+                'baseline': baseline_manifest['run_id'],
+                'candidate': candidate_manifest['run_id'],
+                'threshold': threshold,
+                'metrics': rows,
+                'regressions': [row['metric'] for row in regressions]
+            })
+        else:
+            click.echo(f"📊 {baseline_manifest['run_id']} → {candidate_manifest['run_id']}")
+            click.echo(f"{'metric':<34} {'baseline':>14} {'candidate':>14} {'change':>9}")
+            for row in rows:
+                change = f"{row['change']:+.1%}" if row['change'] is not None else "-"
+                line = (f"{row['metric']:<34} {_format_metric(row['baseline']):>14} "
+                        f"{_format_metric(row['candidate']):>14} {change:>9}")
+                click.echo(click.style(line, fg='red') if row['regression'] else line)
+        
+        if regressions:
+            if not as_json:
+                print_warning(f"{len(regressions)} metric(s) regressed beyond {threshold:.0%}")
+            sys.exit(2)
+        if not as_json:
+            print_success("No performance regressions detected")
+        
+    except Exception as e:
+        print_error(f"Failed to compare runs: {str(e)}")
+        sys.exit(1)
+
+
 def main():
     """Entry point for the CLI."""
     cli()
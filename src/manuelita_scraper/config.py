@@ -74,6 +74,20 @@ class LoggingConfig(BaseModel):
     format: str = Field(default="text", pattern="^(json|text)$")
     file_path: str = Field(default="logs/application.log")
     console_output: bool = Field(default=True)
+    async_sink: bool = Field(default=False)
+    queue_size: int = Field(default=10000, ge=100)
+    batch_size: int = Field(default=256, ge=1)
+    flush_interval: float = Field(default=0.5, gt=0, le=10.0)
+    sample_rates: Dict[str, float] = Field(default_factory=dict)
+    
+    @validator('sample_rates')
+    def validate_sample_rates(cls, v):
+        for level, rate in v.items():
+            if level not in ('debug', 'info'):
+                raise ValueError("Sampling is only supported for 'debug' and 'info' events")
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError("Sample rates must be between 0 and 1")
+        return v
 
 
 class MonitoringConfig(BaseModel):
@@ -81,6 +95,8 @@ class MonitoringConfig(BaseModel):
     metrics_enabled: bool = Field(default=True)
     error_tracking: bool = Field(default=True)
     performance_tracking: bool = Field(default=True)
+    prometheus_textfile: Optional[str] = Field(default=None)
+    prometheus_port: Optional[int] = Field(default=None, ge=1, le=65535)
 
 
 class AppConfig(BaseModel):
@@ -99,13 +115,17 @@ class ConfigManager:
         self.environments_dir = self.config_dir / "environments"
         self.schemas_dir = self.config_dir / "schemas"
         self._config: Optional[AppConfig] = None
+        # Parsed configuration per environment, so YAML is read once per process
+        self._configs: Dict[str, AppConfig] = {}
+        self._directories_created: set = set()
     
-    def load_environment_config(self, environment: str = "development") -> AppConfig:
+    def load_environment_config(self, environment: str = "development", use_cache: bool = True) -> AppConfig:
         """
         Load configuration for a specific environment.
         
         Args:
             environment: Environment name (development, production, etc.)
+            use_cache: Return the configuration already loaded for this environment, if any
             
         Returns:
             Validated application configuration
@@ -114,6 +134,10 @@ class ConfigManager:
             FileNotFoundError: If configuration file doesn't exist
             ValidationError: If configuration is invalid
         """
+        if use_cache and environment in self._configs:
+            self._config = self._configs[environment]
+            return self._config
+        
         config_file = self.environments_dir / f"{environment}.yaml"
         
         if not config_file.exists():
@@ -124,6 +148,7 @@ class ConfigManager:
         
         # Validate and create configuration object
         self._config = AppConfig(**config_data)
+        self._configs[environment] = self._config
         return self._config
     
     def get_config(self) -> AppConfig:
@@ -134,7 +159,8 @@ class ConfigManager:
     
     def reload_config(self, environment: str = "development") -> AppConfig:
         """Reload configuration from file."""
-        return self.load_environment_config(environment)
+        self._directories_created.discard(environment)
+        return self.load_environment_config(environment, use_cache=False)
     
     @staticmethod
     def from_dict(config_dict: Dict[str, Any]) -> AppConfig:
@@ -148,6 +174,14 @@ class ConfigManager:
         # For now, return default configuration
         return AppConfig()
     
+    def init_environment(self, environment: str = "development") -> AppConfig:
+        """Load an environment's configuration and create its directories, once per process."""
+        config = self.load_environment_config(environment)
+        if environment not in self._directories_created:
+            self.create_directories()
+            self._directories_created.add(environment)
+        return config
+    
     def create_directories(self) -> None:
         """Create necessary directories based on configuration."""
         config = self.get_config()
@@ -176,7 +210,5 @@ def get_config(environment: Optional[str] = None) -> AppConfig:
 
 
 def init_config(environment: str = "development") -> AppConfig:
-    """Initialize the global configuration."""
-    config = _config_manager.load_environment_config(environment)
-    _config_manager.create_directories()
-    return config
\ No newline at end of file
+    """Initialize the global configuration (loaded and set up once per environment and process)."""
+    return _config_manager.init_environment(environment)
\ No newline at end of file
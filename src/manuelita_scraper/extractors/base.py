@@ -7,7 +7,7 @@ This module provides base classes for data extraction (scraping) operations.
 import time
 import requests
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Iterator, List, Optional, Set
 from urllib.parse import urlparse, urljoin
 from dataclasses import dataclass
 from pathlib import Path
@@ -18,6 +18,11 @@ import html2text
 
 from ..config import ScrapingConfig
 from ..logging_config import get_logger
+from .rate_limiter import HostRateLimiter
+
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 @dataclass
@@ -29,20 +34,28 @@ class ScrapingResult:
     success: bool = True
     error_message: Optional[str] = None
     discovered_links: Set[str] = None
+    status_code: Optional[int] = None
+    http_validators: Dict[str, Optional[str]] = None
+    not_modified: bool = False
     
     def __post_init__(self):
         if self.discovered_links is None:
             self.discovered_links = set()
+        if self.http_validators is None:
+            self.http_validators = {}
 
 
 class BaseExtractor(ABC):
     """Base class for data extractors."""
     
-    def __init__(self, config: ScrapingConfig):
+    def __init__(self, config: ScrapingConfig, rate_limiter: Optional[HostRateLimiter] = None):
         self.config = config
         self.logger = get_logger()
+        self.rate_limiter = rate_limiter or HostRateLimiter(config.settings.request_delay)
         self.session = self._create_session()
         self._processed_urls: Set[str] = set()
+        # URL → {'etag', 'last_modified', 'discovered_links'} from a previous run
+        self.previous_validators: Dict[str, Dict[str, Any]] = {}
     
     def _create_session(self) -> requests.Session:
         """Create and configure HTTP session."""
@@ -52,6 +65,47 @@ class BaseExtractor(ABC):
         })
         return session
     
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build conditional request headers from validators recorded by a previous run."""
+        previous = self.previous_validators.get(url) or {}
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        return headers
+    
+    def _fetch(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """
+        GET a URL, retrying timeouts, connection errors and retryable statuses.
+        
+        Every attempt goes through the per-host rate limiter, so retries are
+        spaced by the request delay. Up to ``max_retries`` extra attempts are
+        made; each one is counted in the ``http_retries`` counter.
+        """
+        max_retries = self.config.settings.max_retries
+        for attempt in range(max_retries + 1):
+            # Add delay between requests to the same host
+            self.rate_limiter.wait(url)
+            
+            try:
+                if headers:
+                    response = self.session.get(url, timeout=self.config.settings.timeout, headers=headers)
+                else:
+                    response = self.session.get(url, timeout=self.config.settings.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == max_retries:
+                    raise
+                self.logger.warning("Retrying request", url=url, attempt=attempt + 1, error=str(e))
+                self.logger.increment_counter('http_retries')
+                continue
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                return response
+            self.logger.warning("Retrying request", url=url, attempt=attempt + 1,
+                                status_code=response.status_code)
+            self.logger.increment_counter('http_retries')
+    
     def _clean_filename(self, url: str) -> str:
         """Convert URL to a clean filename."""
         parsed = urlparse(url)
@@ -148,13 +202,19 @@ class BaseExtractor(ABC):
         
         with self.logger.timed_operation("scrape_url", url=url):
             try:
-                # Add delay between requests
-                if self._processed_urls:  # Not the first request
-                    time.sleep(self.config.settings.request_delay)
+                # Make request (conditional if a previous run recorded validators)
+                response = self._fetch(url, self._conditional_headers(url))
+                
+                if response.status_code == 304:
+                    return self._not_modified_result(url)
                 
-                # Make request
-                response = self.session.get(url, timeout=self.config.settings.timeout)
                 response.raise_for_status()
+                http_validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+                
+                self.logger.increment_counter('extract_bytes_in', len(response.content))
                 
                 # Parse HTML
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -170,6 +230,7 @@ class BaseExtractor(ABC):
                 
                 # Clean content
                 cleaned_content = self._clean_content(markdown_content)
+                self.logger.increment_counter('extract_bytes_out', len(cleaned_content.encode('utf-8')))
                 
                 # Discover additional links if applicable
                 discovered_links = self._discover_links(soup, url)
@@ -181,19 +242,50 @@ class BaseExtractor(ABC):
                     content=cleaned_content,
                     metadata=metadata,
                     success=True,
-                    discovered_links=discovered_links
+                    discovered_links=discovered_links,
+                    status_code=response.status_code,
+                    http_validators=http_validators
                 )
                 
             except Exception as e:
                 self.logger.error(f"Failed to scrape URL: {url}", error=e, url=url)
+                status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+                # A page that is only temporarily unreachable keeps the links it
+                # had on the previous run; 404/410 mean it (and its links) are gone
+                discovered_links = set()
+                if status_code not in (404, 410):
+                    previous = self.previous_validators.get(url) or {}
+                    discovered_links = set(previous.get('discovered_links') or [])
                 return ScrapingResult(
                     url=url,
                     content="",
                     metadata={'url': url, 'scraped_at': time.time()},
                     success=False,
-                    error_message=str(e)
+                    error_message=str(e),
+                    discovered_links=discovered_links,
+                    status_code=status_code
                 )
     
+    def _not_modified_result(self, url: str) -> ScrapingResult:
+        """Build the result for a 304 response, reusing what the previous run recorded."""
+        previous = self.previous_validators.get(url) or {}
+        self._processed_urls.add(url)
+        self.logger.increment_counter('http_not_modified')
+        
+        return ScrapingResult(
+            url=url,
+            content="",
+            metadata={'url': url, 'scraped_at': time.time()},
+            success=True,
+            discovered_links=set(previous.get('discovered_links') or []),
+            status_code=304,
+            http_validators={
+                'etag': previous.get('etag'),
+                'last_modified': previous.get('last_modified')
+            },
+            not_modified=True
+        )
+    
     def _remove_unwanted_elements(self, soup: BeautifulSoup) -> None:
         """Remove unwanted HTML elements."""
         # Remove script, style, navigation elements
@@ -212,10 +304,14 @@ class BaseExtractor(ABC):
         pass
     
     @abstractmethod
-    def extract_multiple_urls(self, urls: List[str]) -> List[ScrapingResult]:
-        """Extract content from multiple URLs. To be implemented by subclasses."""
+    def iter_multiple_urls(self, urls: List[str]) -> Iterator[ScrapingResult]:
+        """Yield extraction results one URL at a time. To be implemented by subclasses."""
         pass
     
+    def extract_multiple_urls(self, urls: List[str]) -> List[ScrapingResult]:
+        """Extract content from multiple URLs."""
+        return list(self.iter_multiple_urls(urls))
+    
     def save_result(self, result: ScrapingResult, output_dir: str) -> Optional[Path]:
         """Save scraping result to file."""
         if not result.success or not result.content.strip():
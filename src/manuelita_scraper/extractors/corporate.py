@@ -4,7 +4,7 @@ Corporate Content Extractor
 Specialized extractor for Manuelita corporate pages.
 """
 
-from typing import List, Set
+from typing import Iterator, List, Set
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
@@ -43,9 +43,9 @@ class CorporateExtractor(BaseExtractor):
         
         return discovered
     
-    def extract_multiple_urls(self, urls: List[str]) -> List[ScrapingResult]:
-        """Extract content from multiple corporate URLs."""
-        results = []
+    def iter_multiple_urls(self, urls: List[str]) -> Iterator[ScrapingResult]:
+        """Extract content from multiple corporate URLs, yielding each result as it completes."""
+        successful = 0
         
         self.logger.info(f"Starting extraction of {len(urls)} corporate URLs")
         
@@ -53,18 +53,18 @@ class CorporateExtractor(BaseExtractor):
             self.logger.info(f"Processing corporate URL {i}/{len(urls)}", url=url)
             
             result = self.extract_single_url(url)
-            results.append(result)
             
             if result.success:
+                successful += 1
                 self.logger.increment_counter('corporate_pages_extracted')
             else:
                 self.logger.increment_counter('corporate_pages_failed')
+            
+            yield result
         
         self.logger.info(f"Completed corporate extraction", 
                         total_urls=len(urls), 
-                        successful=sum(1 for r in results if r.success))
-        
-        return results
+                        successful=successful)
     
     def extract_and_save(self, urls: List[str], output_dir: str) -> List[str]:
         """
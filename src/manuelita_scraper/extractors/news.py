@@ -4,7 +4,7 @@ News Content Extractor
 Specialized extractor for Manuelita news pages with automatic link discovery.
 """
 
-from typing import List, Set
+from typing import Iterator, List, Set
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
@@ -58,10 +58,16 @@ class NewsExtractor(BaseExtractor):
             
         return False
     
-    def extract_multiple_urls(self, urls: List[str]) -> List[ScrapingResult]:
-        """Extract content from multiple news URLs with two-phase processing."""
-        results = []
+    def iter_multiple_urls(self, urls: List[str]) -> Iterator[ScrapingResult]:
+        """
+        Extract content from multiple news URLs with two-phase processing.
+        
+        Base pages are yielded as soon as they are fetched; discovered articles
+        follow once phase 1 has finished collecting their links.
+        """
         all_discovered_links = set()
+        total_results = 0
+        total_successful = 0
         
         self.logger.info(f"Starting Phase 1: Extracting {len(urls)} base news URLs")
         
@@ -70,14 +76,19 @@ class NewsExtractor(BaseExtractor):
             self.logger.info(f"Processing base news URL {i}/{len(urls)}", url=url)
             
             result = self.extract_single_url(url)
-            results.append(result)
+            total_results += 1
             
             if result.success:
                 # Collect discovered links
                 all_discovered_links.update(result.discovered_links)
+                total_successful += 1
                 self.logger.increment_counter('news_base_pages_extracted')
             else:
+                # Links carried over from the previous run, if the failure was transient
+                all_discovered_links.update(result.discovered_links)
                 self.logger.increment_counter('news_base_pages_failed')
+            
+            yield result
         
         self.logger.info(f"Phase 1 completed. Discovered {len(all_discovered_links)} article links")
         
@@ -92,21 +103,21 @@ class NewsExtractor(BaseExtractor):
                 self.logger.info(f"Processing article {i}/{len(all_discovered_links)}", url=article_url)
                 
                 result = self.extract_single_url(article_url)
-                results.append(result)
+                total_results += 1
                 
                 if result.success:
+                    total_successful += 1
                     self.logger.increment_counter('news_articles_extracted')
                 else:
                     self.logger.increment_counter('news_articles_failed')
+                
+                yield result
         
-        total_successful = sum(1 for r in results if r.success)
         self.logger.info(f"News extraction completed", 
-                        total_urls=len(results), 
+                        total_urls=total_results, 
                         base_urls=len(urls),
                         discovered_articles=len(all_discovered_links),
                         successful=total_successful)
-        
-        return results
     
     def extract_and_save_with_discovery(self, base_urls: List[str], output_dir: str, 
                                       links_file: str = "discovered_news_links.json") -> tuple[List[str], Set[str]]:
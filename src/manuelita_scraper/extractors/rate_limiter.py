@@ -0,0 +1,48 @@
+"""
+Per-host Request Rate Limiting
+
+This module provides a thread-safe politeness limiter that spaces out
+requests to the same host, so extractors running in parallel never
+exceed the configured request delay for any single site.
+"""
+
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """Thread-safe limiter enforcing a minimum delay between requests to the same host."""
+
+    def __init__(self, request_delay: float):
+        self.request_delay = request_delay
+        self._lock = threading.Lock()
+        self._next_allowed: Dict[str, float] = {}
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """Normalize a URL to its host, treating www.example.com and example.com as one host."""
+        return urlparse(url).netloc.lower().replace('www.', '')
+
+    def wait(self, url: str) -> float:
+        """
+        Block until a request to the URL's host is allowed.
+
+        The slot is reserved under the lock before sleeping, so concurrent
+        callers for the same host queue up one delay apart.
+
+        Returns:
+            Seconds spent waiting
+        """
+        host = self._host_key(url)
+
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = scheduled + self.request_delay
+
+        wait_time = scheduled - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
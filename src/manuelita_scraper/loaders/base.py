@@ -5,9 +5,10 @@ This module provides base classes for data loading (storage) operations.
 """
 
 import json
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
@@ -50,6 +51,11 @@ class BaseLoader(ABC):
         self.logger = get_logger()
         self.base_directory = Path(output_config.get('base_directory', 'data/processed'))
         self.include_metadata = output_config.get('include_metadata', True)
+        # Metadata entries written so far per output directory. Pipelines running
+        # concurrently share the loader, so writes to the same index are merged
+        # under a lock instead of the last writer dropping the other's entries.
+        self._metadata_lock = threading.Lock()
+        self._metadata_entries: Dict[Path, Dict[str, Dict[str, Any]]] = {}
     
     def _create_output_directory(self, directory: Path) -> bool:
         """Create output directory if it doesn't exist."""
@@ -77,32 +83,56 @@ class BaseLoader(ABC):
         
         return f"{domain}_{path}{extension}"
     
-    def _create_metadata_file(self, items: List[ContentItem], output_dir: Path) -> Optional[Path]:
-        """Create a metadata index file."""
+    def _build_metadata_entry(self, item: ContentItem) -> Dict[str, Any]:
+        """Build the metadata index entry for a single content item."""
+        return {
+            'source_url': item.source_url,
+            'content_type': item.content_type,
+            'timestamp': item.timestamp,
+            'filename': self._generate_filename(item),
+            'metadata': item.metadata
+        }
+    
+    def _write_metadata_index(self, entries: List[Dict[str, Any]], output_dir: Path,
+                              removed_urls: Iterable[str] = (),
+                              merge_existing: bool = False) -> Optional[Path]:
+        """
+        Write a metadata index file from prebuilt entries.
+        
+        Entries this loader already wrote to the same directory are kept, so
+        pipelines sharing a subdirectory (e.g. foundation pages reached from
+        both the corporate and news targets) end up in one index. With
+        ``merge_existing`` the index already on disk is merged in as well,
+        for incremental runs that only touch the documents that changed.
+        """
         if not self.include_metadata:
             return None
         
         metadata_file = output_dir / "metadata.json"
         
         try:
-            metadata_index = {
-                'created_at': datetime.utcnow().isoformat(),
-                'total_items': len(items),
-                'items': []
-            }
-            
-            for item in items:
-                item_metadata = {
-                    'source_url': item.source_url,
-                    'content_type': item.content_type,
-                    'timestamp': item.timestamp,
-                    'filename': self._generate_filename(item),
-                    'metadata': item.metadata
+            with self._metadata_lock:
+                key = output_dir.resolve()
+                if merge_existing and key not in self._metadata_entries and metadata_file.exists():
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        existing = json.load(f)
+                    self._metadata_entries[key] = {
+                        entry['source_url']: entry for entry in existing.get('items', [])
+                    }
+                written = self._metadata_entries.setdefault(key, {})
+                written.update((entry['source_url'], entry) for entry in entries)
+                for url in removed_urls:
+                    written.pop(url, None)
+                metadata_index = {
+                    'created_at': datetime.utcnow().isoformat(),
+                    'total_items': len(written),
+                    'items': list(written.values())
                 }
-                metadata_index['items'].append(item_metadata)
-            
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata_index, f, indent=2, ensure_ascii=False)
+                
+                tmp_file = metadata_file.with_suffix('.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(metadata_index, f, indent=2, ensure_ascii=False)
+                tmp_file.replace(metadata_file)
             
             self.logger.info(f"Created metadata file", metadata_file=str(metadata_file))
             return metadata_file
@@ -111,6 +141,20 @@ class BaseLoader(ABC):
             self.logger.error("Failed to create metadata file", error=e)
             return None
     
+    def _create_metadata_file(self, items: List[ContentItem], output_dir: Path) -> Optional[Path]:
+        """Create a metadata index file."""
+        if not self.include_metadata:
+            return None
+        
+        entries = [self._build_metadata_entry(item) for item in items]
+        return self._write_metadata_index(entries, output_dir)
+    
+    def update_metadata_index(self, output_dir: Path, items: Iterable[ContentItem] = (),
+                              removed_urls: Iterable[str] = ()) -> Optional[Path]:
+        """Merge loaded items into, and drop removed URLs from, an existing metadata index."""
+        entries = [self._build_metadata_entry(item) for item in items]
+        return self._write_metadata_index(entries, output_dir, removed_urls, merge_existing=True)
+    
     @abstractmethod
     def load_item(self, item: ContentItem, output_dir: Optional[Path] = None) -> LoadResult:
         """Load a single content item. To be implemented by subclasses."""
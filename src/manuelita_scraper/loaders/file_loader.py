@@ -5,7 +5,9 @@ Handles saving content to organized file structures on disk.
 """
 
 import json
-from typing import List, Optional, Dict
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
 from pathlib import Path
 
 from .base import BaseLoader, ContentItem, LoadResult
@@ -77,6 +79,12 @@ class FileLoader(BaseLoader):
     
     def load_item(self, item: ContentItem, output_dir: Optional[Path] = None) -> LoadResult:
         """Load a single content item to file."""
+        with self.logger.profiled('load_item'):
+            return self._load_item(item, output_dir)
+    
+    def _load_item(self, item: ContentItem, output_dir: Optional[Path]) -> LoadResult:
+        """Write a single content item, recording load metrics."""
+        start_time = time.perf_counter()
         try:
             # Determine output directory
             if output_dir is None:
@@ -105,7 +113,11 @@ class FileLoader(BaseLoader):
                            output_path=str(output_path),
                            format=self.file_format)
             
+            size_bytes = len(formatted_content.encode('utf-8'))
             self.logger.increment_counter('items_saved')
+            self.logger.increment_counter('load_bytes_in', len(item.content.encode('utf-8')))
+            self.logger.increment_counter('load_bytes_out', size_bytes)
+            self.logger.record_timing('load_item', time.perf_counter() - start_time)
             
             return LoadResult(
                 success=True,
@@ -113,7 +125,7 @@ class FileLoader(BaseLoader):
                 metadata={
                     'filename': filename,
                     'format': self.file_format,
-                    'size_bytes': len(formatted_content.encode('utf-8'))
+                    'size_bytes': size_bytes
                 }
             )
             
@@ -170,6 +182,17 @@ class FileLoader(BaseLoader):
         
         return results
     
+    def _organization_key(self, item: ContentItem) -> str:
+        """Determine the organized subdirectory (news, foundation, corporate) for an item."""
+        domain = urlparse(item.source_url).netloc.replace('www.', '')
+        
+        # Create subdirectories based on content characteristics
+        if '/noticias/' in item.source_url or '/manuelita-noticias/' in item.source_url:
+            return 'news'
+        elif 'fundacionmanuelita' in domain:
+            return 'foundation'
+        return 'corporate'
+    
     def create_organized_structure(self, items: List[ContentItem], base_output_dir: Optional[Path] = None) -> Dict[str, List[LoadResult]]:
         """
         Create an organized directory structure based on content types.
@@ -183,17 +206,7 @@ class FileLoader(BaseLoader):
         # Group items by content type or source domain
         organized_items = {}
         for item in items:
-            # Determine organization key (could be content type, domain, etc.)
-            from urllib.parse import urlparse
-            domain = urlparse(item.source_url).netloc.replace('www.', '')
-            
-            # Create subdirectories based on content characteristics
-            if '/noticias/' in item.source_url or '/manuelita-noticias/' in item.source_url:
-                key = 'news'
-            elif 'fundacionmanuelita' in domain:
-                key = 'foundation'
-            else:
-                key = 'corporate'
+            key = self._organization_key(item)
             
             if key not in organized_items:
                 organized_items[key] = []
@@ -211,4 +224,47 @@ class FileLoader(BaseLoader):
                            item_count=len(type_items),
                            output_dir=str(type_output_dir))
         
-        return all_results
\ No newline at end of file
+        return all_results
+    
+    def load_organized_item(self, item: ContentItem, base_output_dir: Optional[Path] = None) -> LoadResult:
+        """Load a single item into its organized subdirectory (news, foundation, corporate)."""
+        if base_output_dir is None:
+            base_output_dir = self.base_directory
+        
+        return self.load_item(item, base_output_dir / self._organization_key(item))
+    
+    def load_stream(self, items: Iterable[ContentItem], 
+                    base_output_dir: Optional[Path] = None) -> Iterator[LoadResult]:
+        """
+        Load items into the organized structure as they arrive.
+        
+        Each item is written as soon as it is received, so only the small
+        metadata index entries are kept in memory. The per-directory
+        ``metadata.json`` files are written once the stream is exhausted.
+        
+        Yields:
+            LoadResult for each item, in input order
+        """
+        if base_output_dir is None:
+            base_output_dir = self.base_directory
+        
+        metadata_entries: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for item in items:
+            key = self._organization_key(item)
+            
+            result = self.load_organized_item(item, base_output_dir)
+            if result.success:
+                self.logger.increment_counter('stream_items_success')
+            else:
+                self.logger.increment_counter('stream_items_failed')
+            
+            metadata_entries.setdefault(key, []).append(self._build_metadata_entry(item))
+            yield result
+        
+        for content_type, entries in metadata_entries.items():
+            self._write_metadata_index(entries, base_output_dir / content_type)
+            self.logger.info(f"Streaming loading completed for {content_type}",
+                           content_type=content_type,
+                           item_count=len(entries),
+                           output_dir=str(base_output_dir / content_type))
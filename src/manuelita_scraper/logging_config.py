@@ -5,36 +5,134 @@ This module provides structured logging and basic monitoring capabilities
 for the Manuelita scraper pipeline.
 """
 
+import atexit
+import copy
 import logging
+import math
+import queue
+import random
 import structlog
+import sys
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Any, Optional, TextIO
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 
 from .config import LoggingConfig, MonitoringConfig
 
 
+@dataclass
+class TimingHistogram:
+    """
+    Fixed-memory streaming histogram for durations.
+    
+    Durations are counted in logarithmically spaced buckets (each bucket is
+    ``growth`` times wider than the previous one), so memory is bounded by the
+    number of buckets no matter how many values are recorded, and percentiles
+    are accurate to within half a bucket (~2.5% relative error by default).
+    Count, total, min and max are tracked exactly.
+    """
+    
+    min_value: float = 1e-6
+    max_value: float = 1e4
+    growth: float = 1.05
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+    buckets: Dict[int, int] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        self._log_growth = math.log(self.growth)
+        self._max_index = self._bucket_index(self.max_value)
+    
+    def _bucket_index(self, value: float) -> int:
+        """Map a value to its bucket; values below min_value share bucket 0."""
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_growth) + 1
+    
+    def _bucket_value(self, index: int) -> float:
+        """Representative (geometric midpoint) value of a bucket."""
+        if index == 0:
+            return self.min_value
+        lower = self.min_value * self.growth ** (index - 1)
+        return lower * math.sqrt(self.growth)
+    
+    def record(self, value: float) -> None:
+        """Record a single duration."""
+        index = min(self._bucket_index(value), self._max_index)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def percentile(self, quantile: float) -> float:
+        """Estimate the value at a quantile (0-1), clamped to the observed min/max."""
+        if not self.count:
+            return 0.0
+        
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+    
+    def cumulative_count(self, upper_bound: float) -> int:
+        """Count values at or below an upper bound, at bucket resolution."""
+        limit = self._bucket_index(upper_bound)
+        return sum(count for index, count in self.buckets.items() if index <= limit)
+    
+    def summary(self) -> Dict[str, float]:
+        """Summarize the histogram."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'average': self.total / self.count,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99)
+        }
+
+
 @dataclass
 class MetricsCollector:
-    """Collects and stores metrics for monitoring."""
+    """Collects and stores metrics for monitoring in bounded memory."""
     
     start_time: float = field(default_factory=time.time)
     counters: Dict[str, int] = field(default_factory=dict)
-    timings: Dict[str, list[float]] = field(default_factory=dict)
-    errors: list[Dict[str, Any]] = field(default_factory=list)
+    timings: Dict[str, TimingHistogram] = field(default_factory=dict)
+    max_errors: int = 100
+    errors: Deque[Dict[str, Any]] = field(default=None)
+    error_count: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Ring buffer: only the most recent errors are kept, the total is counted
+        self.errors = deque(self.errors or (), maxlen=self.max_errors)
     
     def increment_counter(self, name: str, value: int = 1) -> None:
         """Increment a counter metric."""
-        self.counters[name] = self.counters.get(name, 0) + value
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
     
     def record_timing(self, name: str, duration: float) -> None:
         """Record a timing metric."""
-        if name not in self.timings:
-            self.timings[name] = []
-        self.timings[name].append(duration)
+        with self._lock:
+            histogram = self.timings.get(name)
+            if histogram is None:
+                histogram = self.timings[name] = TimingHistogram()
+            histogram.record(duration)
     
     def record_error(self, error_type: str, message: str, context: Optional[Dict[str, Any]] = None) -> None:
         """Record an error for monitoring."""
@@ -44,33 +142,193 @@ class MetricsCollector:
             'message': message,
             'context': context or {}
         }
-        self.errors.append(error_data)
+        with self._lock:
+            self.errors.append(error_data)
+            self.error_count += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of the raw counters, histograms and error count."""
+        with self._lock:
+            return {
+                'start_time': self.start_time,
+                'counters': self.counters.copy(),
+                'timings': {name: copy.deepcopy(histogram) for name, histogram in self.timings.items()},
+                'error_count': self.error_count
+            }
     
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of all collected metrics."""
         current_time = time.time()
         duration = current_time - self.start_time
         
-        timing_summaries = {}
-        for name, times in self.timings.items():
-            if times:
-                timing_summaries[name] = {
-                    'count': len(times),
-                    'total': sum(times),
-                    'average': sum(times) / len(times),
-                    'min': min(times),
-                    'max': max(times)
-                }
+        with self._lock:
+            counters = self.counters.copy()
+            timing_summaries = {
+                name: histogram.summary()
+                for name, histogram in self.timings.items()
+                if histogram.count
+            }
+            error_count = self.error_count
+            recent_errors = list(self.errors)[-10:]  # Last 10 errors
         
         return {
             'total_duration': duration,
-            'counters': self.counters.copy(),
+            'counters': counters,
             'timings': timing_summaries,
-            'error_count': len(self.errors),
-            'errors': self.errors[-10:] if self.errors else []  # Last 10 errors
+            'error_count': error_count,
+            'errors': recent_errors
         }
 
 
+class AsyncLogWriter:
+    """
+    Background log sink fed by a bounded queue.
+    
+    Callers only enqueue the event dict; rendering and writing happen on a
+    daemon thread that drains the queue in batches and issues one write and
+    flush per batch. When the queue is full, events are dropped and counted
+    instead of blocking the caller. Pending events are flushed at exit.
+    
+    One writer lives for the whole process: structlog caches loggers on first
+    use, so reconfiguration swaps the writer's settings with configure()
+    instead of replacing it. Events submitted after close() are written
+    synchronously rather than lost.
+    """
+    
+    _SENTINEL = object()
+    
+    def __init__(self, renderer: Callable, stream: Optional[TextIO] = None,
+                 queue_size: int = 10000, batch_size: int = 256, flush_interval: float = 0.5):
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = True
+        self.configure(renderer, stream, queue_size, batch_size, flush_interval)
+        self.start()
+    
+    def configure(self, renderer: Callable, stream: Optional[TextIO] = None,
+                  queue_size: int = 10000, batch_size: int = 256, flush_interval: float = 0.5) -> None:
+        """Replace the renderer, stream and batching settings; queued events use the new ones."""
+        self.renderer = renderer
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        with self._queue.mutex:
+            self._queue.maxsize = queue_size
+    
+    def start(self) -> None:
+        """Start the writer thread if it isn't running (again, after close())."""
+        with self._lock:
+            if not self._closed:
+                return
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="async-log-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, method_name: str, event_dict: Dict[str, Any]) -> None:
+        """Enqueue an event without blocking."""
+        with self._lock:
+            if not self._closed:
+                try:
+                    self._queue.put_nowait((method_name, event_dict))
+                except queue.Full:
+                    self.dropped += 1
+                return
+        self._write_batch([(method_name, event_dict)])
+    
+    def _run(self) -> None:
+        """Drain the queue in batches until the sentinel is received."""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+    
+    def _write_batch(self, batch: list) -> bool:
+        """Render and write a batch; return True if the sentinel was part of it."""
+        lines = []
+        stop = False
+        for item in batch:
+            if item is self._SENTINEL:
+                stop = True
+                continue
+            method_name, event_dict = item
+            try:
+                lines.append(self.renderer(None, method_name, event_dict))
+            except Exception as e:
+                lines.append(f"log rendering failed: {type(e).__name__}: {e} ({event_dict!r})")
+        
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except Exception:
+                # The sink must never take the pipeline down
+                pass
+        return stop
+    
+    def flush(self) -> None:
+        """Block until every queued event has been written."""
+        if not self._closed:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Write every queued event, then stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            # Events submitted from now on are written inline, so the
+            # sentinel is the last item the thread will ever see
+            self._closed = True
+        self._queue.put(self._SENTINEL)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+
+class _QueueLogger:
+    """structlog logger that hands deferred event dicts to the process-wide AsyncLogWriter."""
+    
+    def msg(self, method_name: str, event_dict: Dict[str, Any]) -> None:
+        _async_writer.submit(method_name, event_dict)
+    
+    log = debug = info = warn = warning = error = err = critical = exception = fatal = msg
+
+
+def _defer_rendering(logger, method_name: str, event_dict: Dict[str, Any]):
+    """Final processor for the async sink: pass the event dict through unrendered."""
+    return (method_name, event_dict), {}
+
+
+def _make_sampler(sample_rates: Dict[str, float]) -> Callable:
+    """Build a processor that keeps only a fraction of debug/info events."""
+    def sample_events(logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        rate = sample_rates.get(method_name)
+        if rate is not None and rate < 1.0 and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+    return sample_events
+
+
+# Process-wide writer of the async sink, created on first use and reconfigured
+# in place so that loggers cached by structlog never point at a stopped writer
+_async_writer: Optional[AsyncLogWriter] = None
+
+
 class StructuredLogger:
     """Structured logger with monitoring integration."""
     
@@ -78,6 +336,8 @@ class StructuredLogger:
         self.logging_config = logging_config
         self.monitoring_config = monitoring_config
         self.metrics = MetricsCollector() if monitoring_config.metrics_enabled else None
+        # Optional StageProfiler attached by the CLI --profile option
+        self.profiler = None
         
         # Configure structlog
         self._configure_logging()
@@ -98,18 +358,43 @@ class StructuredLogger:
         )
         
         # Configure structlog processors based on format
-        processors = [
+        processors = []
+        if self.logging_config.sample_rates:
+            # Sample first so dropped events skip the remaining processors
+            processors.append(_make_sampler(self.logging_config.sample_rates))
+        processors.extend([
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-        ]
+        ])
         
         if self.logging_config.format == "json":
-            processors.append(structlog.processors.JSONRenderer())
+            renderer = structlog.processors.JSONRenderer()
         else:
-            processors.extend([
-                structlog.dev.ConsoleRenderer(colors=True),
-            ])
+            renderer = structlog.dev.ConsoleRenderer(colors=True)
+        
+        global _async_writer
+        if self.logging_config.async_sink:
+            # Render and write on a background thread; the caller only enqueues
+            writer_settings = dict(
+                queue_size=self.logging_config.queue_size,
+                batch_size=self.logging_config.batch_size,
+                flush_interval=self.logging_config.flush_interval
+            )
+            if _async_writer is None:
+                _async_writer = AsyncLogWriter(renderer, **writer_settings)
+            else:
+                _async_writer.configure(renderer, **writer_settings)
+                _async_writer.start()
+            processors.append(_defer_rendering)
+            logger_factory = lambda *args: _QueueLogger()
+        else:
+            if _async_writer is not None:
+                # Loggers cached while the sink was enabled keep submitting to it
+                _async_writer.flush()
+
+            processors.append(renderer)
+            logger_factory = structlog.WriteLoggerFactory()
         
         # Configure structlog
         structlog.configure(
@@ -117,7 +402,7 @@ class StructuredLogger:
             wrapper_class=structlog.make_filtering_bound_logger(
                 getattr(logging, self.logging_config.level)
             ),
-            logger_factory=structlog.WriteLoggerFactory(),
+            logger_factory=logger_factory,
             cache_logger_on_first_use=True,
         )
     
@@ -190,6 +475,16 @@ class StructuredLogger:
             self.metrics.record_error(error_type, message, kwargs)
             self.metrics.increment_counter('critical_errors')
     
+    def set_profiler(self, profiler) -> None:
+        """Attach (or detach with None) a StageProfiler to timed operations."""
+        self.profiler = profiler
+    
+    def profiled(self, operation_name: str):
+        """Context manager profiling an operation when a profiler is attached."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.operation(operation_name)
+    
     @contextmanager
     def timed_operation(self, operation_name: str, **context):
         """Context manager to time operations and log performance."""
@@ -198,7 +493,8 @@ class StructuredLogger:
         
         try:
             bound_logger.info(f"Starting {operation_name}")
-            yield bound_logger
+            with self.profiled(operation_name):
+                yield bound_logger
             
         except Exception as e:
             duration = time.time() - start_time
@@ -228,12 +524,30 @@ class StructuredLogger:
         if self.metrics and self.monitoring_config.metrics_enabled:
             self.metrics.increment_counter(counter_name, value)
     
+    def record_timing(self, operation_name: str, duration: float) -> None:
+        """Record a timing without emitting log events (for high-frequency operations)."""
+        if self.metrics and self.monitoring_config.performance_tracking:
+            self.metrics.record_timing(operation_name, duration)
+    
     def get_metrics_summary(self) -> Optional[Dict[str, Any]]:
         """Get a summary of collected metrics."""
         if self.metrics:
-            return self.metrics.get_summary()
+            summary = self.metrics.get_summary()
+            if _async_writer is not None:
+                summary['log_events_dropped'] = _async_writer.dropped
+            return summary
         return None
     
+    def flush(self) -> None:
+        """Block until all log events queued on the async sink have been written."""
+        if _async_writer is not None:
+            _async_writer.flush()
+    
+    def close(self) -> None:
+        """Drain and stop the async sink, if one is configured; later events are written inline."""
+        if _async_writer is not None:
+            _async_writer.close()
+    
     def log_metrics_summary(self) -> None:
         """Log a summary of collected metrics."""
         if self.metrics:
@@ -0,0 +1,172 @@
+"""
+Change Manifest Module
+
+This module persists what the pipeline last produced for every URL
+(HTTP validators, raw and cleaned content hashes, output path) so that
+incremental runs only re-transform and re-load what changed upstream,
+and emits machine-readable changesets for downstream indexers.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .logging_config import get_logger
+
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    """Return a stable SHA-256 hex digest for a piece of content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """What the pipeline last produced for a single URL."""
+    url: str
+    pipeline_type: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    cleaned_hash: Optional[str] = None
+    output_path: Optional[str] = None
+    discovered_links: List[str] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+    def validators(self) -> Dict[str, Any]:
+        """Return the HTTP validators and discovered links used for conditional requests."""
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'discovered_links': self.discovered_links,
+        }
+
+
+@dataclass
+class Changeset:
+    """Documents added, updated and removed by an incremental run."""
+    pipeline_type: str
+    generated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged_count: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any document was added, updated or removed."""
+        return bool(self.added or self.updated or self.removed)
+
+    def record(self, change_type: str, entry: ManifestEntry) -> None:
+        """Record a change for a manifest entry."""
+        getattr(self, change_type).append({
+            'url': entry.url,
+            'output_path': entry.output_path,
+            'cleaned_hash': entry.cleaned_hash,
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the changeset to a JSON-serializable dict."""
+        return asdict(self)
+
+    def save(self, output_dir: Path) -> Path:
+        """Write the changeset to a timestamped JSON file and return its path."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        changeset_file = output_dir / f"changeset_{self.pipeline_type}_{stamp}.json"
+
+        with open(changeset_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+        return changeset_file
+
+
+class ChangeManifest:
+    """Persisted URL → validators → hashes → output path manifest."""
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.logger = get_logger()
+        self.entries: Dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> "ChangeManifest":
+        """Load a manifest from disk, starting empty if it doesn't exist or is unreadable."""
+        manifest = cls(manifest_path)
+
+        if not manifest.manifest_path.exists():
+            return manifest
+
+        try:
+            with open(manifest.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != MANIFEST_VERSION:
+                manifest.logger.warning("Ignoring manifest with unsupported version",
+                                        manifest_path=str(manifest.manifest_path),
+                                        version=data.get('version'))
+                return manifest
+
+            for url, entry_data in data.get('entries', {}).items():
+                manifest.entries[url] = ManifestEntry(**entry_data)
+
+        except Exception as e:
+            manifest.logger.error("Failed to load change manifest", error=e,
+                                  manifest_path=str(manifest.manifest_path))
+            manifest.entries = {}
+
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'saved_at': datetime.utcnow().isoformat(),
+            'entries': {url: asdict(entry) for url, entry in sorted(self.entries.items())},
+        }
+
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+
+    def get(self, url: str) -> Optional[ManifestEntry]:
+        """Get the entry for a URL, if any."""
+        return self.entries.get(url)
+
+    def put(self, entry: ManifestEntry) -> None:
+        """Insert or replace the entry for a URL."""
+        entry.updated_at = time.time()
+        self.entries[entry.url] = entry
+
+    def remove(self, url: str) -> Optional[ManifestEntry]:
+        """Remove and return the entry for a URL."""
+        return self.entries.pop(url, None)
+
+    def entries_for(self, pipeline_type: str) -> List[ManifestEntry]:
+        """Get all entries produced by a given pipeline type."""
+        return [entry for entry in self.entries.values() if entry.pipeline_type == pipeline_type]
+
+    def validators_for(self, pipeline_type: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Map URL → previous-run state for the extractor of a pipeline type.
+        
+        HTTP validators are only included while the previous output is still
+        on disk, so a missing file is re-fetched unconditionally. Discovered
+        links are always included so that a transient failure of a listing
+        page doesn't orphan the pages it linked to.
+        """
+        validators = {}
+        for entry in self.entries_for(pipeline_type):
+            if entry.output_path and Path(entry.output_path).exists():
+                validators[entry.url] = entry.validators()
+            else:
+                validators[entry.url] = {'discovered_links': entry.discovered_links}
+        return validators
@@ -0,0 +1,175 @@
+"""
+Prometheus Metrics Exporter Module
+
+This module renders the counters and timing histograms collected by
+StructuredLogger in the Prometheus text exposition format, either as a
+file for the node-exporter textfile collector or from a small local HTTP
+endpoint that can be scraped during long crawls.
+"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .logging_config import MetricsCollector
+
+
+METRIC_PREFIX = "manuelita_scraper"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds in seconds, covering sub-millisecond
+# transforms up to slow page downloads and whole pipeline runs
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _sanitize(name: str) -> str:
+    """Turn an internal metric name into a valid Prometheus metric name."""
+    name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    return re.sub(r'_+', '_', name).strip('_').lower()
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(metrics: MetricsCollector, prefix: str = METRIC_PREFIX,
+                      buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> str:
+    """
+    Render collected metrics in Prometheus text format.
+
+    Counters become ``<prefix>_<name>_total`` counters; timings become a
+    single ``<prefix>_operation_duration_seconds`` histogram labelled by
+    operation.
+    """
+    snapshot = metrics.snapshot()
+    counters = snapshot['counters']
+    error_count = snapshot['error_count']
+    histograms = {
+        name: (histogram.count, histogram.total,
+               [histogram.cumulative_count(bound) for bound in buckets])
+        for name, histogram in snapshot['timings'].items()
+        if histogram.count
+    }
+
+    lines: List[str] = []
+
+    uptime_name = f"{prefix}_uptime_seconds"
+    lines.append(f"# HELP {uptime_name} Seconds since metrics collection started.")
+    lines.append(f"# TYPE {uptime_name} gauge")
+    lines.append(f"{uptime_name} {_format_value(time.time() - snapshot['start_time'])}")
+
+    errors_name = f"{prefix}_recorded_errors_total"
+    lines.append(f"# HELP {errors_name} Errors recorded by the structured logger.")
+    lines.append(f"# TYPE {errors_name} counter")
+    lines.append(f"{errors_name} {error_count}")
+
+    for name in sorted(counters):
+        metric_name = f"{prefix}_{_sanitize(name)}_total"
+        lines.append(f"# HELP {metric_name} Counter '{name}'.")
+        lines.append(f"# TYPE {metric_name} counter")
+        lines.append(f"{metric_name} {counters[name]}")
+
+    if histograms:
+        histogram_name = f"{prefix}_operation_duration_seconds"
+        lines.append(f"# HELP {histogram_name} Duration of timed operations.")
+        lines.append(f"# TYPE {histogram_name} histogram")
+        for name in sorted(histograms):
+            count, total, cumulative = histograms[name]
+            label = f'operation="{_escape_label(name)}"'
+            for bound, bucket_count in zip(buckets, cumulative):
+                lines.append(f'{histogram_name}_bucket{{{label},le="{bound}"}} {min(bucket_count, count)}')
+            lines.append(f'{histogram_name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{histogram_name}_sum{{{label}}} {_format_value(total)}")
+            lines.append(f"{histogram_name}_count{{{label}}} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(metrics: MetricsCollector, path: str, prefix: str = METRIC_PREFIX) -> Path:
+    """
+    Write metrics to a ``.prom`` file for the node-exporter textfile collector.
+
+    The file is written to a temporary name and renamed, so the collector
+    never reads a partially written file.
+    """
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus(metrics, prefix))
+    tmp_path.replace(output_path)
+
+    return output_path
+
+
+class MetricsServer:
+    """Local HTTP endpoint serving ``/metrics`` from a background thread."""
+
+    def __init__(self, metrics: MetricsCollector, port: int, host: str = "127.0.0.1",
+                 prefix: str = METRIC_PREFIX):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _make_handler(self):
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+
+                body = render_prometheus(exporter.metrics, exporter.prefix).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes are frequent; keep them out of the pipeline logs
+                pass
+
+        return MetricsHandler
+
+    def start(self) -> "MetricsServer":
+        """Start serving in a daemon thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread to exit."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
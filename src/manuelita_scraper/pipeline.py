@@ -5,44 +5,62 @@ This module provides the main pipeline class that coordinates
 Extract → Transform → Load operations.
 """
 
-from typing import List, Dict, Any, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Optional, Set
 from pathlib import Path
 
 from .config import AppConfig, init_config
 from .logging_config import setup_logging_from_config, get_logger
-from .extractors.corporate import CorporateExtractor
-from .extractors.news import NewsExtractor
+from .extractors.rate_limiter import HostRateLimiter
+from .transformers.base import BaseTransformer
 from .transformers.corporate import CorporateTransformer
 from .transformers.news import NewsTransformer
 from .loaders.file_loader import FileLoader, ContentItem
+from .manifest import ChangeManifest, Changeset, ManifestEntry, content_hash
+from .run_report import build_run_manifest, write_run_manifest
+
+if TYPE_CHECKING:
+    # Extractors pull in requests, BeautifulSoup and html2text; they are
+    # imported when first used so status/config commands start quickly
+    from .extractors.base import BaseExtractor, ScrapingResult
+    from .extractors.corporate import CorporateExtractor
+    from .extractors.news import NewsExtractor
+    from .metrics_exporter import MetricsServer
 
 
 class ManuelitaPipeline:
     """Main pipeline orchestrator for Manuelita content scraping and processing."""
     
     def __init__(self, environment: str = "development"):
+        self.environment = environment
         self.config = init_config(environment)
         self.logger = setup_logging_from_config(environment)
         
+        # Shared politeness limiter so extractors never hit the same host concurrently
+        self.rate_limiter = HostRateLimiter(self.config.scraping.settings.request_delay)
+        
         # Initialize components
-        self._corporate_extractor: Optional[CorporateExtractor] = None
-        self._news_extractor: Optional[NewsExtractor] = None
+        self._corporate_extractor: Optional["CorporateExtractor"] = None
+        self._news_extractor: Optional["NewsExtractor"] = None
         self._corporate_transformer: Optional[CorporateTransformer] = None
         self._news_transformer: Optional[NewsTransformer] = None
         self._loader: Optional[FileLoader] = None
     
     @property
-    def corporate_extractor(self) -> CorporateExtractor:
+    def corporate_extractor(self) -> "CorporateExtractor":
         """Lazy initialization of corporate extractor."""
         if self._corporate_extractor is None:
-            self._corporate_extractor = CorporateExtractor(self.config.scraping)
+            from .extractors.corporate import CorporateExtractor
+            self._corporate_extractor = CorporateExtractor(self.config.scraping, self.rate_limiter)
         return self._corporate_extractor
     
     @property
-    def news_extractor(self) -> NewsExtractor:
+    def news_extractor(self) -> "NewsExtractor":
         """Lazy initialization of news extractor."""
         if self._news_extractor is None:
-            self._news_extractor = NewsExtractor(self.config.scraping)
+            from .extractors.news import NewsExtractor
+            self._news_extractor = NewsExtractor(self.config.scraping, self.rate_limiter)
         return self._news_extractor
     
     @property
@@ -71,6 +89,63 @@ class ManuelitaPipeline:
             self._loader = FileLoader(output_config)
         return self._loader
     
+    @property
+    def processed_directory(self) -> Path:
+        """Directory where loaded content is organized."""
+        return Path(self.config.scraping.output.base_directory) / "processed"
+    
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the persisted change manifest used by incremental runs."""
+        return Path(self.config.scraping.output.base_directory) / "manifest.json"
+    
+    @property
+    def changesets_directory(self) -> Path:
+        """Directory where incremental runs write their changesets."""
+        return Path(self.config.scraping.output.base_directory) / "changesets"
+    
+    @property
+    def runs_directory(self) -> Path:
+        """Directory where run manifests (and per-run artifacts) are stored."""
+        return Path(self.config.scraping.output.base_directory) / "runs"
+    
+    @staticmethod
+    def _to_pipeline_item(result: "ScrapingResult") -> Dict[str, Any]:
+        """Convert a scraping result to the dict format used between stages."""
+        return {
+            'url': result.url,
+            'content': result.content,
+            'metadata': result.metadata,
+            'discovered_links': result.discovered_links
+        }
+    
+    def _transform_item(self, item: Dict[str, Any], transformer: BaseTransformer) -> Optional[Dict[str, Any]]:
+        """Transform a single extracted item, returning None on failure."""
+        result = transformer.transform_content(item['content'])
+        
+        if not result.success:
+            self.logger.warning("Content transformation failed",
+                              url=item['url'],
+                              error=result.error_message)
+            return None
+        
+        return {
+            'url': item['url'],
+            'content': result.cleaned_content,
+            'metadata': item['metadata'],
+            'transformations_applied': result.transformations_applied
+        }
+    
+    @staticmethod
+    def _to_content_item(item: Dict[str, Any]) -> ContentItem:
+        """Convert a transformed item to a ContentItem for loading."""
+        return ContentItem(
+            content=item['content'],
+            metadata=item['metadata'],
+            source_url=item['url'],
+            content_type="markdown"
+        )
+    
     def extract_corporate_content(self) -> List[Dict[str, Any]]:
         """Extract corporate content from configured URLs."""
         self.logger.info("Starting corporate content extraction")
@@ -84,15 +159,7 @@ class ManuelitaPipeline:
             results = self.corporate_extractor.extract_multiple_urls(urls)
         
         # Convert to dict format for pipeline processing
-        extracted_data = []
-        for result in results:
-            if result.success:
-                extracted_data.append({
-                    'url': result.url,
-                    'content': result.content,
-                    'metadata': result.metadata,
-                    'discovered_links': result.discovered_links
-                })
+        extracted_data = [self._to_pipeline_item(result) for result in results if result.success]
         
         self.logger.info("Corporate extraction completed", 
                         total_extracted=len(extracted_data))
@@ -116,12 +183,7 @@ class ManuelitaPipeline:
         
         for result in results:
             if result.success:
-                extracted_data.append({
-                    'url': result.url,
-                    'content': result.content,
-                    'metadata': result.metadata,
-                    'discovered_links': result.discovered_links
-                })
+                extracted_data.append(self._to_pipeline_item(result))
                 all_discovered_links.update(result.discovered_links)
         
         # Save discovered links
@@ -142,19 +204,9 @@ class ManuelitaPipeline:
         
         with self.logger.timed_operation("corporate_transformation", item_count=len(extracted_data)):
             for item in extracted_data:
-                result = self.corporate_transformer.transform_content(item['content'])
-                
-                if result.success:
-                    transformed_data.append({
-                        'url': item['url'],
-                        'content': result.cleaned_content,
-                        'metadata': item['metadata'],
-                        'transformations_applied': result.transformations_applied
-                    })
-                else:
-                    self.logger.warning("Content transformation failed",
-                                      url=item['url'],
-                                      error=result.error_message)
+                transformed = self._transform_item(item, self.corporate_transformer)
+                if transformed is not None:
+                    transformed_data.append(transformed)
         
         self.logger.info("Corporate transformation completed",
                         total_transformed=len(transformed_data))
@@ -168,19 +220,9 @@ class ManuelitaPipeline:
         
         with self.logger.timed_operation("news_transformation", item_count=len(extracted_data)):
             for item in extracted_data:
-                result = self.news_transformer.transform_content(item['content'])
-                
-                if result.success:
-                    transformed_data.append({
-                        'url': item['url'],
-                        'content': result.cleaned_content,
-                        'metadata': item['metadata'],
-                        'transformations_applied': result.transformations_applied
-                    })
-                else:
-                    self.logger.warning("Content transformation failed",
-                                      url=item['url'],
-                                      error=result.error_message)
+                transformed = self._transform_item(item, self.news_transformer)
+                if transformed is not None:
+                    transformed_data.append(transformed)
         
         self.logger.info("News transformation completed",
                         total_transformed=len(transformed_data))
@@ -191,21 +233,13 @@ class ManuelitaPipeline:
         self.logger.info(f"Starting content loading for {content_type}")
         
         # Convert to ContentItem objects
-        content_items = []
-        for item in transformed_data:
-            content_item = ContentItem(
-                content=item['content'],
-                metadata=item['metadata'],
-                source_url=item['url'],
-                content_type="markdown"
-            )
-            content_items.append(content_item)
+        content_items = [self._to_content_item(item) for item in transformed_data]
         
         # Load using organized structure
         with self.logger.timed_operation("content_loading", item_count=len(content_items)):
             organized_results = self.loader.create_organized_structure(
                 content_items,
-                Path(self.config.scraping.output.base_directory) / "processed"
+                self.processed_directory
             )
         
         # Collect all output paths
@@ -219,9 +253,67 @@ class ManuelitaPipeline:
                         total_loaded=len(all_output_paths))
         return all_output_paths
     
-    def run_corporate_pipeline(self) -> Dict[str, Any]:
-        """Run the complete corporate content pipeline."""
-        self.logger.info("Starting corporate pipeline")
+    def stream_content(self, pipeline_type: str, extractor: "BaseExtractor",
+                       transformer: BaseTransformer, urls: List[str]) -> Dict[str, Any]:
+        """
+        Run extract → transform → load as chained generators.
+        
+        Each document is transformed and written as soon as it is downloaded,
+        so the first files land on disk while later URLs are still being
+        fetched, and memory stays flat regardless of crawl size.
+        
+        Returns:
+            Pipeline result with the same counts as the batch pipelines
+        """
+        counts = {'extracted': 0, 'transformed': 0}
+        discovered_links: Set[str] = set()
+        
+        def extracted() -> Iterator[Dict[str, Any]]:
+            for result in extractor.iter_multiple_urls(urls):
+                if result.success:
+                    counts['extracted'] += 1
+                    discovered_links.update(result.discovered_links)
+                    yield self._to_pipeline_item(result)
+        
+        def transformed(items: Iterable[Dict[str, Any]]) -> Iterator[ContentItem]:
+            for item in items:
+                transformed_item = self._transform_item(item, transformer)
+                if transformed_item is not None:
+                    counts['transformed'] += 1
+                    yield self._to_content_item(transformed_item)
+        
+        output_paths = []
+        with self.logger.timed_operation(f"{pipeline_type}_pipeline", streaming=True, url_count=len(urls)):
+            load_results = self.loader.load_stream(
+                transformed(extracted()),
+                self.processed_directory
+            )
+            for load_result in load_results:
+                if load_result.success and load_result.output_path:
+                    output_paths.append(load_result.output_path)
+        
+        return {
+            'success': counts['extracted'] > 0 and counts['transformed'] > 0,
+            'pipeline_type': pipeline_type,
+            'streaming': True,
+            'extracted_count': counts['extracted'],
+            'transformed_count': counts['transformed'],
+            'loaded_count': len(output_paths),
+            'discovered_links': discovered_links,
+            'output_paths': output_paths
+        }
+    
+    def run_corporate_pipeline(self, streaming: bool = False) -> Dict[str, Any]:
+        """
+        Run the complete corporate content pipeline.
+        
+        Args:
+            streaming: Chain the stages as generators instead of materializing each stage
+        """
+        self.logger.info("Starting corporate pipeline", streaming=streaming)
+        
+        if streaming:
+            return self._run_streaming_corporate_pipeline()
         
         with self.logger.timed_operation("corporate_pipeline"):
             # Extract
@@ -249,9 +341,17 @@ class ManuelitaPipeline:
         self.logger.info("Corporate pipeline completed", **result)
         return result
     
-    def run_news_pipeline(self) -> Dict[str, Any]:
-        """Run the complete news content pipeline."""
-        self.logger.info("Starting news pipeline")
+    def run_news_pipeline(self, streaming: bool = False) -> Dict[str, Any]:
+        """
+        Run the complete news content pipeline.
+        
+        Args:
+            streaming: Chain the stages as generators instead of materializing each stage
+        """
+        self.logger.info("Starting news pipeline", streaming=streaming)
+        
+        if streaming:
+            return self._run_streaming_news_pipeline()
         
         with self.logger.timed_operation("news_pipeline"):
             # Extract
@@ -280,13 +380,255 @@ class ManuelitaPipeline:
         self.logger.info("News pipeline completed", **result)
         return result
     
-    def run_full_pipeline(self) -> Dict[str, Any]:
-        """Run both corporate and news pipelines."""
-        self.logger.info("Starting full pipeline")
+    def _run_streaming_corporate_pipeline(self) -> Dict[str, Any]:
+        """Run the corporate pipeline in streaming mode."""
+        urls = self.config.scraping.targets.corporate_urls
+        if not urls:
+            self.logger.warning("No corporate URLs configured")
+            return {'success': False, 'message': 'No corporate content extracted'}
+        
+        result = self.stream_content("corporate", self.corporate_extractor,
+                                     self.corporate_transformer, urls)
         
-        with self.logger.timed_operation("full_pipeline"):
-            corporate_result = self.run_corporate_pipeline()
-            news_result = self.run_news_pipeline()
+        # Corporate pages don't report discovered links
+        result.pop('discovered_links')
+        if not result['success']:
+            return {'success': False, 'message': 'No corporate content extracted or transformed'}
+        
+        self.logger.info("Corporate pipeline completed", **result)
+        return result
+    
+    def _run_streaming_news_pipeline(self) -> Dict[str, Any]:
+        """Run the news pipeline in streaming mode."""
+        urls = self.config.scraping.targets.news_base_urls
+        if not urls:
+            self.logger.warning("No news URLs configured")
+            return {'success': False, 'message': 'No news content extracted'}
+        
+        result = self.stream_content("news", self.news_extractor,
+                                     self.news_transformer, urls)
+        
+        discovered_links = result.pop('discovered_links')
+        if discovered_links:
+            self.news_extractor.save_discovered_links(discovered_links, "discovered_news_links.json")
+        result['discovered_links_count'] = len(discovered_links)
+        
+        if not result['success']:
+            return {'success': False, 'message': 'No news content extracted or transformed'}
+        
+        self.logger.info("News pipeline completed", **result)
+        return result
+    
+    def run_incremental_pipeline(self, pipeline_type: str = "full") -> Dict[str, Any]:
+        """
+        Run the pipeline incrementally against the persisted change manifest.
+        
+        Pages are fetched with conditional requests; only documents whose raw
+        content changed are re-transformed, and only those whose cleaned
+        content changed are re-loaded. Documents no longer produced upstream
+        are deleted. Each pipeline writes a changeset of added, updated and
+        removed documents for downstream indexers.
+        
+        Args:
+            pipeline_type: 'corporate', 'news' or 'full'
+        """
+        self.logger.info("Starting incremental pipeline", pipeline_type=pipeline_type)
+        
+        pipeline_types = ['corporate', 'news'] if pipeline_type == 'full' else [pipeline_type]
+        manifest = ChangeManifest.load(self.manifest_path)
+        
+        results = {}
+        with self.logger.timed_operation("incremental_pipeline", pipeline_type=pipeline_type):
+            for current_type in pipeline_types:
+                results[current_type] = self._run_incremental(current_type, manifest)
+                # Persist after each pipeline so a later failure doesn't lose progress
+                manifest.save()
+        
+        if pipeline_type != 'full':
+            return results[pipeline_type]
+        
+        corporate_result, news_result = results['corporate'], results['news']
+        result = {
+            'success': corporate_result['success'] and news_result['success'],
+            'incremental': True,
+            'corporate': corporate_result,
+            'news': news_result,
+            'total_extracted': corporate_result.get('extracted_count', 0) + news_result.get('extracted_count', 0),
+            'total_loaded': corporate_result.get('loaded_count', 0) + news_result.get('loaded_count', 0)
+        }
+        
+        self.logger.info("Incremental pipeline completed", **result)
+        self.logger.log_metrics_summary()
+        return result
+    
+    def _run_incremental(self, pipeline_type: str, manifest: ChangeManifest) -> Dict[str, Any]:
+        """Run one pipeline type incrementally, updating the manifest in place."""
+        if pipeline_type == 'corporate':
+            urls = self.config.scraping.targets.corporate_urls
+            extractor, transformer = self.corporate_extractor, self.corporate_transformer
+        else:
+            urls = self.config.scraping.targets.news_base_urls
+            extractor, transformer = self.news_extractor, self.news_transformer
+        
+        if not urls:
+            self.logger.warning(f"No {pipeline_type} URLs configured")
+            return {'success': False, 'message': f'No {pipeline_type} URLs configured'}
+        
+        extractor.previous_validators = manifest.validators_for(pipeline_type)
+        
+        changeset = Changeset(pipeline_type=pipeline_type)
+        seen_urls: Set[str] = set()
+        discovered_links: Set[str] = set()
+        extracted_count = 0
+        
+        with self.logger.timed_operation(f"{pipeline_type}_incremental", url_count=len(urls)):
+            for result in extractor.iter_multiple_urls(urls):
+                if not result.success:
+                    # Transient failures keep their previous output and the links it
+                    # led to (carried by the extractor); only 404/410 count as removals
+                    if result.status_code not in (404, 410):
+                        seen_urls.add(result.url)
+                        discovered_links.update(result.discovered_links)
+                    continue
+                
+                seen_urls.add(result.url)
+                extracted_count += 1
+                discovered_links.update(result.discovered_links)
+                
+                change_type = self._apply_incremental_result(result, pipeline_type, transformer, manifest)
+                if change_type:
+                    changeset.record(change_type, manifest.get(result.url))
+                else:
+                    changeset.unchanged_count += 1
+            
+            for entry in manifest.entries_for(pipeline_type):
+                if entry.url not in seen_urls:
+                    self._remove_incremental_entry(entry, manifest)
+                    changeset.record('removed', entry)
+        
+        if pipeline_type == 'news' and discovered_links:
+            self.news_extractor.save_discovered_links(discovered_links, "discovered_news_links.json")
+        
+        changeset_path = changeset.save(self.changesets_directory)
+        output_paths = [change['output_path'] for change in changeset.added + changeset.updated]
+        
+        result = {
+            'success': extracted_count > 0,
+            'pipeline_type': pipeline_type,
+            'incremental': True,
+            'extracted_count': extracted_count,
+            'loaded_count': len(output_paths),
+            'added_count': len(changeset.added),
+            'updated_count': len(changeset.updated),
+            'removed_count': len(changeset.removed),
+            'unchanged_count': changeset.unchanged_count,
+            'has_changes': changeset.has_changes,
+            'changeset_path': str(changeset_path),
+            'output_paths': output_paths
+        }
+        if pipeline_type == 'news':
+            result['discovered_links_count'] = len(discovered_links)
+        
+        self.logger.info(f"Incremental {pipeline_type} pipeline completed", **result)
+        return result
+    
+    def _apply_incremental_result(self, result: "ScrapingResult", pipeline_type: str,
+                                  transformer: BaseTransformer, manifest: ChangeManifest) -> Optional[str]:
+        """
+        Transform and load a scraping result only if it changed.
+        
+        Returns:
+            'added' or 'updated' when the document was (re)loaded, None if unchanged
+        """
+        entry = manifest.get(result.url)
+        output_exists = bool(entry and entry.output_path and Path(entry.output_path).exists())
+        
+        if result.not_modified and output_exists:
+            self.logger.increment_counter('incremental_not_modified')
+            return None
+        
+        raw_hash = content_hash(result.content)
+        new_entry = ManifestEntry(
+            url=result.url,
+            pipeline_type=pipeline_type,
+            etag=result.http_validators.get('etag'),
+            last_modified=result.http_validators.get('last_modified'),
+            content_hash=raw_hash,
+            cleaned_hash=entry.cleaned_hash if entry else None,
+            output_path=entry.output_path if entry else None,
+            discovered_links=sorted(result.discovered_links)
+        )
+        
+        if output_exists and entry.content_hash == raw_hash:
+            manifest.put(new_entry)
+            self.logger.increment_counter('incremental_content_unchanged')
+            return None
+        
+        transformed = self._transform_item(self._to_pipeline_item(result), transformer)
+        if transformed is None:
+            return None
+        
+        new_entry.cleaned_hash = content_hash(transformed['content'])
+        if output_exists and entry.cleaned_hash == new_entry.cleaned_hash:
+            manifest.put(new_entry)
+            self.logger.increment_counter('incremental_cleaned_unchanged')
+            return None
+        
+        content_item = self._to_content_item(transformed)
+        load_result = self.loader.load_organized_item(content_item, self.processed_directory)
+        if not load_result.success:
+            # Leave the manifest untouched so the next run retries this document
+            return None
+        
+        self.loader.update_metadata_index(Path(load_result.output_path).parent, items=[content_item])
+        new_entry.output_path = load_result.output_path
+        manifest.put(new_entry)
+        self.logger.increment_counter('incremental_documents_loaded')
+        return 'updated' if entry else 'added'
+    
+    def _remove_incremental_entry(self, entry: ManifestEntry, manifest: ChangeManifest) -> None:
+        """Delete the output of a document that is no longer produced upstream."""
+        if entry.output_path:
+            try:
+                Path(entry.output_path).unlink(missing_ok=True)
+            except Exception as e:
+                self.logger.error("Failed to delete removed document", error=e,
+                                  output_path=entry.output_path)
+            self.loader.update_metadata_index(Path(entry.output_path).parent, removed_urls=[entry.url])
+        
+        manifest.remove(entry.url)
+        self.logger.increment_counter('incremental_documents_removed')
+    
+    def _run_pipelines_concurrently(self, streaming: bool) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the corporate and news pipelines in parallel and return both results."""
+        # Build shared components up front so the worker threads don't race on lazy init
+        _ = self.loader
+        _ = self.corporate_extractor, self.news_extractor
+        _ = self.corporate_transformer, self.news_transformer
+        
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline") as executor:
+            corporate_future = executor.submit(self.run_corporate_pipeline, streaming)
+            news_future = executor.submit(self.run_news_pipeline, streaming)
+            return corporate_future.result(), news_future.result()
+    
+    def run_full_pipeline(self, streaming: bool = False, concurrent: bool = False) -> Dict[str, Any]:
+        """
+        Run both corporate and news pipelines.
+        
+        Args:
+            streaming: Run each pipeline with chained generator stages
+            concurrent: Run the corporate and news pipelines in parallel threads.
+                Both extractors share the per-host rate limiter, so requests to
+                the same host are still spaced by the configured delay.
+        """
+        self.logger.info("Starting full pipeline", streaming=streaming, concurrent=concurrent)
+        
+        with self.logger.timed_operation("full_pipeline", concurrent=concurrent):
+            if concurrent:
+                corporate_result, news_result = self._run_pipelines_concurrently(streaming)
+            else:
+                corporate_result = self.run_corporate_pipeline(streaming=streaming)
+                news_result = self.run_news_pipeline(streaming=streaming)
         
         result = {
             'success': corporate_result['success'] and news_result['success'],
@@ -303,6 +645,85 @@ class ManuelitaPipeline:
         
         return result
     
+    def record_run(self, pipeline_type: str, result: Dict[str, Any], wall_time: float,
+                   mode: Optional[Dict[str, bool]] = None, run_id: Optional[str] = None) -> Optional[Path]:
+        """
+        Write the run manifest for a completed run.
+        
+        Args:
+            pipeline_type: 'corporate', 'news' or 'full'
+            result: Result dict returned by the run_* method
+            wall_time: Wall-clock duration of the run in seconds
+            mode: Flags the run was started with (streaming, concurrent, incremental)
+            run_id: Identifier for the run directory; defaults to a UTC timestamp
+        
+        Returns:
+            Path of the written manifest, or None if metrics are disabled
+        """
+        metrics_summary = self.logger.get_metrics_summary()
+        if metrics_summary is None:
+            self.logger.warning("Metrics disabled, skipping run manifest")
+            return None
+        
+        run_id = run_id or self.new_run_id(pipeline_type)
+        manifest = build_run_manifest(run_id, pipeline_type, self.environment,
+                                      result, metrics_summary, wall_time, mode)
+        manifest_path = write_run_manifest(manifest, self.runs_directory)
+        
+        self.logger.info("Run manifest written", run_id=run_id, manifest_path=str(manifest_path))
+        return manifest_path
+    
+    def export_metrics_textfile(self, path: Optional[str] = None) -> Optional[Path]:
+        """
+        Write collected metrics in Prometheus text format.
+        
+        Args:
+            path: Output file; defaults to monitoring.prometheus_textfile
+        
+        Returns:
+            Path of the written file, or None if no path is configured or metrics are disabled
+        """
+        path = path or self.config.monitoring.prometheus_textfile
+        if not path or self.logger.metrics is None:
+            return None
+        
+        from .metrics_exporter import write_textfile
+        
+        try:
+            output_path = write_textfile(self.logger.metrics, path)
+        except Exception as e:
+            self.logger.error("Failed to write Prometheus metrics", error=e, path=path)
+            return None
+        
+        self.logger.info("Prometheus metrics written", path=str(output_path))
+        return output_path
+    
+    def start_metrics_server(self, port: Optional[int] = None) -> Optional["MetricsServer"]:
+        """
+        Serve live metrics on a local ``/metrics`` endpoint.
+        
+        Args:
+            port: Port to listen on; defaults to monitoring.prometheus_port
+        
+        Returns:
+            The running server (call stop() when done), or None if not configured
+        """
+        port = port or self.config.monitoring.prometheus_port
+        if not port or self.logger.metrics is None:
+            return None
+        
+        from .metrics_exporter import MetricsServer
+        
+        server = MetricsServer(self.logger.metrics, port).start()
+        self.logger.info("Prometheus metrics endpoint started",
+                         url=f"http://{server.host}:{server.port}/metrics")
+        return server
+    
+    @staticmethod
+    def new_run_id(pipeline_type: str) -> str:
+        """Create a sortable run identifier for a pipeline type."""
+        return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{pipeline_type}"
+    
     def get_pipeline_status(self) -> Dict[str, Any]:
         """Get current pipeline status and configuration."""
         return {
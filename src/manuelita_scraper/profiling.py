@@ -0,0 +1,207 @@
+"""
+Stage Profiling Module
+
+This module provides opt-in per-stage profiling for CLI runs. Timed
+operations reported through StructuredLogger are grouped into pipeline
+stages (extract, transform, load); each stage gets its own cProfile
+profile or tracemalloc allocation diff, written next to the run manifest
+together with a text summary of the top-N hot spots per stage.
+"""
+
+import cProfile
+import io
+import linecache
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PROFILE_MODES = ('cpu', 'mem')
+PROFILE_SUMMARY_FILENAME = "profile_summary.txt"
+DEFAULT_TOP_N = 25
+STAGE_ORDER = ('extract', 'transform', 'load')
+
+# Timed operation → pipeline stage it is attributed to
+STAGE_OPERATIONS = {
+    'scrape_url': 'extract',
+    'corporate_extraction': 'extract',
+    'news_extraction': 'extract',
+    'content_transformation': 'transform',
+    'corporate_transformation': 'transform',
+    'news_transformation': 'transform',
+    'load_item': 'load',
+    'batch_file_loading': 'load',
+    'content_loading': 'load',
+}
+
+
+class StageProfiler:
+    """
+    Collects cProfile stats or tracemalloc allocation diffs per pipeline stage.
+
+    Only one stage is profiled at a time: operations nested inside an active
+    stage (e.g. scrape_url inside corporate_extraction) are accounted to the
+    active stage. cProfile only profiles the thread that enabled it, so
+    operations running on other threads are not profiled at all (and their
+    stage isn't started while another is active); tracemalloc traces the whole
+    process, so in mem mode their allocations land in the active stage. Use
+    it on single-threaded runs (the CLI refuses --profile with --concurrent).
+    """
+
+    def __init__(self, mode: str, top_n: int = DEFAULT_TOP_N):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {mode}")
+        self.mode = mode
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._active_stage: Optional[str] = None
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        # stage → (filename, lineno) → [size_diff, count_diff]
+        self._allocations: Dict[str, Dict[Tuple[str, int], List[int]]] = {}
+        self._peaks: Dict[str, int] = {}
+        self._calls: Dict[str, int] = {}
+        self._started_tracemalloc = False
+
+    def start(self) -> "StageProfiler":
+        """Start profiling (enables tracemalloc in memory mode)."""
+        if self.mode == 'mem' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _acquire(self, stage: str) -> bool:
+        """Mark a stage as active unless another one already is."""
+        with self._lock:
+            if self._active_stage is not None:
+                return False
+            self._active_stage = stage
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active_stage = None
+
+    @contextmanager
+    def operation(self, operation_name: str):
+        """Profile an operation under the stage it belongs to."""
+        stage = STAGE_OPERATIONS.get(operation_name)
+        if stage is None or not self._acquire(stage):
+            yield
+            return
+
+        try:
+            if self.mode == 'cpu':
+                profile = self._profiles.setdefault(stage, cProfile.Profile())
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+            else:
+                with self._trace_allocations(stage):
+                    yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def _trace_allocations(self, stage: str):
+        """Accumulate the allocation diff of a block into the stage totals."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        tracemalloc.reset_peak()
+        baseline_size = tracemalloc.get_traced_memory()[0]
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - baseline_size
+            after = tracemalloc.take_snapshot()
+            self._peaks[stage] = max(self._peaks.get(stage, 0), peak)
+
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                       tracemalloc.Filter(False, __file__)]
+            stage_allocations = self._allocations.setdefault(stage, {})
+            for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno'):
+                if not stat.size_diff and not stat.count_diff:
+                    continue
+                frame = stat.traceback[0]
+                totals = stage_allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+                totals[0] += stat.size_diff
+                totals[1] += stat.count_diff
+
+    @property
+    def stages(self) -> List[str]:
+        """Stages that recorded at least one profiled operation."""
+        recorded = self._profiles if self.mode == 'cpu' else self._allocations
+        return [stage for stage in STAGE_ORDER if stage in recorded]
+
+    def _cpu_summary(self, stage: str) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiles[stage], stream=stream)
+        stats.strip_dirs().sort_stats(pstats.SortKey.TIME).print_stats(self.top_n)
+        return stream.getvalue().strip()
+
+    def _mem_summary(self, stage: str) -> str:
+        allocations = sorted(self._allocations[stage].items(), key=lambda item: item[1][0], reverse=True)
+        lines = [f"Peak traced memory during stage: {self._peaks.get(stage, 0) / 1024:.1f} KiB",
+                 f"{'net KiB':>12} {'blocks':>8}  location"]
+        for (filename, lineno), (size_diff, count_diff) in allocations[:self.top_n]:
+            lines.append(f"{size_diff / 1024:>12.1f} {count_diff:>8}  {filename}:{lineno}")
+            source = linecache.getline(filename, lineno).strip()
+            if source:
+                lines.append(f"{'':>22}{source}")
+        return "\n".join(lines)
+
+    def render_summary(self) -> str:
+        """Render the top-N hot spots of every profiled stage as text."""
+        kind = "cProfile (sorted by internal time)" if self.mode == 'cpu' else "tracemalloc (net allocations by line)"
+        sections = [f"Profile mode: {self.mode} — {kind}, top {self.top_n} per stage"]
+
+        if not self.stages:
+            sections.append("No profiled stages were executed.")
+
+        for stage in self.stages:
+            header = f"=== Stage: {stage} ({self._calls.get(stage, 0)} profiled operations) ==="
+            body = self._cpu_summary(stage) if self.mode == 'cpu' else self._mem_summary(stage)
+            sections.append(f"{header}\n{body}")
+
+        return "\n\n".join(sections) + "\n"
+
+    def write(self, output_dir: Path) -> List[Path]:
+        """
+        Write the profile artifacts to a directory.
+
+        CPU mode writes one ``profile_<stage>.prof`` file per stage (loadable
+        with pstats or snakeviz); both modes write the text summary.
+
+        Returns:
+            Paths of the written files, summary last
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        if self.mode == 'cpu':
+            for stage in self.stages:
+                stats_path = output_dir / f"profile_{stage}.prof"
+                self._profiles[stage].dump_stats(str(stats_path))
+                written.append(stats_path)
+
+        summary_path = output_dir / PROFILE_SUMMARY_FILENAME
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_summary())
+        written.append(summary_path)
+
+        return written
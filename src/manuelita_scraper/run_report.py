@@ -0,0 +1,208 @@
+"""
+Run Manifest and Throughput Report Module
+
+This module turns the metrics collected during a pipeline run into a
+compact, comparable run manifest (per-stage busy time, throughput, bytes,
+latency percentiles, retries and cache hit rates), and diffs two run
+manifests to spot performance regressions between deployments.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+RUN_MANIFEST_VERSION = 2
+RUN_MANIFEST_FILENAME = "run_manifest.json"
+
+# Pipeline stage → timing recorded once per processed item
+STAGE_TIMINGS = {
+    'extract': 'scrape_url',
+    'transform': 'content_transformation',
+    'load': 'load_item',
+}
+
+# Metrics where a higher value in the newer run is a regression
+HIGHER_IS_WORSE = ('wall_time_s', 'busy_time_s', 'p50_s', 'p95_s', 'retries', 'error_count')
+# Metrics where a lower value in the newer run is a regression
+LOWER_IS_WORSE = ('items_per_s',)
+
+
+def _rate(numerator: float, denominator: float) -> Optional[float]:
+    """Divide, returning None when the denominator is zero."""
+    return numerator / denominator if denominator else None
+
+
+def build_run_manifest(run_id: str, pipeline_type: str, environment: str,
+                       result: Dict[str, Any], metrics_summary: Dict[str, Any],
+                       wall_time: float, mode: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+    """
+    Build a run manifest from a pipeline result and its metrics summary.
+
+    Args:
+        run_id: Unique identifier for the run
+        pipeline_type: 'corporate', 'news' or 'full'
+        environment: Configuration environment used
+        result: Result dict returned by the pipeline
+        metrics_summary: Output of StructuredLogger.get_metrics_summary()
+        wall_time: Wall-clock duration of the run in seconds
+        mode: Flags the run was started with (streaming, concurrent, incremental)
+    """
+    counters = metrics_summary.get('counters', {})
+    timings = metrics_summary.get('timings', {})
+
+    # Stage time is the sum of per-item durations (busy time), not the stage's
+    # start-to-end span: stages interleave when streaming and overlap when
+    # pipelines run concurrently
+    stages = {}
+    for stage, timing_name in STAGE_TIMINGS.items():
+        timing = timings.get(timing_name, {})
+        busy_time = timing.get('total', 0.0)
+        items = timing.get('count', 0)
+        stages[stage] = {
+            'busy_time_s': busy_time,
+            'items': items,
+            'items_per_s': _rate(items, busy_time),
+            'bytes_in': counters.get(f'{stage}_bytes_in', 0),
+            'bytes_out': counters.get(f'{stage}_bytes_out', 0),
+        }
+
+    url_timing = timings.get(STAGE_TIMINGS['extract'], {})
+    http_requests = url_timing.get('count', 0)
+    not_modified = counters.get('http_not_modified', 0)
+    incremental_skips = (not_modified
+                         + counters.get('incremental_content_unchanged', 0)
+                         + counters.get('incremental_cleaned_unchanged', 0))
+
+    extracted = result.get('total_extracted', result.get('extracted_count', 0))
+    loaded = result.get('total_loaded', result.get('loaded_count', 0))
+
+    return {
+        'version': RUN_MANIFEST_VERSION,
+        'run_id': run_id,
+        'pipeline_type': pipeline_type,
+        'environment': environment,
+        'mode': mode or {},
+        'created_at': datetime.utcnow().isoformat(),
+        'success': result.get('success', False),
+        'wall_time_s': wall_time,
+        'totals': {
+            'extracted': extracted,
+            'loaded': loaded,
+            'items_per_s': _rate(loaded, wall_time),
+            'error_count': metrics_summary.get('error_count', 0),
+        },
+        'stages': stages,
+        'latency': {
+            'url': {
+                'count': http_requests,
+                'p50_s': url_timing.get('p50'),
+                'p95_s': url_timing.get('p95'),
+                'max_s': url_timing.get('max'),
+            },
+        },
+        'retries': counters.get('http_retries', 0),
+        'cache': {
+            'http_not_modified': not_modified,
+            'http_304_rate': _rate(not_modified, http_requests),
+            'incremental_skips': incremental_skips,
+            'incremental_skip_rate': _rate(incremental_skips, extracted),
+        },
+    }
+
+
+def write_run_manifest(manifest: Dict[str, Any], runs_dir: Path) -> Path:
+    """Write a run manifest to <runs_dir>/<run_id>/run_manifest.json and return its path."""
+    run_dir = Path(runs_dir) / manifest['run_id']
+    run_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = run_dir / RUN_MANIFEST_FILENAME
+
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return manifest_file
+
+
+def resolve_run_manifest(run: str, runs_dir: Path) -> Path:
+    """Resolve a run id, run directory or manifest file path to a manifest file."""
+    candidates = [Path(run), Path(run) / RUN_MANIFEST_FILENAME,
+                  Path(runs_dir) / run / RUN_MANIFEST_FILENAME]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Run manifest not found: {run}")
+
+
+def load_run_manifest(path: Path) -> Dict[str, Any]:
+    """Load a run manifest from disk."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_runs(runs_dir: Path) -> List[Dict[str, Any]]:
+    """List stored run manifests, oldest first."""
+    runs_path = Path(runs_dir)
+    if not runs_path.exists():
+        return []
+
+    manifests = [load_run_manifest(path) for path in runs_path.glob(f"*/{RUN_MANIFEST_FILENAME}")]
+    return sorted(manifests, key=lambda manifest: manifest.get('created_at', ''))
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten nested numeric fields into dotted keys."""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_runs(baseline: Dict[str, Any], candidate: Dict[str, Any],
+                 threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Diff two run manifests metric by metric.
+
+    Args:
+        baseline: Older run manifest
+        candidate: Newer run manifest
+        threshold: Relative change beyond which a metric is flagged as a regression
+
+    Returns:
+        One row per numeric metric with both values, the relative change and
+        whether it is a regression
+    """
+    sections = ('wall_time_s', 'totals', 'stages', 'latency', 'retries', 'cache')
+    base_flat = _flatten({key: baseline.get(key) for key in sections if key in baseline})
+    cand_flat = _flatten({key: candidate.get(key) for key in sections if key in candidate})
+
+    rows = []
+    for metric in sorted(set(base_flat) | set(cand_flat)):
+        base_value = base_flat.get(metric)
+        cand_value = cand_flat.get(metric)
+
+        change = None
+        if base_value is not None and cand_value is not None and base_value != 0:
+            change = (cand_value - base_value) / abs(base_value)
+
+        leaf = metric.rsplit('.', 1)[-1]
+        regression = False
+        if change is not None:
+            if leaf in HIGHER_IS_WORSE:
+                regression = change > threshold
+            elif leaf in LOWER_IS_WORSE:
+                regression = change < -threshold
+
+        rows.append({
+            'metric': metric,
+            'baseline': base_value,
+            'candidate': cand_value,
+            'change': change,
+            'regression': regression,
+        })
+
+    return rows
@@ -262,6 +262,8 @@ class BaseTransformer(ABC):
                 all_transformations.extend(trans)
             
             self.logger.increment_counter('content_transformations')
+            self.logger.increment_counter('transform_bytes_in', len(original_content.encode('utf-8')))
+            self.logger.increment_counter('transform_bytes_out', len(content.encode('utf-8')))
             
             return TransformationResult(
                 original_content=original_content,
@@ -0,0 +1,181 @@
+"""
+Shared fixtures for the ETL benchmark suite.
+
+The benchmarks run on the legacy scraped corpus in ``legacy/``: the markdown
+files are used as-is for the transformer and loader benchmarks, and are
+rendered back into WordPress-like HTML pages (with navigation, scripts and
+widgets around the content) for the extractor benchmarks and the replayed
+pipeline run, which serves those pages instead of hitting the network.
+
+The suite is skipped by a plain ``pytest`` run (``--benchmark-skip`` in
+pyproject.toml); run it with ``make benchmark``.
+
+Baselines are stored with pytest-benchmark in ``tests/benchmarks/baselines``,
+one directory per machine id (``<OS>-<implementation>-<version>-<bits>``).
+Timings only compare on the machine that recorded them: the committed
+``Linux-CPython-3.11-64bit/0001_baseline.json`` was recorded with
+``make benchmark-baseline`` when the suite was added (Intel Xeon, CPython
+3.11.7; its ``machine_info`` and ``commit_info`` identify host and commit).
+On other hardware, record and compare against a local baseline instead::
+
+    make benchmark-baseline BENCHMARK_STORAGE=.benchmarks
+    make benchmark BENCHMARK_STORAGE=.benchmarks
+"""
+
+import copy
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LEGACY_CORPORATE_DIR = REPO_ROOT / "legacy" / "manuelita_content"
+LEGACY_NEWS_DIR = REPO_ROOT / "legacy" / "manuelita_news_content"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<meta name="description" content="{title}">
+<meta property="og:title" content="{title}">
+<style>body {{ font-family: sans-serif; }} .menu li {{ display: inline; }}</style>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+</head>
+<body>
+<header><a href="https://www.manuelita.com/">Manuelita</a></header>
+<nav class="navigation"><ul class="menu">{menu}</ul></nav>
+<div class="cookie">Este sitio usa cookies. <button>Aceptar</button></div>
+<main>
+{body}
+</main>
+<aside class="sidebar"><ul>{menu}</ul></aside>
+<div class="social-share"><a href="https://www.facebook.com/sharer/sharer.php">Facebook</a>
+<a href="https://twitter.com/intent/tweet">Twitter</a></div>
+<div class="popup">Suscríbete a nuestro boletín</div>
+<footer><p>© Manuelita. Todos los derechos reservados.</p><ul>{menu}</ul></footer>
+<script src="https://www.manuelita.com/wp-includes/js/jquery/jquery.min.js"></script>
+</body>
+</html>
+"""
+
+MENU_LINKS = ["perfil-corporativo", "historia", "sostenibilidad", "manuelita-noticias",
+              "azucar", "energetico", "contacto"]
+
+_IMAGE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)\)')
+_LINK = re.compile(r'\[([^\]]*)\]\(([^)\s]+)\)')
+
+
+def read_corpus(directory: Path) -> Dict[str, str]:
+    """Map source URL → markdown for every legacy file whose first line is its URL."""
+    corpus = {}
+    for path in sorted(directory.glob("*.md")):
+        content = path.read_text(encoding="utf-8")
+        first_line, _, body = content.partition("\n")
+        if first_line.startswith("# http"):
+            corpus[first_line[2:].strip()] = body
+    return corpus
+
+
+def _inline_html(text: str) -> str:
+    text = _IMAGE.sub(r'<img src="\2" alt="\1">', text)
+    return _LINK.sub(r'<a href="\2">\1</a>', text)
+
+
+def markdown_to_page(markdown: str) -> str:
+    """Render scraped markdown back into a full HTML page with site chrome."""
+    blocks: List[str] = []
+    title = "Manuelita"
+
+    for line in markdown.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading = re.match(r'(#{1,6})\s+(.*)', line)
+        if heading:
+            level = len(heading.group(1))
+            if title == "Manuelita":
+                title = heading.group(2)
+            blocks.append(f"<h{level}>{_inline_html(heading.group(2))}</h{level}>")
+        elif line.startswith(("* ", "- ")):
+            blocks.append(f"<ul><li>{_inline_html(line[2:])}</li></ul>")
+        else:
+            blocks.append(f"<p>{_inline_html(line)}</p>")
+
+    menu = "".join(f'<li><a href="https://www.manuelita.com/{slug}/">{slug}</a></li>' for slug in MENU_LINKS)
+    return PAGE_TEMPLATE.format(title=title.replace('"', "'"), menu=menu, body="\n".join(blocks))
+
+
+class ReplayedResponse:
+    """Minimal stand-in for requests.Response serving a recorded page."""
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'ETag': f'"{zlib.crc32(content):08x}"'} if status_code == 200 else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Client Error for url: {self.url}", response=self)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def repo_cwd():
+    """Run from the repository root so configs/ resolves like it does for the CLI."""
+    previous = os.getcwd()
+    os.chdir(REPO_ROOT)
+    yield REPO_ROOT
+    os.chdir(previous)
+
+
+@pytest.fixture(scope="session")
+def corporate_corpus() -> Dict[str, str]:
+    return read_corpus(LEGACY_CORPORATE_DIR)
+
+
+@pytest.fixture(scope="session")
+def news_corpus() -> Dict[str, str]:
+    return read_corpus(LEGACY_NEWS_DIR)
+
+
+@pytest.fixture(scope="session")
+def replay_pages(corporate_corpus, news_corpus) -> Dict[str, bytes]:
+    """URL → rendered HTML for every page in the legacy corpus."""
+    pages = {}
+    for url, markdown in {**corporate_corpus, **news_corpus}.items():
+        pages[url] = markdown_to_page(markdown).encode("utf-8")
+    return pages
+
+
+@pytest.fixture(scope="session")
+def sample_page(replay_pages, corporate_corpus) -> bytes:
+    """The largest corporate page, used by the extractor micro-benchmarks."""
+    return max((replay_pages[url] for url in corporate_corpus), key=len)
+
+
+@pytest.fixture(scope="session")
+def app_config(repo_cwd):
+    """A private copy of the development configuration."""
+    from manuelita_scraper.config import init_config
+    return copy.deepcopy(init_config("development"))
+
+
+@pytest.fixture
+def replay_http(replay_pages):
+    """Serve the recorded pages to requests.Session.get; unknown URLs get a 404."""
+    def get(session, url, **kwargs):
+        content = replay_pages.get(url)
+        if content is None:
+            return ReplayedResponse(url, b"", status_code=404)
+        return ReplayedResponse(url, content)
+
+    with mock.patch("requests.Session.get", autospec=True, side_effect=get):
+        yield
@@ -0,0 +1,37 @@
+"""Micro-benchmarks for the HTML → markdown steps of BaseExtractor."""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from manuelita_scraper.extractors.corporate import CorporateExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor(app_config):
+    return CorporateExtractor(app_config.scraping)
+
+
+@pytest.fixture(scope="module")
+def cleaned_soup(extractor, sample_page):
+    soup = BeautifulSoup(sample_page, "html.parser")
+    extractor._remove_unwanted_elements(soup)
+    return soup
+
+
+def test_remove_unwanted_elements(benchmark, extractor, sample_page):
+    # The method mutates the tree, so every round gets a freshly parsed page
+    def setup():
+        return (BeautifulSoup(sample_page, "html.parser"),), {}
+
+    benchmark.pedantic(extractor._remove_unwanted_elements, setup=setup, rounds=50)
+
+
+def test_convert_to_markdown(benchmark, extractor, cleaned_soup):
+    markdown = benchmark(extractor._convert_to_markdown, cleaned_soup)
+    assert markdown.strip()
+
+
+def test_clean_content(benchmark, extractor, cleaned_soup):
+    markdown = extractor._convert_to_markdown(cleaned_soup)
+    cleaned = benchmark(extractor._clean_content, markdown)
+    assert len(cleaned) <= len(markdown)
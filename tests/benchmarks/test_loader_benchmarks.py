@@ -0,0 +1,18 @@
+"""Benchmarks for writing content with FileLoader."""
+
+from manuelita_scraper.loaders.file_loader import ContentItem, FileLoader
+
+
+def test_file_loader_load_batch(benchmark, app_config, corporate_corpus, tmp_path):
+    loader = FileLoader({
+        'base_directory': str(tmp_path),
+        'file_format': app_config.scraping.output.file_format,
+        'include_metadata': app_config.scraping.output.include_metadata,
+    })
+    items = [
+        ContentItem(content=content, metadata={'title': url}, source_url=url)
+        for url, content in corporate_corpus.items()
+    ]
+
+    results = benchmark(loader.load_batch, items, tmp_path)
+    assert sum(result.success for result in results) == len(items)
@@ -0,0 +1,37 @@
+"""Macro-benchmark: a full pipeline run replayed from the legacy corpus."""
+
+import copy
+
+import pytest
+
+from manuelita_scraper.pipeline import ManuelitaPipeline
+
+# Listing page whose article links are discovered and fetched from the replay
+NEWS_LISTING_URL = "https://www.manuelita.com/manuelita-noticias/"
+
+
+@pytest.fixture
+def replayed_pipeline_factory(app_config, corporate_corpus, news_corpus, tmp_path, replay_http, monkeypatch):
+    # The news extractor writes discovered links to the working directory
+    monkeypatch.chdir(tmp_path)
+    config = copy.deepcopy(app_config)
+    config.scraping.targets.corporate_urls = list(corporate_corpus)
+    config.scraping.targets.news_base_urls = [NEWS_LISTING_URL] if NEWS_LISTING_URL in news_corpus else []
+    config.scraping.output.base_directory = str(tmp_path)
+
+    def make_pipeline():
+        # Extractors remember processed URLs, so every round needs a fresh pipeline
+        pipeline = ManuelitaPipeline("development")
+        pipeline.config = config
+        pipeline.rate_limiter.request_delay = 0
+        return (pipeline,), {}
+
+    return make_pipeline
+
+
+def test_full_pipeline_replay(benchmark, replayed_pipeline_factory, corporate_corpus):
+    result = benchmark.pedantic(lambda pipeline: pipeline.run_full_pipeline(),
+                                setup=replayed_pipeline_factory, rounds=5, warmup_rounds=1)
+
+    assert result['success']
+    assert result['corporate']['loaded_count'] == len(corporate_corpus)
@@ -0,0 +1,24 @@
+"""Benchmarks for the content transformers on the legacy corpus."""
+
+from manuelita_scraper.transformers.corporate import CorporateTransformer
+from manuelita_scraper.transformers.news import NewsTransformer
+
+
+def _transform_all(transformer, documents):
+    return [transformer.transform_content(document) for document in documents]
+
+
+def test_corporate_transformer_legacy_corpus(benchmark, app_config, corporate_corpus):
+    transformer = CorporateTransformer(app_config.cleaning)
+    documents = list(corporate_corpus.values())
+
+    results = benchmark(_transform_all, transformer, documents)
+    assert all(result.success for result in results)
+
+
+def test_news_transformer_legacy_corpus(benchmark, app_config, news_corpus):
+    transformer = NewsTransformer(app_config.cleaning)
+    documents = list(news_corpus.values())
+
+    results = benchmark(_transform_all, transformer, documents)
+    assert all(result.success for result in results)
@@ -0,0 +1,116 @@
+"""
+Asynchronous log sink tests.
+
+structlog caches loggers on first use, so the sink has to keep working for
+loggers created before a reconfiguration and has to drain its queue when
+the process shuts it down.
+"""
+
+import io
+import threading
+
+import pytest
+import structlog
+
+from manuelita_scraper import logging_config
+from manuelita_scraper.config import LoggingConfig, MonitoringConfig
+from manuelita_scraper.logging_config import AsyncLogWriter, StructuredLogger
+
+
+def _render(logger, method_name, event_dict):
+    return f"{method_name}: {event_dict['event']}"
+
+
+@pytest.fixture
+def restore_logging():
+    """Put back the global logger and structlog configuration other tests rely on."""
+    previous_logger = logging_config._logger
+    previous_config = structlog.get_config()
+    yield
+    if logging_config._async_writer is not None:
+        logging_config._async_writer.close()
+    structlog.configure(**previous_config)
+    logging_config._logger = previous_logger
+
+
+@pytest.fixture
+def make_logger(tmp_path, restore_logging):
+    def make(**settings):
+        config = LoggingConfig(format="json", file_path=str(tmp_path / "app.log"),
+                               console_output=False, async_sink=True, **settings)
+        return StructuredLogger(config, MonitoringConfig())
+    return make
+
+
+def test_cached_logger_survives_reconfiguration(make_logger, capsys):
+    logger = make_logger()
+    logger.info("before reconfiguration")
+
+    # setup_logging_from_config builds a new StructuredLogger the same way
+    make_logger()
+    logger.info("after reconfiguration")
+    logger.flush()
+
+    output = capsys.readouterr().out
+    assert "before reconfiguration" in output
+    assert "after reconfiguration" in output
+
+
+def test_close_drains_queue_and_later_events_are_written_inline(make_logger, capsys):
+    logger = make_logger(flush_interval=5.0)
+    for i in range(50):
+        logger.info(f"queued event {i}")
+
+    logger.close()
+    logger.info("after close")
+
+    output = capsys.readouterr().out
+    assert all(f"queued event {i}" in output for i in range(50))
+    assert "after close" in output
+
+
+def test_sampling_drops_only_configured_levels(make_logger, capsys):
+    logger = make_logger(sample_rates={'info': 0.0})
+    logger.info("sampled out")
+    logger.warning("always kept")
+    logger.flush()
+
+    output = capsys.readouterr().out
+    assert "sampled out" not in output
+    assert "always kept" in output
+
+
+def test_full_queue_drops_and_counts_events():
+    rendering = threading.Event()
+    release = threading.Event()
+
+    def blocking_render(logger, method_name, event_dict):
+        rendering.set()
+        release.wait(timeout=5)
+        return _render(logger, method_name, event_dict)
+
+    stream = io.StringIO()
+    writer = AsyncLogWriter(blocking_render, stream=stream, queue_size=1)
+    writer.submit("info", {'event': "first"})
+    assert rendering.wait(timeout=5)
+
+    writer.submit("info", {'event': "second"})
+    writer.submit("info", {'event': "third"})
+    release.set()
+    writer.close()
+
+    assert writer.dropped == 1
+    assert stream.getvalue().splitlines() == ["info: first", "info: second"]
+
+
+def test_configure_swaps_renderer_of_running_writer():
+    stream = io.StringIO()
+    writer = AsyncLogWriter(_render, stream=stream)
+    writer.submit("info", {'event': "plain"})
+    writer.flush()
+
+    writer.configure(lambda logger, method_name, event_dict: event_dict['event'].upper(), stream=stream)
+    writer.submit("info", {'event': "shouted"})
+    writer.close()
+
+    assert stream.getvalue().splitlines() == ["info: plain", "SHOUTED"]
@@ -0,0 +1,67 @@
+"""
+CLI startup tests.
+
+Each check runs in a fresh interpreter so that modules imported by other
+tests don't hide a regression in the CLI's lazy imports. They assert which
+modules get imported rather than wall-clock time, which depends on the machine.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_DIR = REPO_ROOT / "src"
+
+# Importing these is what used to make every CLI command take ~0.45s
+HEAVY_MODULES = ("bs4", "html2text", "requests", "pydantic", "structlog", "yaml")
+
+PROBE = """
+import json, sys
+import manuelita_scraper.cli
+print(json.dumps([name for name in %r if name in sys.modules]))
+"""
+
+# Runs a CLI command and reports the heavy modules loaded once it exits
+COMMAND_PROBE = """
+import atexit, json, runpy, sys
+atexit.register(lambda: print(json.dumps([name for name in %r if name in sys.modules])))
+sys.argv = ["manuelita-scraper", *%r]
+runpy.run_module("manuelita_scraper.cli", run_name="__main__")
+"""
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    result = _run_python("-c", PROBE % (HEAVY_MODULES,))
+    assert json.loads(result.stdout) == []
+
+
+def test_count_command_runs_without_pipeline(tmp_path):
+    (tmp_path / "page.md").write_text("# Manuelita\n", encoding="utf-8")
+
+    result = _run_python("-c", COMMAND_PROBE % (HEAVY_MODULES, ["count", str(tmp_path)]))
+
+    output, loaded = result.stdout.rstrip().rsplit("\n", 1)
+    assert "Files matching '*.md': 1" in output
+    assert json.loads(loaded) == []
+
+
+def test_config_loaded_once_per_process(tmp_path, monkeypatch):
+    shutil.copytree(REPO_ROOT / "configs", tmp_path / "configs")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(SRC_DIR))
+    from manuelita_scraper import config
+
+    monkeypatch.setattr(config, "_config_manager", config.ConfigManager())
+
+    assert config.init_config("development") is config.init_config("development")
+    assert (tmp_path / "data" / "processed").is_dir()
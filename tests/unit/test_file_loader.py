@@ -0,0 +1,68 @@
+"""
+File loader tests.
+
+The corporate and news pipelines share one loader under ``--concurrent``;
+the per-directory metadata index must end up with the items of both.
+"""
+
+import json
+import threading
+
+from manuelita_scraper.loaders.file_loader import ContentItem, FileLoader
+
+
+def _item(url: str) -> ContentItem:
+    return ContentItem(content=f"# {url}\n\nContenido de prueba.", metadata={'title': url}, source_url=url)
+
+
+def _loader(tmp_path) -> FileLoader:
+    return FileLoader({'base_directory': str(tmp_path), 'file_format': 'markdown', 'include_metadata': True})
+
+
+def _indexed_urls(path):
+    index = json.loads(path.read_text(encoding="utf-8"))
+    assert index['total_items'] == len(index['items'])
+    return {entry['source_url'] for entry in index['items']}
+
+
+def test_load_stream_writes_metadata_index(tmp_path):
+    loader = _loader(tmp_path)
+    urls = ["https://www.manuelita.com/historia/", "https://www.manuelita.com/manuelita-noticias/uno/"]
+
+    results = list(loader.load_stream(_item(url) for url in urls))
+
+    assert all(result.success for result in results)
+    assert _indexed_urls(tmp_path / "corporate" / "metadata.json") == {urls[0]}
+    assert _indexed_urls(tmp_path / "news" / "metadata.json") == {urls[1]}
+
+
+def test_sequential_streams_to_same_directory_are_merged(tmp_path):
+    loader = _loader(tmp_path)
+    first = "https://www.fundacionmanuelita.org/quienes-somos/"
+    second = "https://www.fundacionmanuelita.org/programas/"
+
+    list(loader.load_stream([_item(first)]))
+    list(loader.load_stream([_item(second)]))
+
+    assert _indexed_urls(tmp_path / "foundation" / "metadata.json") == {first, second}
+
+
+def test_concurrent_streams_to_same_directory_keep_all_items(tmp_path):
+    loader = _loader(tmp_path)
+    batches = [[_item(f"https://www.fundacionmanuelita.org/{worker}/pagina-{i}/") for i in range(20)]
+               for worker in ("corporate", "news")]
+    barrier = threading.Barrier(len(batches))
+
+    def run(batch):
+        barrier.wait()
+        for _ in loader.load_stream(batch):
+            pass
+
+    threads = [threading.Thread(target=run, args=(batch,)) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = {item.source_url for batch in batches for item in batch}
+    assert _indexed_urls(tmp_path / "foundation" / "metadata.json") == expected
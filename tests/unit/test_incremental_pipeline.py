@@ -0,0 +1,189 @@
+"""
+Incremental pipeline tests.
+
+A tiny news site (one listing page linking two articles) is served to
+requests.Session.get so runs exercise conditional requests, the change
+manifest and the removal sweep without touching the network.
+"""
+
+import copy
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+
+from manuelita_scraper.manifest import ChangeManifest
+from manuelita_scraper.pipeline import ManuelitaPipeline
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+LISTING_URL = "https://www.manuelita.com/manuelita-noticias/"
+ARTICLE_URLS = [
+    "https://www.manuelita.com/manuelita-noticias/cosecha-record/",
+    "https://www.manuelita.com/manuelita-noticias/nueva-planta/",
+]
+
+LISTING_PAGE = """<html><head><title>Noticias</title></head><body><main>
+<h1>Noticias Manuelita</h1>
+<p>Las últimas noticias de Manuelita sobre azúcar, energía y sostenibilidad.</p>
+{links}
+</main></body></html>"""
+
+ARTICLE_PAGE = """<html><head><title>{title}</title></head><body><main>
+<h1>{title}</h1>
+<p>Manuelita informa que {title} fue un hito para la compañía este año.</p>
+<p>La noticia describe el trabajo de los equipos en el Valle del Cauca.</p>
+</main></body></html>"""
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, url, status_code=200, content=b"", etag=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'ETag': etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class FakeSite:
+    """Serves the news site; ``status`` overrides the response code per URL (or 'timeout')."""
+
+    def __init__(self):
+        links = "\n".join(f'<h2><a href="{url}">{url}</a></h2>' for url in ARTICLE_URLS)
+        self.pages = {LISTING_URL: LISTING_PAGE.format(links=links).encode("utf-8")}
+        for url in ARTICLE_URLS:
+            title = url.rstrip("/").rsplit("/", 1)[-1].replace("-", " ")
+            self.pages[url] = ARTICLE_PAGE.format(title=title).encode("utf-8")
+        self.status = {}
+        self.requests = []
+
+    def get(self, session, url, **kwargs):
+        self.requests.append((url, kwargs.get("headers") or {}))
+        status = self.status.get(url, 200 if url in self.pages else 404)
+        if status == "timeout":
+            raise requests.Timeout(f"Read timed out for url: {url}")
+        if status != 200:
+            return FakeResponse(url, status)
+        etag = f'"{len(self.pages[url])}"'
+        if (kwargs.get("headers") or {}).get("If-None-Match") == etag:
+            return FakeResponse(url, 304)
+        return FakeResponse(url, content=self.pages[url], etag=etag)
+
+
+@pytest.fixture
+def site():
+    site = FakeSite()
+    with mock.patch("requests.Session.get", autospec=True, side_effect=site.get):
+        yield site
+
+
+@pytest.fixture
+def run_news(site, tmp_path, monkeypatch):
+    """Run the incremental news pipeline with a fresh pipeline, as the CLI does."""
+    config = None
+
+    def run():
+        nonlocal config
+        # Configs resolve from the repository root
+        monkeypatch.chdir(REPO_ROOT)
+        pipeline = ManuelitaPipeline("development")
+        if config is None:
+            config = copy.deepcopy(pipeline.config)
+            config.scraping.targets.news_base_urls = [LISTING_URL]
+            config.scraping.output.base_directory = str(tmp_path / "output")
+        pipeline.config = config
+        pipeline.rate_limiter.request_delay = 0
+        # The news extractor writes discovered links to the working directory
+        monkeypatch.chdir(tmp_path)
+        return pipeline, pipeline.run_incremental_pipeline("news")
+
+    return run
+
+
+def _manifest_urls(pipeline):
+    return {entry.url for entry in ChangeManifest.load(pipeline.manifest_path).entries_for("news")}
+
+
+def test_first_run_adds_listing_and_articles(run_news):
+    pipeline, result = run_news()
+
+    assert result["added_count"] == 1 + len(ARTICLE_URLS)
+    assert result["removed_count"] == 0
+    assert result["has_changes"]
+    assert _manifest_urls(pipeline) == {LISTING_URL, *ARTICLE_URLS}
+
+
+def test_unchanged_site_is_not_modified(run_news, site):
+    run_news()
+    site.requests.clear()
+
+    pipeline, result = run_news()
+
+    assert result["unchanged_count"] == 1 + len(ARTICLE_URLS)
+    assert not result["has_changes"]
+    # Every page was requested conditionally and answered 304
+    assert all(headers.get("If-None-Match") for _, headers in site.requests)
+
+
+@pytest.mark.parametrize("status", [503, 500, "timeout"])
+def test_transient_listing_failure_keeps_articles(run_news, site, status):
+    pipeline, _ = run_news()
+    outputs = [entry.output_path for entry in ChangeManifest.load(pipeline.manifest_path).entries.values()]
+
+    site.status[LISTING_URL] = status
+    pipeline, result = run_news()
+
+    assert result["removed_count"] == 0
+    assert _manifest_urls(pipeline) == {LISTING_URL, *ARTICLE_URLS}
+    assert all(Path(path).exists() for path in outputs)
+    # Articles linked by the previous run are still re-checked
+    assert {url for url, _ in site.requests[-len(ARTICLE_URLS):]} == set(ARTICLE_URLS)
+    links = json.loads(Path("discovered_news_links.json").read_text(encoding="utf-8"))
+    assert set(links["links"]) == set(ARTICLE_URLS)
+
+
+def test_gone_listing_removes_it_and_its_articles(run_news, site):
+    run_news()
+
+    site.status[LISTING_URL] = 410
+    pipeline, result = run_news()
+
+    assert result["removed_count"] == 1 + len(ARTICLE_URLS)
+    assert _manifest_urls(pipeline) == set()
+
+
+def test_missing_article_is_removed(run_news, site):
+    run_news()
+
+    site.status[ARTICLE_URLS[0]] = 404
+    pipeline, result = run_news()
+
+    assert result["removed_count"] == 1
+    assert _manifest_urls(pipeline) == {LISTING_URL, ARTICLE_URLS[1]}
+
+
+def _metadata_urls(output_dir):
+    urls = set()
+    for metadata_file in Path(output_dir).rglob("metadata.json"):
+        index = json.loads(metadata_file.read_text(encoding="utf-8"))
+        assert index["total_items"] == len(index["items"])
+        urls.update(item["source_url"] for item in index["items"])
+    return urls
+
+
+def test_metadata_index_follows_additions_and_removals(run_news, site, tmp_path):
+    run_news()
+    assert _metadata_urls(tmp_path / "output") == {LISTING_URL, *ARTICLE_URLS}
+
+    site.status[ARTICLE_URLS[0]] = 404
+    run_news()
+
+    assert _metadata_urls(tmp_path / "output") == {LISTING_URL, ARTICLE_URLS[1]}
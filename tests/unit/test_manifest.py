@@ -0,0 +1,70 @@
+"""
+Change manifest tests.
+
+The manifest is the only state an incremental run keeps between runs, so
+it has to round-trip exactly and degrade to an empty manifest when the file
+can't be used.
+"""
+
+import json
+
+from manuelita_scraper.manifest import MANIFEST_VERSION, ChangeManifest, Changeset, ManifestEntry, content_hash
+
+
+def _entry(url, output_path=None, **fields):
+    return ManifestEntry(url=url, pipeline_type="news", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+                         content_hash=content_hash(url), output_path=output_path, **fields)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    manifest = ChangeManifest(tmp_path / "manifest.json")
+    manifest.put(_entry("https://www.manuelita.com/manuelita-noticias/", discovered_links=["https://a", "https://b"]))
+    manifest.save()
+
+    loaded = ChangeManifest.load(tmp_path / "manifest.json")
+
+    assert loaded.entries == manifest.entries
+    assert not (tmp_path / "manifest.tmp").exists()
+
+
+def test_unsupported_version_starts_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({'version': MANIFEST_VERSION + 1, 'entries': {}}), encoding="utf-8")
+
+    assert ChangeManifest.load(path).entries == {}
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text('{"version": 1, "entries": {', encoding="utf-8")
+
+    assert ChangeManifest.load(path).entries == {}
+
+
+def test_validators_only_sent_while_output_exists(tmp_path):
+    kept = tmp_path / "kept.md"
+    kept.write_text("contenido", encoding="utf-8")
+    manifest = ChangeManifest(tmp_path / "manifest.json")
+    manifest.put(_entry("https://kept", output_path=str(kept), discovered_links=["https://article"]))
+    manifest.put(_entry("https://deleted", output_path=str(tmp_path / "deleted.md"),
+                        discovered_links=["https://other-article"]))
+
+    validators = manifest.validators_for("news")
+
+    assert validators["https://kept"]["etag"] == '"abc"'
+    # A missing output is re-fetched unconditionally but still remembers its links
+    assert validators["https://deleted"] == {'discovered_links': ["https://other-article"]}
+    assert manifest.validators_for("corporate") == {}
+
+
+def test_changeset_records_changes(tmp_path):
+    changeset = Changeset(pipeline_type="news")
+    assert not changeset.has_changes
+
+    changeset.record('removed', _entry("https://gone", output_path="/data/gone.md"))
+    path = changeset.save(tmp_path)
+
+    assert changeset.has_changes
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved['removed'] == [{'url': "https://gone", 'output_path': "/data/gone.md",
+                                 'cleaned_hash': None}]
@@ -0,0 +1,98 @@
+"""
+Bounded-memory metrics tests.
+
+Timings are kept in log-spaced histogram buckets and errors in a ring
+buffer, so memory must stay flat while counts and percentiles stay
+accurate.
+"""
+
+import random
+
+import pytest
+
+from manuelita_scraper.logging_config import MetricsCollector, TimingHistogram
+
+
+def test_percentiles_within_bucket_resolution():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-3, 1) for _ in range(5000))
+    histogram = TimingHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for quantile in (0.5, 0.9, 0.95, 0.99):
+        exact = values[int(quantile * len(values)) - 1]
+        assert histogram.percentile(quantile) == pytest.approx(exact, rel=0.05)
+
+
+def test_count_total_min_max_are_exact():
+    histogram = TimingHistogram()
+    for value in (0.2, 0.1, 0.4):
+        histogram.record(value)
+
+    summary = histogram.summary()
+    assert summary['count'] == 3
+    assert summary['total'] == pytest.approx(0.7)
+    assert summary['average'] == pytest.approx(0.7 / 3)
+    assert (summary['min'], summary['max']) == (0.1, 0.4)
+
+
+def test_memory_is_bounded_by_buckets():
+    histogram = TimingHistogram()
+    for i in range(100_000):
+        histogram.record(0.001 + (i % 1000) * 1e-5)
+
+    # 0.001-0.011s spans ~50 buckets at 5% growth, regardless of how many values
+    assert len(histogram.buckets) < 60
+    assert histogram.count == 100_000
+
+
+def test_out_of_range_values_are_clamped():
+    histogram = TimingHistogram()
+    histogram.record(0.0)
+    histogram.record(1e9)
+
+    assert min(histogram.buckets) == 0
+    assert max(histogram.buckets) == histogram._bucket_index(histogram.max_value)
+    # Exact extremes are still reported
+    assert (histogram.summary()['min'], histogram.summary()['max']) == (0.0, 1e9)
+
+
+def test_single_value_percentiles_are_the_value():
+    histogram = TimingHistogram()
+    histogram.record(0.123)
+
+    assert histogram.percentile(0.5) == histogram.percentile(0.99) == 0.123
+
+
+def test_cumulative_count_by_upper_bound():
+    histogram = TimingHistogram()
+    for value in (0.001, 0.002, 0.05, 0.5, 5.0):
+        histogram.record(value)
+
+    assert histogram.cumulative_count(0.01) == 2
+    assert histogram.cumulative_count(1.0) == 4
+    assert histogram.cumulative_count(10.0) == 5
+
+
+def test_error_ring_buffer_keeps_recent_errors_and_total_count():
+    metrics = MetricsCollector(max_errors=3)
+    for i in range(10):
+        metrics.record_error("HTTPError", f"error {i}")
+
+    summary = metrics.get_summary()
+    assert summary['error_count'] == 10
+    assert [error['message'] for error in summary['errors']] == ["error 7", "error 8", "error 9"]
+
+
+def test_snapshot_is_independent_of_later_updates():
+    metrics = MetricsCollector()
+    metrics.record_timing('scrape_url', 0.1)
+    metrics.increment_counter('pages')
+
+    snapshot = metrics.snapshot()
+    metrics.record_timing('scrape_url', 0.2)
+    metrics.increment_counter('pages')
+
+    assert snapshot['timings']['scrape_url'].count == 1
+    assert snapshot['counters'] == {'pages': 1}
@@ -0,0 +1,118 @@
+"""
+Prometheus exporter tests.
+
+Checks the text exposition output against the format rules the scrapers
+rely on, the atomic textfile write and the local /metrics endpoint.
+"""
+
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import pytest
+
+from manuelita_scraper.logging_config import MetricsCollector
+from manuelita_scraper.metrics_exporter import (CONTENT_TYPE, METRIC_PREFIX, MetricsServer,
+                                                render_prometheus, write_textfile)
+
+
+@pytest.fixture
+def metrics():
+    collector = MetricsCollector()
+    collector.increment_counter('news_pages-extracted', 3)
+    collector.increment_counter('http_retries')
+    for duration in (0.002, 0.02, 0.2, 2.0):
+        collector.record_timing('scrape_url', duration)
+    collector.record_timing('load "item"\n', 0.001)
+    collector.record_error("HTTPError", "503")
+    return collector
+
+
+def _samples(text):
+    """Map each sample line's name+labels → value, skipping comments."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, _, value = line.rpartition(' ')
+            samples[name] = value
+    return samples
+
+
+def test_counters_are_sanitized_totals(metrics):
+    samples = _samples(render_prometheus(metrics))
+
+    assert samples[f"{METRIC_PREFIX}_news_pages_extracted_total"] == "3"
+    assert samples[f"{METRIC_PREFIX}_http_retries_total"] == "1"
+    assert samples[f"{METRIC_PREFIX}_recorded_errors_total"] == "1"
+
+
+def test_every_metric_has_help_and_type(metrics):
+    text = render_prometheus(metrics)
+    typed = {line.split()[2] for line in text.splitlines() if line.startswith('# TYPE')}
+    helped = {line.split()[2] for line in text.splitlines() if line.startswith('# HELP')}
+
+    assert typed == helped
+    for sample in _samples(text):
+        base = sample.split('{')[0]
+        assert any(base == name or base.startswith(f"{name}_") for name in typed)
+
+
+def test_histogram_buckets_are_cumulative(metrics):
+    samples = _samples(render_prometheus(metrics, buckets=(0.01, 0.1, 1.0)))
+    histogram = f'{METRIC_PREFIX}_operation_duration_seconds'
+    label = 'operation="scrape_url"'
+
+    buckets = [int(samples[f'{histogram}_bucket{{{label},le="{bound}"}}'])
+               for bound in ("0.01", "0.1", "1.0", "+Inf")]
+    assert buckets == [1, 2, 3, 4]
+    assert samples[f'{histogram}_count{{{label}}}'] == "4"
+    assert float(samples[f'{histogram}_sum{{{label}}}']) == pytest.approx(2.222)
+
+
+def test_label_values_are_escaped(metrics):
+    text = render_prometheus(metrics)
+
+    assert 'operation="load \\"item\\"\\n"' in text
+
+
+def test_empty_collector_renders_only_base_metrics():
+    text = render_prometheus(MetricsCollector())
+
+    assert "operation_duration_seconds" not in text
+    assert text.endswith("\n")
+
+
+def test_write_textfile_replaces_atomically(metrics, tmp_path):
+    path = tmp_path / "textfile" / "manuelita.prom"
+    write_textfile(MetricsCollector(), str(path))
+
+    write_textfile(metrics, str(path))
+
+    assert "scrape_url" in path.read_text(encoding="utf-8")
+    assert [p.name for p in path.parent.iterdir()] == ["manuelita.prom"]
+
+
+def test_failed_render_leaves_previous_textfile(metrics, tmp_path):
+    path = tmp_path / "manuelita.prom"
+    write_textfile(metrics, str(path))
+    previous = path.read_text(encoding="utf-8")
+
+    with mock.patch("manuelita_scraper.metrics_exporter.render_prometheus", side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            write_textfile(metrics, str(path))
+
+    assert path.read_text(encoding="utf-8") == previous
+
+
+def test_metrics_server_serves_metrics(metrics):
+    with MetricsServer(metrics, port=0) as server:
+        with urllib.request.urlopen(f"http://{server.host}:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers['Content-Type']
+
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(f"http://{server.host}:{server.port}/other", timeout=5)
+
+    assert content_type == CONTENT_TYPE
+    assert f"{METRIC_PREFIX}_news_pages_extracted_total 3" in body
+    assert missing.value.code == 404
@@ -0,0 +1,104 @@
+"""
+Stage profiler tests.
+
+Timed operations are mapped to pipeline stages; only one stage is
+profiled at a time and cProfile never sees work on other threads.
+"""
+
+import pstats
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from manuelita_scraper.cli import cli
+from manuelita_scraper.profiling import PROFILE_SUMMARY_FILENAME, StageProfiler
+
+
+def _busy_work(n=2000):
+    return sum(i * i for i in range(n))
+
+
+def _stage_functions(profiler, stage):
+    stats = pstats.Stats(profiler._profiles[stage])
+    return {function for (_, _, function) in stats.stats}
+
+
+def test_operations_are_grouped_into_stages():
+    profiler = StageProfiler('cpu').start()
+    with profiler.operation('scrape_url'):
+        _busy_work()
+    with profiler.operation('content_transformation'):
+        _busy_work()
+    with profiler.operation('unknown_operation'):
+        _busy_work()
+    profiler.stop()
+
+    assert profiler.stages == ['extract', 'transform']
+    assert '_busy_work' in _stage_functions(profiler, 'extract')
+
+
+def test_nested_operation_is_charged_to_outer_stage():
+    profiler = StageProfiler('cpu').start()
+    with profiler.operation('corporate_extraction'):
+        with profiler.operation('load_item'):
+            _busy_work()
+    profiler.stop()
+
+    assert profiler.stages == ['extract']
+    assert profiler._calls == {'extract': 1}
+
+
+def test_other_threads_are_not_profiled():
+    profiler = StageProfiler('cpu').start()
+
+    def worker_task():
+        return _busy_work()
+
+    with profiler.operation('scrape_url'):
+        worker = threading.Thread(target=worker_task)
+        worker.start()
+        worker.join()
+    profiler.stop()
+
+    assert 'worker_task' not in _stage_functions(profiler, 'extract')
+
+
+def test_mem_mode_records_allocations(tmp_path):
+    profiler = StageProfiler('mem', top_n=5).start()
+    with profiler.operation('load_item'):
+        kept = [bytearray(1024) for _ in range(100)]
+    profiler.stop()
+
+    assert profiler.stages == ['load']
+    assert profiler._peaks['load'] >= 100 * 1024
+    paths = profiler.write(tmp_path)
+    assert paths == [tmp_path / PROFILE_SUMMARY_FILENAME]
+    assert "=== Stage: load (1 profiled operations) ===" in paths[0].read_text(encoding="utf-8")
+    del kept
+
+
+def test_cpu_mode_writes_one_profile_per_stage(tmp_path):
+    profiler = StageProfiler('cpu').start()
+    with profiler.operation('scrape_url'):
+        _busy_work()
+    with profiler.operation('load_item'):
+        _busy_work()
+    profiler.stop()
+
+    paths = profiler.write(tmp_path)
+
+    assert [path.name for path in paths] == ["profile_extract.prof", "profile_load.prof", PROFILE_SUMMARY_FILENAME]
+    pstats.Stats(str(paths[0]))
+
+
+def test_unsupported_mode_is_rejected():
+    with pytest.raises(ValueError):
+        StageProfiler('wall')
+
+
+def test_cli_refuses_profile_with_concurrent():
+    result = CliRunner().invoke(cli, ['pipeline', '--concurrent', '--profile', 'cpu'])
+
+    assert result.exit_code == 2
+    assert "--profile cannot be combined with --concurrent" in result.output
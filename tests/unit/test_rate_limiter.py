@@ -0,0 +1,73 @@
+"""
+Per-host rate limiter tests.
+
+The corporate and news extractors share one limiter under ``--concurrent``;
+requests to the same host must stay one delay apart across threads while
+other hosts are not held back.
+"""
+
+import threading
+import time
+
+from manuelita_scraper.extractors.rate_limiter import HostRateLimiter
+
+
+DELAY = 0.05
+
+
+def _request_times(limiter, urls):
+    """Call wait() for each URL from its own thread and return when each was let through."""
+    times = {}
+    barrier = threading.Barrier(len(urls))
+
+    def request(index, url):
+        barrier.wait()
+        limiter.wait(url)
+        times[index] = time.monotonic()
+
+    threads = [threading.Thread(target=request, args=(i, url)) for i, url in enumerate(urls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [times[i] for i in range(len(urls))]
+
+
+def test_first_request_to_a_host_does_not_wait():
+    assert HostRateLimiter(DELAY).wait("https://www.manuelita.com/") == 0
+
+
+def test_same_host_requests_are_spaced_across_threads():
+    limiter = HostRateLimiter(DELAY)
+
+    times = sorted(_request_times(limiter, ["https://www.manuelita.com/historia/"] * 4))
+
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert all(gap >= DELAY * 0.9 for gap in gaps)
+
+
+def test_www_prefix_is_the_same_host():
+    limiter = HostRateLimiter(DELAY)
+    limiter.wait("https://www.manuelita.com/")
+
+    waited = limiter.wait("https://manuelita.com/historia/")
+
+    assert waited > DELAY * 0.5
+
+
+def test_different_hosts_do_not_wait_for_each_other():
+    limiter = HostRateLimiter(DELAY)
+
+    start = time.monotonic()
+    _request_times(limiter, ["https://www.manuelita.com/", "https://www.fundacionmanuelita.org/",
+                             "https://www.manuelita.com.co/"])
+
+    assert time.monotonic() - start < DELAY
+
+
+def test_sequential_request_after_delay_does_not_wait():
+    limiter = HostRateLimiter(DELAY)
+    limiter.wait("https://www.manuelita.com/")
+    time.sleep(DELAY)
+
+    assert limiter.wait("https://www.manuelita.com/historia/") == 0
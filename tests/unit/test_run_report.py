@@ -0,0 +1,160 @@
+"""
+Run manifest tests.
+
+Covers the numbers a run manifest reports (per-stage busy time, HTTP
+retries counted by the extractor) and the regression check behind
+``runs compare``.
+"""
+
+import copy
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from manuelita_scraper.cli import cli
+from manuelita_scraper.config import init_config
+from manuelita_scraper.extractors.corporate import CorporateExtractor
+from manuelita_scraper.logging_config import MetricsCollector
+from manuelita_scraper.run_report import build_run_manifest, compare_runs
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+PAGE_URL = "https://www.manuelita.com/historia/"
+PAGE = b"<html><head><title>Historia</title></head><body><main><p>Manuelita desde 1864.</p></main></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+@pytest.fixture
+def scraping_config(monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    config = copy.deepcopy(init_config("development").scraping)
+    config.settings.max_retries = 2
+    return config
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Count the extractor's metrics in a private collector."""
+    collector = MetricsCollector()
+    extractor_logger = mock.Mock()
+    extractor_logger.increment_counter.side_effect = collector.increment_counter
+    extractor_logger.timed_operation.return_value = mock.MagicMock()
+    monkeypatch.setattr("manuelita_scraper.extractors.base.get_logger", lambda: extractor_logger)
+    return collector
+
+
+def _extractor(config, responses):
+    extractor = CorporateExtractor(config)
+    extractor.rate_limiter.request_delay = 0
+    extractor.session.get = mock.Mock(side_effect=responses)
+    return extractor
+
+
+def test_transient_errors_are_retried_and_counted(scraping_config, metrics):
+    extractor = _extractor(scraping_config, [FakeResponse(503), requests.Timeout("timed out"),
+                                             FakeResponse(content=PAGE)])
+
+    result = extractor.extract_single_url(PAGE_URL)
+
+    assert result.success
+    assert extractor.session.get.call_count == 3
+    assert metrics.counters['http_retries'] == 2
+
+
+def test_retries_stop_at_max_retries(scraping_config, metrics):
+    extractor = _extractor(scraping_config, [FakeResponse(503)] * 5)
+
+    result = extractor.extract_single_url(PAGE_URL)
+
+    assert not result.success
+    assert result.status_code == 503
+    assert extractor.session.get.call_count == scraping_config.settings.max_retries + 1
+    assert metrics.counters['http_retries'] == scraping_config.settings.max_retries
+
+
+def test_client_errors_are_not_retried(scraping_config, metrics):
+    extractor = _extractor(scraping_config, [FakeResponse(404)])
+
+    result = extractor.extract_single_url(PAGE_URL)
+
+    assert result.status_code == 404
+    assert extractor.session.get.call_count == 1
+    assert 'http_retries' not in metrics.counters
+
+
+def _summary(scrape_times, retries=0):
+    collector = MetricsCollector()
+    for duration in scrape_times:
+        collector.record_timing('scrape_url', duration)
+    if retries:
+        collector.increment_counter('http_retries', retries)
+    return collector.get_summary()
+
+
+def test_run_manifest_reports_busy_time_and_retries():
+    manifest = build_run_manifest("run-1", "corporate", "development",
+                                  {'success': True, 'extracted_count': 4, 'loaded_count': 4},
+                                  _summary([0.5, 0.5, 0.5, 0.5], retries=3), wall_time=1.0)
+
+    extract = manifest['stages']['extract']
+    assert extract['busy_time_s'] == pytest.approx(2.0, rel=0.05)
+    assert extract['items'] == 4
+    assert extract['items_per_s'] == pytest.approx(2.0, rel=0.05)
+    assert 'wall_time_s' not in extract
+    assert manifest['retries'] == 3
+    assert manifest['totals']['items_per_s'] == 4.0
+
+
+def test_compare_runs_flags_regressions_beyond_threshold():
+    result = {'success': True, 'loaded_count': 4}
+    baseline = build_run_manifest("base", "corporate", "development", result, _summary([0.1] * 4), 1.0)
+    candidate = build_run_manifest("cand", "corporate", "development", result,
+                                   _summary([0.2] * 4, retries=2), 1.05)
+
+    rows = {row['metric']: row for row in compare_runs(baseline, candidate, threshold=0.10)}
+
+    assert rows['stages.extract.busy_time_s']['regression']
+    assert rows['stages.extract.items_per_s']['regression']
+    # Within the threshold
+    assert not rows['wall_time_s']['regression']
+    # No baseline value to compare against
+    assert rows['retries']['change'] is None
+
+
+def test_compare_runs_improvement_is_not_a_regression():
+    result = {'success': True, 'loaded_count': 4}
+    baseline = build_run_manifest("base", "corporate", "development", result, _summary([0.2] * 4), 2.0)
+    candidate = build_run_manifest("cand", "corporate", "development", result, _summary([0.1] * 4), 1.0)
+
+    assert not any(row['regression'] for row in compare_runs(baseline, candidate))
+
+
+@pytest.mark.parametrize("broken", ["{not json", json.dumps({'totals': {}})])
+def test_runs_compare_reports_unreadable_manifests(tmp_path, monkeypatch, broken):
+    monkeypatch.chdir(REPO_ROOT)
+    result = {'success': True, 'loaded_count': 4}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(build_run_manifest("base", "corporate", "development", result,
+                                                      _summary([0.1] * 4), 1.0)), encoding="utf-8")
+    candidate = tmp_path / "candidate.json"
+    candidate.write_text(broken, encoding="utf-8")
+
+    outcome = CliRunner().invoke(cli, ['runs', 'compare', str(baseline), str(candidate)])
+
+    assert outcome.exit_code == 1
+    assert "Failed to compare runs" in outcome.output
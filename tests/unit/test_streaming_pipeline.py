@@ -0,0 +1,118 @@
+"""
+Streaming pipeline tests.
+
+The streaming mode chains extract → transform → load as generators; it has
+to produce the same documents as the batch mode while writing each one as
+soon as it is downloaded.
+"""
+
+import copy
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+
+from manuelita_scraper.pipeline import ManuelitaPipeline
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+PAGES = {
+    "https://www.manuelita.com/historia/": "Historia",
+    "https://www.manuelita.com/perfil-corporativo/": "Perfil corporativo",
+    "https://www.manuelita.com/linea-etica/": "Línea ética",
+}
+
+PAGE = """<html><head><title>{title}</title></head><body><main>
+<h1>{title}</h1>
+<p>Manuelita es una organización agroindustrial fundada en 1864 en el Valle del Cauca.</p>
+<p>Esta página describe {title} de la compañía y sus negocios.</p>
+</main></body></html>"""
+
+
+class FakeResponse:
+    def __init__(self, url, content):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def events():
+    """Ordered log of page downloads and file writes."""
+    return []
+
+
+@pytest.fixture
+def site(events):
+    def get(session, url, **kwargs):
+        events.append(("get", url))
+        if url not in PAGES:
+            raise requests.HTTPError(f"404 Error for url: {url}")
+        return FakeResponse(url, PAGE.format(title=PAGES[url]).encode("utf-8"))
+
+    with mock.patch("requests.Session.get", autospec=True, side_effect=get):
+        yield
+
+
+@pytest.fixture
+def make_pipeline(site, events, monkeypatch, tmp_path):
+    def make(name):
+        monkeypatch.chdir(REPO_ROOT)
+        pipeline = ManuelitaPipeline("development")
+        pipeline.config = copy.deepcopy(pipeline.config)
+        pipeline.config.scraping.targets.corporate_urls = list(PAGES)
+        pipeline.config.scraping.output.base_directory = str(tmp_path / name)
+        pipeline.rate_limiter.request_delay = 0
+
+        load_item = pipeline.loader.load_item
+
+        def recording_load_item(item, output_dir=None):
+            events.append(("load", item.source_url))
+            return load_item(item, output_dir)
+
+        pipeline.loader.load_item = recording_load_item
+        return pipeline
+    return make
+
+
+def _outputs(result):
+    return {Path(path).name: Path(path).read_text(encoding="utf-8") for path in result['output_paths']}
+
+
+def test_streaming_matches_batch_output(make_pipeline):
+    batch = make_pipeline("batch").run_corporate_pipeline(streaming=False)
+    streamed = make_pipeline("stream").run_corporate_pipeline(streaming=True)
+
+    assert streamed['streaming']
+    for key in ('extracted_count', 'transformed_count', 'loaded_count'):
+        assert streamed[key] == batch[key] == len(PAGES)
+    assert _outputs(streamed) == _outputs(batch)
+
+
+def test_streaming_writes_each_document_before_fetching_the_next(make_pipeline, events):
+    make_pipeline("stream").run_corporate_pipeline(streaming=True)
+
+    assert events == [event for url in PAGES for event in (("get", url), ("load", url))]
+
+
+def test_batch_mode_fetches_everything_before_loading(make_pipeline, events):
+    make_pipeline("batch").run_corporate_pipeline(streaming=False)
+
+    kinds = [kind for kind, _ in events]
+    assert kinds == ["get"] * len(PAGES) + ["load"] * len(PAGES)
+
+
+def test_streaming_skips_failed_downloads(make_pipeline, events):
+    pipeline = make_pipeline("stream")
+    pipeline.config.scraping.targets.corporate_urls = [*PAGES, "https://www.manuelita.com/no-existe/"]
+
+    result = pipeline.run_corporate_pipeline(streaming=True)
+
+    assert result['extracted_count'] == len(PAGES)
+    assert ("load", "https://www.manuelita.com/no-existe/") not in events